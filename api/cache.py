@@ -0,0 +1,278 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.constants import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+from models.records import to_json
+
+
+def _canonicalize(value: Any) -> Any:
+    """Normalize a value so equivalent queries serialize identically
+
+    Numeric strings are already coerced by ``search_products``, so only the
+    remaining int/float and ordering differences are folded here.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _canonicalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        items = [v if isinstance(v, str) else _canonicalize(v) for v in value]
+        # Filter lists are sets as far as the API is concerned
+        try:
+            return sorted(items)
+        except TypeError:
+            return sorted(items, key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+
+_KEY_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value canonically (sorted keys, folded numbers, sorted lists)"""
+    return _KEY_ENCODER.encode(_canonicalize(value))
+
+
+def make_cache_key(
+    endpoint: str, attributes: Dict, marketplace: str, page: int, page_size: int
+) -> str:
+    """Build a canonical cache key for a product query"""
+    return _KEY_ENCODER.encode(
+        {
+            "endpoint": endpoint,
+            "attributes": _canonicalize(attributes),
+            "marketplace": marketplace.lower(),
+            "page": int(page),
+            "page_size": int(page_size),
+        }
+    )
+
+
+class MemoryCacheBackend:
+    """In-process LRU storage backed by an ordered dict"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, expires_at: float, value: Dict) -> int:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend:
+    """LRU storage in a local SQLite file so entries survive server restarts
+
+    Reads don't write: access times are collected in memory and written in
+    one batch by the next set() (which evicts by them) or by close(). Other
+    processes sharing the file see them from then on.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._accessed: Dict[str, float] = {}
+        # One statement at a time on the connection, across executor threads
+        self._mutex = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_lru "
+            "ON response_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict]]:
+        with self._mutex:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+        return row[0], json.loads(row[1])
+
+    def _write_accessed(self) -> None:
+        """Write the collected access times (caller holds the mutex)"""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE response_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def set(self, key: str, expires_at: float, value: Dict) -> int:
+        payload = json.dumps(value, separators=(",", ":"), default=to_json)
+        with self._mutex:
+            self._write_accessed()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, time.time()),
+            )
+            evicted = self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY last_access DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._conn.commit()
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._mutex:
+            self._accessed.pop(key, None)
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM response_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._mutex:
+            query = "SELECT COUNT(*) FROM response_cache"
+            return self._conn.execute(query).fetchone()[0]
+
+    def close(self) -> None:
+        with self._mutex:
+            self._write_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+
+class ResponseCache:
+    """TTL + LRU cache for API responses, in memory or on a SQLite file"""
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        backend: Optional[Any] = None,
+        keep_stale: bool = False,
+    ):
+        self.ttl = ttl
+        # Expired entries stay (until evicted) for get(key, allow_stale=True)
+        self.keep_stale = keep_stale
+        self.clock = clock
+        if backend is not None:
+            # e.g. a cache backend shared between worker processes
+            self.backend = backend
+        elif path:
+            self.backend = SQLiteCacheBackend(path, max_entries)
+        else:
+            self.backend = MemoryCacheBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+        # aget/aset may run get/set in executor threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Dict]:
+        """Return the cached value for key, or None if missing or expired
+
+        With `allow_stale`, an expired entry still held (see `keep_stale`)
+        is returned too.
+        """
+        entry = self.backend.get(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            if not allow_stale and not self.keep_stale:
+                self.backend.delete(key)
+            with self._lock:
+                if allow_stale:
+                    self.stale_hits += 1
+                    return value
+                self.expirations += 1
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (defaults to the cache TTL)"""
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        evicted = self.backend.set(key, expires_at, value)
+        with self._lock:
+            self.evictions += evicted
+
+    async def aget(self, key: str, allow_stale: bool = False) -> Optional[Dict]:
+        """get() for the event loop: a blocking backend is read in a thread"""
+        if not getattr(self.backend, "blocking", True):
+            return self.get(key, allow_stale)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get, key, allow_stale)
+
+    async def aset(self, key: str, value: Dict, ttl: Optional[float] = None) -> None:
+        """set() for the event loop: a blocking backend is written in a thread"""
+        if not getattr(self.backend, "blocking", True):
+            self.set(key, value, ttl)
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.set, key, value, ttl)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stale_hits": self.stale_hits,
+            "size": len(self.backend),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
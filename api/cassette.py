@@ -0,0 +1,309 @@
+"""
+Record/replay transports: develop and benchmark without spending API quota.
+
+``record`` sends requests upstream as usual and appends each response to
+a cassette file; ``replay`` answers from the cassette without touching
+the network. Requests are matched by a canonical fingerprint (method,
+path, sorted query, canonical JSON body), so credentials and header
+order don't matter.
+
+Cassette layout (one file)::
+
+    MAGIC
+    entry*     u32 meta length | meta JSON | u32 body length | zlib(body)
+    index      zlib(JSON {fingerprint: [entry offset, ...]})
+    footer     u64 index offset | MAGIC
+
+Bodies are compressed one by one, so replay memory-maps the file, finds
+an entry through the index and decompresses only that body. The index is
+written when recording ends; if it never was (e.g. the process was
+killed), it is rebuilt by scanning the entries.
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from api.cache import canonical_json
+from config.constants import CASSETTE_DECODED_ENTRIES
+
+MAGIC = b"JSCASSETTE1\n"
+_LENGTH = struct.Struct("<I")
+_FOOTER = struct.Struct("<Q")
+FOOTER_SIZE = _FOOTER.size + len(MAGIC)
+
+# Headers that describe the original transfer rather than the response. Bodies
+# are stored decoded, so the content encoding and length go with them.
+_TRANSFER_HEADERS = frozenset(
+    {
+        "transfer-encoding",
+        "connection",
+        "keep-alive",
+        "content-encoding",
+        "content-length",
+    }
+)
+
+
+def _response_headers(headers) -> List[Tuple[str, str]]:
+    return [
+        (name, value)
+        for name, value in headers
+        if name.lower() not in _TRANSFER_HEADERS
+    ]
+
+
+UPSTREAM_MODES = ("live", "record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response"""
+
+
+def request_fingerprint(request: httpx.Request) -> str:
+    """Canonical identity of a request, independent of credentials"""
+    body = request.content
+    if body:
+        try:
+            body = canonical_json(json.loads(body))
+        except ValueError:
+            body = body.decode("latin-1")
+    else:
+        body = ""
+    query = sorted(request.url.params.multi_items())
+    return canonical_json(
+        [request.method, request.url.path, [list(item) for item in query], body]
+    )
+
+
+class Cassette:
+    """Indexed, compressed store of recorded responses"""
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        self._index: Dict[str, List[int]] = {}
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._decoded: "OrderedDict[int, Tuple[int, list, bytes, float]]" = (
+            OrderedDict()
+        )
+        self._positions: Dict[str, int] = {}
+        if writable:
+            self._open_for_append()
+        else:
+            self._open_for_replay()
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self._index.values())
+
+    def _read_index(self, data) -> int:
+        """Load the index; return where entries end (and the index starts)"""
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a cassette")
+        if len(data) >= len(MAGIC) + FOOTER_SIZE and data[-len(MAGIC) :] == MAGIC:
+            (index_offset,) = _FOOTER.unpack_from(data, len(data) - FOOTER_SIZE)
+            index = zlib.decompress(data[index_offset : len(data) - FOOTER_SIZE])
+            self._index = json.loads(index)
+            return index_offset
+        return self._scan(data)
+
+    def _scan(self, data) -> int:
+        """Rebuild the index from the entries of an unfinished recording"""
+        position = len(MAGIC)
+        while position + _LENGTH.size <= len(data):
+            offset = position
+            (meta_length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size + meta_length
+            if position + _LENGTH.size > len(data):
+                break
+            (body_length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size + body_length
+            if position > len(data):
+                break
+            meta_start = offset + _LENGTH.size
+            meta = json.loads(data[meta_start : meta_start + meta_length])
+            self._index.setdefault(meta["fingerprint"], []).append(offset)
+        else:
+            return position
+        return offset  # A truncated last entry is dropped
+
+    def _open_for_replay(self) -> None:
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._read_index(self._map)
+
+    def _open_for_append(self) -> None:
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            index_offset = self._read_index(data)
+            self._file = open(self.path, "r+b")
+            # New entries overwrite the old index; a new one is written on close
+            self._file.truncate(index_offset)
+            self._file.seek(index_offset)
+        else:
+            self._file = open(self.path, "wb")
+            self._file.write(MAGIC)
+
+    def add(
+        self,
+        fingerprint: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        meta = json.dumps(
+            {
+                "fingerprint": fingerprint,
+                "status": status_code,
+                "headers": headers,
+                "elapsed": elapsed,
+            },
+            separators=(",", ":"),
+        ).encode()
+        compressed = zlib.compress(body, 6)
+        offset = self._file.tell()
+        self._file.write(_LENGTH.pack(len(meta)) + meta)
+        self._file.write(_LENGTH.pack(len(compressed)) + compressed)
+        self._index.setdefault(fingerprint, []).append(offset)
+
+    def _entry(self, offset: int) -> Tuple[int, list, bytes, float]:
+        entry = self._decoded.get(offset)
+        if entry is not None:
+            self._decoded.move_to_end(offset)
+            return entry
+        data = self._map
+        (meta_length,) = _LENGTH.unpack_from(data, offset)
+        position = offset + _LENGTH.size
+        meta = json.loads(data[position : position + meta_length])
+        position += meta_length
+        (body_length,) = _LENGTH.unpack_from(data, position)
+        position += _LENGTH.size
+        body = zlib.decompress(data[position : position + body_length])
+        entry = (meta["status"], meta["headers"], body, meta["elapsed"])
+        self._decoded[offset] = entry
+        if len(self._decoded) > CASSETTE_DECODED_ENTRIES:
+            self._decoded.popitem(last=False)
+        return entry
+
+    def lookup(self, fingerprint: str) -> Tuple[int, list, bytes, float]:
+        """Next recorded response for a request (the last one repeats)"""
+        offsets = self._index.get(fingerprint)
+        if not offsets:
+            raise CassetteMissError(
+                f"No recorded response for {fingerprint} in {self.path}"
+            )
+        position = self._positions.get(fingerprint, 0)
+        self._positions[fingerprint] = position + 1
+        return self._entry(offsets[min(position, len(offsets) - 1)])
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        if self.writable:
+            index_offset = self._file.tell()
+            self._file.write(
+                zlib.compress(json.dumps(self._index, separators=(",", ":")).encode())
+            )
+            self._file.write(_FOOTER.pack(index_offset) + MAGIC)
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        self._file = None
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Sends requests upstream and records every response to a cassette"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - start
+        headers = _response_headers(response.headers.multi_items())
+        self.cassette.add(
+            request_fingerprint(request), response.status_code, headers, body, elapsed
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+        self.cassette.close()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answers requests from a cassette; never touches the network
+
+    `latency_scale` replays recorded latency (1.0 = as recorded, 0 = none).
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 0.0):
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.hits = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        status_code, headers, body, elapsed = self.cassette.lookup(
+            request_fingerprint(request)
+        )
+        self.hits += 1
+        if self.latency_scale > 0:
+            await asyncio.sleep(elapsed * self.latency_scale)
+        # Older recordings kept the original content-encoding
+        return httpx.Response(
+            status_code, headers=_response_headers(headers), content=body
+        )
+
+    async def aclose(self) -> None:
+        self.cassette.close()
+
+
+def make_transport(
+    mode: str,
+    cassette_path: Optional[str] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    latency_scale: float = 0.0,
+    **live_options,
+) -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for an upstream mode: live, record or replay
+
+    `transport` is the live transport to use (or to record from); without
+    one, an ``httpx.AsyncHTTPTransport`` is built from `live_options`
+    (limits, http2) when recording.
+    """
+    mode = (mode or "live").lower()
+    if mode not in UPSTREAM_MODES:
+        raise ValueError(f"Unknown upstream mode {mode!r}; use one of {UPSTREAM_MODES}")
+    if mode == "live":
+        return transport
+    if not cassette_path:
+        raise ValueError(f"The {mode} upstream mode needs a cassette path")
+    if mode == "replay":
+        return ReplayTransport(Cassette(cassette_path), latency_scale=latency_scale)
+    inner = transport or httpx.AsyncHTTPTransport(**live_options)
+    return RecordingTransport(inner, Cassette(cassette_path, writable=True))
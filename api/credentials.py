@@ -0,0 +1,246 @@
+"""
+A pool of Jungle Scout API keys, each with its own quota.
+
+Every request is sent with the key that has the most remaining budget,
+as last reported by the rate-limit headers (minus what has been sent
+since). Each key is paced by its own token bucket, so N keys give about
+N times the throughput of one. A key that keeps getting 401/429 is taken
+out of rotation for a cooldown and then tried again. A key whose quota runs
+out without a reported reset time is tried again after the same cooldown,
+so an exhausted pool waits instead of giving up on its keys for good.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from api.rate_limit import TokenBucket, parse_retry_after
+from config.constants import (
+    CREDENTIAL_COOLDOWN_SECONDS,
+    CREDENTIAL_FAILURE_THRESHOLD,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_REQUESTS_PER_SECOND,
+)
+from config.logging_config import get_logger
+
+logger = get_logger("credentials")
+
+# Responses that count against a key rather than against the request
+KEY_FAILURE_STATUS_CODES = frozenset({401, 429})
+
+
+def parse_quota(
+    headers: Mapping[str, str],
+) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    """Return (limit, remaining, seconds until reset) from rate-limit headers"""
+
+    def header(name: str) -> Optional[float]:
+        value = headers.get(f"x-ratelimit-{name}", headers.get(f"ratelimit-{name}"))
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    limit, remaining, reset = header("limit"), header("remaining"), header("reset")
+    if reset is not None and reset > 1e9:
+        # Large values are epoch timestamps, small ones are delta-seconds
+        reset = max(0.0, reset - time.time())
+    return (
+        int(limit) if limit is not None else None,
+        int(remaining) if remaining is not None else None,
+        reset,
+    )
+
+
+class Credential:
+    """One key_id:api_key pair with its quota, pacing and health"""
+
+    def __init__(
+        self,
+        key_id: str,
+        api_key: str,
+        name: str,
+        rate: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.authorization = f"{key_id}:{api_key}"
+        self.clock = clock
+        self.bucket = TokenBucket(rate, burst, clock=clock)
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.cooldown_until = 0.0
+        self.failures = 0  # Consecutive 401/429 responses
+        self.cooldowns = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.last_used = 0.0
+
+    def budget(self, now: float) -> float:
+        """Requests left in the current quota window (inf when unknown)"""
+        if self.reset_at is not None and now >= self.reset_at:
+            self.remaining, self.reset_at = self.limit, None
+        return math.inf if self.remaining is None else self.remaining
+
+    def update_quota(self, headers: Mapping[str, str], now: float) -> None:
+        limit, remaining, reset = parse_quota(headers)
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+        if reset is not None:
+            self.reset_at = now + reset
+
+    def expect_reset(self, now: float, fallback: float) -> None:
+        """Give an exhausted quota with no known reset one `fallback` away"""
+        if self.remaining is not None and self.remaining <= 0:
+            if self.reset_at is None:
+                self.reset_at = now + fallback
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        budget = self.budget(now)
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "remaining": None if budget == math.inf else budget,
+            "limit": self.limit,
+            "cooling_down_for": round(max(0.0, self.cooldown_until - now), 1),
+            "cooldowns": self.cooldowns,
+        }
+
+
+class CredentialPool:
+    """Routes each request to the healthy key with the most remaining budget"""
+
+    def __init__(
+        self,
+        credentials: Sequence[Credential],
+        failure_threshold: int = CREDENTIAL_FAILURE_THRESHOLD,
+        cooldown: float = CREDENTIAL_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not credentials:
+            raise ValueError("A credential pool needs at least one key")
+        self.credentials: List[Credential] = list(credentials)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+
+    @classmethod
+    def from_keys(
+        cls,
+        keys: Sequence[Tuple[str, str, str]],
+        rate: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        **options: Any,
+    ) -> "CredentialPool":
+        """Build a pool from (name, key_id, api_key) triples"""
+        clock = options.get("clock", time.monotonic)
+        return cls(
+            [
+                Credential(key_id, api_key, name, rate, burst, clock=clock)
+                for name, key_id, api_key in keys
+            ],
+            **options,
+        )
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def healthy(self, now: Optional[float] = None) -> List[Credential]:
+        now = self.clock() if now is None else now
+        return [c for c in self.credentials if now >= c.cooldown_until]
+
+    def choose(self) -> Optional[Credential]:
+        """Best key right now: has a token, most budget, least busy, least recent"""
+        now = self.clock()
+        candidates = [c for c in self.healthy(now) if c.budget(now) > 0]
+        if not candidates:
+            return None
+        return max(
+            candidates,
+            key=lambda c: (
+                c.bucket.available() >= 1,
+                c.budget(now),
+                -c.in_flight,
+                -c.last_used,
+            ),
+        )
+
+    async def acquire(self) -> Credential:
+        """Wait for a key and take one of its rate tokens"""
+        while True:
+            credential = self.choose()
+            if credential is not None:
+                break
+            # Every key is cooling down or out of quota: wait for the first back
+            await asyncio.sleep(self._time_to_next_key())
+        credential.in_flight += 1
+        try:
+            await credential.bucket.acquire()
+        except BaseException:
+            credential.in_flight -= 1
+            raise
+        credential.requests += 1
+        credential.last_used = self.clock()
+        if credential.remaining is not None:
+            credential.remaining -= 1
+            credential.expect_reset(credential.last_used, self.cooldown)
+        return credential
+
+    def release(
+        self,
+        credential: Credential,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Record a key's response (None when the request never completed)"""
+        credential.in_flight -= 1
+        if status_code is None:
+            return
+        now = self.clock()
+        headers = headers or {}
+        credential.update_quota(headers, now)
+        credential.expect_reset(now, self.cooldown)
+        if status_code not in KEY_FAILURE_STATUS_CODES:
+            if status_code < 400:
+                credential.failures = 0
+            return
+
+        retry_after = parse_retry_after(headers) if status_code == 429 else None
+        if retry_after:
+            credential.bucket.pause(retry_after)
+        credential.failures += 1
+        if credential.failures >= self.failure_threshold:
+            credential.failures = 0
+            credential.cooldowns += 1
+            credential.cooldown_until = now + max(self.cooldown, retry_after or 0)
+            logger.warning(
+                "Key %s got %d repeatedly; out of rotation for %.0fs",
+                credential.name,
+                status_code,
+                credential.cooldown_until - now,
+            )
+
+    def _time_to_next_key(self) -> float:
+        now = self.clock()
+        waits = [c.cooldown_until - now for c in self.credentials]
+        waits += [c.reset_at - now for c in self.credentials if c.reset_at]
+        waits = [wait for wait in waits if wait > 0]
+        return max(0.05, min(waits)) if waits else self.cooldown
+
+    def has_alternative(self, credential: Credential) -> bool:
+        """True if a request could be retried on a different healthy key"""
+        return any(c is not credential for c in self.healthy())
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "keys": len(self.credentials),
+            "healthy": len(self.healthy(now)),
+            "per_key": [c.stats(now) for c in self.credentials],
+        }
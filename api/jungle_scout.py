@@ -1,21 +1,260 @@
+import asyncio
+import functools
+import heapq
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from datetime import date
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
 import httpx
-from typing import Optional, Dict, List
-import json
-from config.constants import PRODUCT_SEARCH_LIMIT
+
+from api.cache import ResponseCache, canonical_json, make_cache_key
+from api.cassette import ReplayTransport, make_transport
+from api.credentials import KEY_FAILURE_STATUS_CODES, Credential, CredentialPool
+from api.metrics import Metrics
+from api.progress import report_progress
+from api.query_engine import LocalQueryEngine
+from api.rate_limit import RETRYABLE_STATUS_CODES, RateLimiter, RetryPolicy
+from api.resilience import CircuitBreaker, CircuitOpenError, HedgePolicy
+from api.result_store import ResultStore
+from api.sales_store import SalesEstimateStore, SalesSeries
+from api.singleflight import SingleFlight
+from api.snapshots import SnapshotStore
+from api.streaming import StreamingPageDecoder
+from config.constants import (
+    BATCH_CONCURRENCY,
+    COLLECT_PRODUCTS_MAX,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+    KEYWORDS_BY_ASIN_CHUNK_SIZE,
+    KEYWORDS_BY_ASIN_CONCURRENCY,
+    KEYWORDS_BY_ASIN_MAX_RESULTS,
+    KEYWORDS_BY_ASIN_PAGE_SIZE,
+    PAGINATION_PREFETCH,
+    PRODUCT_PAGE_SIZE_MAX,
+    PRODUCT_SEARCH_LIMIT,
+    SALES_ESTIMATES_DEFAULT_DAYS,
+    SALES_ESTIMATES_GAP_MERGE_DAYS,
+)
+from config.logging_config import LazyJSON, get_logger, redact_headers
+from models.fields import build_attributes, parse_int, parse_list, parse_lowercase
+from models.records import ProductRecord
+from models.requests.keywords_by_asin import (
+    KEYWORDS_BY_ASIN_ATTRIBUTES,
+    uppercase_unique,
+)
+from models.requests.product_search import PRODUCT_SEARCH_ATTRIBUTES
+
+if TYPE_CHECKING:
+    # Imported only for annotations: the store pulls in numpy
+    from api.product_store import ProductStore
+    from api.saved_queries import SavedQueries
+    from api.shared_state import SharedFlight
 
 JUNGLE_SCOUT_API_BASE = "https://developer.junglescout.com"
 
+logger = get_logger("api")
+
+PRODUCT_SEARCH_ATTRIBUTE_NAMES = frozenset(
+    name for name, _, _ in PRODUCT_SEARCH_ATTRIBUTES
+)
+PRODUCT_QUERY_ENDPOINT = "/api/product_database_query"
+SALES_ESTIMATES_ENDPOINT = "/api/sales_estimates_query"
+KEYWORDS_BY_ASIN_ENDPOINT = "/api/keywords/keywords_by_asin_query"
+KEYWORDS_BY_ASIN_ATTRIBUTE_NAMES = frozenset(
+    name for name, _, _ in KEYWORDS_BY_ASIN_ATTRIBUTES
+)
+
+
+class ProductQuery(NamedTuple):
+    """A normalized product search: cache key, request params and body"""
+
+    key: str
+    marketplace: str
+    attributes: Dict[str, Any]
+    page: int
+    page_size: int
+    params: Dict[str, Any]
+    body: Dict[str, Any]
+
 
 class JungleScoutAPI:
-    def __init__(self, api_key: str, key_id: str):
+    def __init__(
+        self,
+        api_key: str,
+        key_id: str,
+        base_url: str = JUNGLE_SCOUT_API_BASE,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_TIMEOUT,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        query_engine: Optional[LocalQueryEngine] = None,
+        product_store: Optional["ProductStore"] = None,
+        shared_flight: Optional["SharedFlight"] = None,
+        saved_queries: Optional["SavedQueries"] = None,
+        credentials: Optional[CredentialPool] = None,
+        sales_store: Optional[SalesEstimateStore] = None,
+        result_store: Optional[ResultStore] = None,
+        snapshots: Optional[SnapshotStore] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        upstream_mode: str = "live",
+        cassette_path: Optional[str] = None,
+        replay_latency_scale: float = 0.0,
+    ):
         self.api_key = api_key
         self.key_id = key_id
-        self.base_url = JUNGLE_SCOUT_API_BASE
+        self.base_url = base_url
         self.headers = {
             "Authorization": f"{key_id}:{api_key}",
             "Content-Type": "application/vnd.api+json",
             "Accept": "application/vnd.junglescout.v1+json",
         }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        # record/replay wrap or replace the live transport (see api.cassette)
+        self.upstream_mode = upstream_mode
+        self._make_transport = functools.partial(
+            make_transport,
+            upstream_mode,
+            cassette_path,
+            transport,
+            latency_scale=replay_latency_scale,
+            limits=self.limits,
+            http2=http2,
+        )
+        self.transport = self._make_transport()
+        self.cache = cache
+        self.query_engine = query_engine
+        self.product_store = product_store
+        self.sales_store = (
+            sales_store if sales_store is not None else SalesEstimateStore()
+        )
+        # Results of tools called with as_handle, read back in slices
+        self.result_store = result_store if result_store is not None else ResultStore()
+        # Previous results of queries run with since_last
+        self.snapshots = snapshots if snapshots is not None else SnapshotStore()
+        self.inflight = SingleFlight()
+        # Deduplicates across worker processes; needs a shared cache to work
+        self.shared_flight = shared_flight if cache is not None else None
+        # Several keys: each request picks one (overriding Authorization)
+        self.credentials = credentials
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Opt-in: duplicate slow reads / fail fast while the API is down
+        self.hedge_policy = hedge_policy
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics or Metrics()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport_used = False
+        self.saved_queries = saved_queries
+        if saved_queries is not None:
+            saved_queries.attach(self)
+
+    async def start(self) -> None:
+        """Open the shared connection pool (called from the server lifespan)"""
+        self._get_client()
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool and drop any keep-alive connections"""
+        if self.saved_queries is not None:
+            await self.saved_queries.stop()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            if self._transport_used:
+                # Closing the last client closed its transport (and cassette)
+                self.transport = self._make_transport()
+            self._transport_used = True
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self.transport,
+            )
+        return self._client
+
+    def stats(self) -> Dict:
+        """Snapshot of client-side metrics, cache and rate limiter state"""
+        return {
+            **self.metrics.snapshot(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "query_engine": (
+                self.query_engine.stats() if self.query_engine is not None else None
+            ),
+            "product_store": (
+                self.product_store.stats() if self.product_store is not None else None
+            ),
+            "sales_store": self.sales_store.stats(),
+            "result_store": self.result_store.stats(),
+            "snapshots": self.snapshots.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "credentials": (
+                self.credentials.stats() if self.credentials is not None else None
+            ),
+            "hedging": (
+                self.hedge_policy.stats() if self.hedge_policy is not None else None
+            ),
+            "circuit_breaker": (
+                self.circuit_breaker.stats()
+                if self.circuit_breaker is not None
+                else None
+            ),
+            "upstream_mode": self.upstream_mode,
+            "replayed_responses": (
+                self.transport.hits
+                if isinstance(self.transport, ReplayTransport)
+                else None
+            ),
+            "inflight_queries": len(self.inflight),
+            "coalesced_queries": self.inflight.shared,
+            "coalesced_across_workers": (
+                self.shared_flight.shared if self.shared_flight is not None else None
+            ),
+            "saved_queries": (
+                self.saved_queries.stats() if self.saved_queries is not None else None
+            ),
+        }
 
     async def make_request(
         self,
@@ -23,228 +262,951 @@ class JungleScoutAPI:
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
         method: str = "POST",
+        record_factory: Optional[Callable[[Any], Any]] = None,
     ) -> Dict:
-        async with httpx.AsyncClient() as client:
-            url = f"{self.base_url}{endpoint}"
-
-            # Debug logging
-            print(f"DEBUG: Making {method} request to {url}")
-            print(f"DEBUG: Headers: {self.headers}")
-            print(f"DEBUG: Params: {params}")
-            print(f"DEBUG: Data: {json.dumps(data, indent=2) if data else None}")
-
-            if method.upper() == "POST":
-                response = await client.post(
-                    url, headers=self.headers, params=params, json=data
+        """Send a request and return the decoded JSON:API document
+
+        With `record_factory`, a successful body is streamed: each ``data[]``
+        entry is decoded and passed through the factory as it arrives,
+        instead of buffering the whole body and building one dict tree.
+        """
+        client = self._get_client()
+        log_extra = {"request_id": uuid.uuid4().hex[:12], "endpoint": endpoint}
+
+        # Arguments are formatted lazily, only if DEBUG is enabled
+        logger.debug(
+            "%s %s params=%s data=%s",
+            method,
+            endpoint,
+            params,
+            LazyJSON(data),
+            extra=log_extra,
+        )
+
+        start = time.perf_counter()
+        stream = record_factory is not None
+        response = await self._send_with_retries(
+            client, method, endpoint, params, data, stream=stream
+        )
+        try:
+            if stream and response.status_code >= 400:
+                await response.aread()
+            return await self._handle_response(
+                response, method, endpoint, start, log_extra, record_factory
+            )
+        finally:
+            await response.aclose()
+
+    async def _handle_response(
+        self,
+        response: httpx.Response,
+        method: str,
+        endpoint: str,
+        start: float,
+        log_extra: Dict[str, Any],
+        record_factory: Optional[Callable[[Any], Any]],
+    ) -> Dict:
+        """Log and record metrics for a response, then decode its body"""
+        # Network time and statuses are recorded per attempt while sending
+        elapsed = time.perf_counter() - start
+        log_extra["status"] = response.status_code
+        log_extra["elapsed_ms"] = round(elapsed * 1000, 2)
+
+        if response.status_code >= 400:
+            logger.warning(
+                "%s %s failed with %d: %.2000s",
+                method,
+                endpoint,
+                response.status_code,
+                response.text,
+                extra=log_extra,
+            )
+        else:
+            logger.info(
+                "%s %s -> %d in %.1fms",
+                method,
+                endpoint,
+                response.status_code,
+                log_extra["elapsed_ms"],
+                extra=log_extra,
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "response headers %s",
+                    redact_headers(response.headers),
+                    extra=log_extra,
                 )
-            else:
-                response = await client.get(url, headers=self.headers, params=params)
-
-            # Debug response
-            print(f"DEBUG: Response status: {response.status_code}")
-            print(f"DEBUG: Response headers: {dict(response.headers)}")
-            
-            if response.status_code >= 400:
-                print(f"DEBUG: Error response body: {response.text}")
-            
-            response.raise_for_status()
-            return response.json()
-
-    def _parse_list_param(self, value):
-        """Parse a list parameter that might come as a string or list"""
-        if value is None:
-            return None
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            try:
-                # Try to parse as JSON if it's a string representation of a list
-                parsed = json.loads(value)
-                if isinstance(parsed, list):
-                    return parsed
-            except (json.JSONDecodeError, TypeError):
-                pass
-            # If it's a single string, treat as a single-item list
-            return [value]
-        return None
-
-    def _parse_numeric_param(self, value):
-        """Parse a numeric parameter that might come as a string"""
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return value
-        if isinstance(value, str):
+
+        response.raise_for_status()
+        if record_factory is None:
+            self.metrics.observe_size("response", len(response.content))
+            with self.metrics.stage("decode"):
+                return response.json()
+
+        # Body download and decoding overlap, so both count as decode time
+        with self.metrics.stage("decode"):
+            decoder = StreamingPageDecoder(record_factory)
+            records: List[Any] = []
+            async for chunk in response.aiter_bytes():
+                records.extend(decoder.feed(chunk))
+            records.extend(decoder.close())
+        self.metrics.observe_size("response", decoder.bytes_read)
+        document = decoder.document
+        if decoder.array_key in document:
+            document[decoder.array_key] = records
+        return document
+
+    async def _send_with_retries(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        data: Optional[Dict],
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send through the shared rate limiter, retrying 429/5xx and network errors
+
+        With `stream`, the returned response's body has not been read yet.
+        With a circuit breaker, an attempt while the circuit is open raises
+        CircuitOpenError without sending anything.
+
+        Each attempt records its own metrics: ``rate_limit`` (waiting for a
+        slot, token and key), ``network`` (the send itself) and its status
+        code; the waits between attempts are recorded as ``backoff``.
+        """
+        metrics = self.metrics
+        method = "POST" if method.upper() == "POST" else "GET"
+        pool = self.credentials
+        breaker = self.circuit_breaker
+        attempt = 0
+        while True:
+            attempt += 1
+            credential: Optional[Credential] = None
+            if breaker is not None:
+                breaker.before_request()
+            waited = time.perf_counter()
             try:
-                # Try to parse as float first, then int
-                float_val = float(value)
-                # If it's a whole number, return as int
-                if float_val.is_integer():
-                    return int(float_val)
-                return float_val
-            except (ValueError, TypeError):
-                return None
-        return None
-
-    def _parse_bool_param(self, value):
-        """Parse a boolean parameter that might come as a string"""
-        if value is None:
-            return None
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            return value.lower() in ('true', '1', 'yes', 'on')
-        return bool(value)
-
-    def _normalize_seller_types(self, seller_types):
-        """Normalize seller types to lowercase to match API expectations"""
-        if seller_types is None:
-            return None
-        
-        normalized = []
-        for seller_type in seller_types:
-            if isinstance(seller_type, str):
-                normalized.append(seller_type.lower())
+                async with self.rate_limiter.slot():
+                    request = client.build_request(
+                        method,
+                        endpoint,
+                        params=params,
+                        json=data if method == "POST" else None,
+                    )
+                    if pool is not None:
+                        credential = await pool.acquire()
+                        request.headers["Authorization"] = credential.authorization
+                    sent = time.perf_counter()
+                    metrics.observe_stage("rate_limit", sent - waited)
+                    try:
+                        if self.hedge_policy is not None:
+                            response = await self._hedged_send(
+                                client, request, endpoint, stream
+                            )
+                        else:
+                            response = await client.send(request, stream=stream)
+                    except BaseException:
+                        if credential is not None:
+                            pool.release(credential)
+                        raise
+                    finally:
+                        metrics.observe_stage("network", time.perf_counter() - sent)
+                    metrics.record_status(response.status_code)
+            except httpx.TransportError as e:
+                if breaker is not None:
+                    breaker.record_failure()
+                if attempt >= self.retry_policy.max_attempts:
+                    raise
+                self.rate_limiter.retries += 1
+                delay = self.retry_policy.delay(attempt)
+                logger.info(
+                    "%s %s attempt %d failed (%r); retrying in %.2fs",
+                    method,
+                    endpoint,
+                    attempt,
+                    e,
+                    delay,
+                )
+                with metrics.stage("backoff"):
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+
+            if breaker is not None:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if credential is None:
+                retry_after = self.rate_limiter.observe(
+                    response.status_code, response.headers
+                )
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
             else:
-                normalized.append(seller_type)
-        
-        return normalized
+                # A throttled or rejected key only benches that key
+                pool.release(credential, response.status_code, response.headers)
+                retry_after = self.rate_limiter.observe(
+                    response.status_code, response.headers, pause_all=False
+                )
+                rerouted = response.status_code in KEY_FAILURE_STATUS_CODES and (
+                    pool.has_alternative(credential)
+                )
+                retryable = rerouted or response.status_code in RETRYABLE_STATUS_CODES
+                if rerouted:
+                    retry_after = 0.0  # Another key can take it right away
+            if not retryable or attempt >= self.retry_policy.max_attempts:
+                return response
+            self.rate_limiter.retries += 1
+            await response.aclose()
+            delay = self.retry_policy.delay(attempt, retry_after)
+            logger.info(
+                "%s %s attempt %d got %d; retrying in %.2fs",
+                method,
+                endpoint,
+                attempt,
+                response.status_code,
+                delay,
+            )
+            with metrics.stage("backoff"):
+                await asyncio.sleep(delay)
 
-    async def search_products(
+    async def _hedged_send(
         self,
-        marketplace: str = "us",
-        page: int = 1,
-        page_size: int = PRODUCT_SEARCH_LIMIT,
-        product_tiers: Optional[List[str]] = None,
-        seller_types: Optional[List[str]] = None,
-        include_keywords: Optional[List[str]] = None,
-        exclude_keywords: Optional[List[str]] = None,
-        exclude_top_brands: Optional[bool] = None,
-        exclude_unavailable_products: Optional[bool] = None,
-        min_price: Optional[float] = None,
-        max_price: Optional[float] = None,
-        min_net: Optional[float] = None,
-        max_net: Optional[float] = None,
-        min_rank: Optional[int] = None,
-        max_rank: Optional[int] = None,
-        min_sales: Optional[int] = None,
-        max_sales: Optional[int] = None,
-        min_revenue: Optional[float] = None,
-        max_revenue: Optional[float] = None,
-        min_reviews: Optional[int] = None,
-        max_reviews: Optional[int] = None,
-        min_rating: Optional[float] = None,
-        max_rating: Optional[float] = None,
-        min_weight: Optional[float] = None,
-        max_weight: Optional[float] = None,
-    ) -> Dict:
-        # Normalize marketplace to lowercase
-        marketplace = marketplace.lower() if marketplace else "us"
-        
-        # Parse and validate parameters
-        page = self._parse_numeric_param(page) or 1
-        page_size = self._parse_numeric_param(page_size) or PRODUCT_SEARCH_LIMIT
-        
-        # Parse list parameters
-        product_tiers = self._parse_list_param(product_tiers)
-        seller_types = self._parse_list_param(seller_types)
-        include_keywords = self._parse_list_param(include_keywords)
-        exclude_keywords = self._parse_list_param(exclude_keywords)
-        
-        # Parse boolean parameters
-        exclude_top_brands = self._parse_bool_param(exclude_top_brands)
-        exclude_unavailable_products = self._parse_bool_param(exclude_unavailable_products)
-        
-        # Parse numeric parameters
-        min_price = self._parse_numeric_param(min_price)
-        max_price = self._parse_numeric_param(max_price)
-        min_net = self._parse_numeric_param(min_net)
-        max_net = self._parse_numeric_param(max_net)
-        min_rank = self._parse_numeric_param(min_rank)
-        max_rank = self._parse_numeric_param(max_rank)
-        min_sales = self._parse_numeric_param(min_sales)
-        max_sales = self._parse_numeric_param(max_sales)
-        min_revenue = self._parse_numeric_param(min_revenue)
-        max_revenue = self._parse_numeric_param(max_revenue)
-        min_reviews = self._parse_numeric_param(min_reviews)
-        max_reviews = self._parse_numeric_param(max_reviews)
-        min_rating = self._parse_numeric_param(min_rating)
-        max_rating = self._parse_numeric_param(max_rating)
-        min_weight = self._parse_numeric_param(min_weight)
-        max_weight = self._parse_numeric_param(max_weight)
-
-        # Build attributes dictionary with only non-None values
-        attributes = {}
-        
-        if product_tiers is not None:
-            attributes["product_tiers"] = product_tiers
-        if seller_types is not None:
-            attributes["seller_types"] = self._normalize_seller_types(seller_types)
-        if include_keywords is not None:
-            attributes["include_keywords"] = include_keywords
-        if exclude_keywords is not None:
-            attributes["exclude_keywords"] = exclude_keywords
-        if exclude_top_brands is not None:
-            attributes["exclude_top_brands"] = exclude_top_brands
-        if exclude_unavailable_products is not None:
-            attributes["exclude_unavailable_products"] = exclude_unavailable_products
-        if min_price is not None:
-            attributes["min_price"] = min_price
-        if max_price is not None:
-            attributes["max_price"] = max_price
-        if min_net is not None:
-            attributes["min_net"] = min_net
-        if max_net is not None:
-            attributes["max_net"] = max_net
-        if min_rank is not None:
-            attributes["min_rank"] = min_rank
-        if max_rank is not None:
-            attributes["max_rank"] = max_rank
-        if min_sales is not None:
-            attributes["min_sales"] = min_sales
-        if max_sales is not None:
-            attributes["max_sales"] = max_sales
-        if min_revenue is not None:
-            attributes["min_revenue"] = min_revenue
-        if max_revenue is not None:
-            attributes["max_revenue"] = max_revenue
-        if min_reviews is not None:
-            attributes["min_reviews"] = min_reviews
-        if max_reviews is not None:
-            attributes["max_reviews"] = max_reviews
-        if min_rating is not None:
-            attributes["min_rating"] = min_rating
-        if max_rating is not None:
-            attributes["max_rating"] = max_rating
-        if min_weight is not None:
-            attributes["min_weight"] = min_weight
-        if max_weight is not None:
-            attributes["max_weight"] = max_weight
+        client: httpx.AsyncClient,
+        request: httpx.Request,
+        endpoint: str,
+        stream: bool,
+    ) -> httpx.Response:
+        """Send, and send a duplicate if no answer comes by the hedge delay
+
+        The first response (of any status) wins and the other request is
+        cancelled, or closed if it answered too. Only successful latencies
+        feed the delay.
+        """
+        policy = self.hedge_policy
+        policy.earn()
+
+        async def send(request: httpx.Request) -> httpx.Response:
+            start = time.perf_counter()
+            response = await client.send(request, stream=stream)
+            if response.status_code < 400:
+                policy.observe(endpoint, time.perf_counter() - start)
+            return response
+
+        async def send_hedge() -> httpx.Response:
+            # A hedge costs a rate token but shares the original's slot
+            await self.rate_limiter.bucket.acquire()
+            duplicate = httpx.Request(
+                request.method,
+                request.url,
+                headers=request.headers,
+                content=request.content,
+            )
+            return await send(duplicate)
+
+        delay = policy.delay(endpoint)
+        primary = asyncio.ensure_future(send(request))
+        tasks = [primary]
+        winner = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and policy.spend():
+                    logger.debug("%s slower than %.3fs; hedging", endpoint, delay)
+                    tasks.append(asyncio.ensure_future(send_hedge()))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if task is not primary:
+                            policy.won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+
+    @staticmethod
+    def _product_query(
+        marketplace: str, filters: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Normalize a product search into (marketplace, attributes body)"""
+        unknown = filters.keys() - PRODUCT_SEARCH_ATTRIBUTE_NAMES
+        if unknown:
+            raise TypeError(f"Unknown search_products filters: {sorted(unknown)}")
+
+        attributes = build_attributes(PRODUCT_SEARCH_ATTRIBUTES, filters)
 
         # If no attributes are provided, add a default search to avoid API error
         if not attributes:
             attributes["include_keywords"] = ["product"]
+        return parse_lowercase(marketplace) or "us", attributes
+
+    def _prepare_search(
+        self, marketplace: str, page: Any, page_size: Any, filters: Dict[str, Any]
+    ) -> ProductQuery:
+        """Normalize search_products arguments into a ProductQuery"""
+        marketplace, attributes = self._product_query(marketplace, filters)
+        page = parse_int(page) or 1
+        page_size = parse_int(page_size) or PRODUCT_SEARCH_LIMIT
 
         post_data = {
-            "data": {
-                "type": "product_database_query",
-                "attributes": attributes
-            }
+            "data": {"type": "product_database_query", "attributes": attributes}
         }
-        
+
         # Set up query parameters
-        params = {
-            "marketplace": marketplace,
-            "sort": "name",
-            "page[size]": page_size
-        }
-        
+        params = {"marketplace": marketplace, "sort": "name", "page[size]": page_size}
+
         # Add page parameter if it's not the first page
         if page > 1:
             params["page[number]"] = page
-        
-        return await self.make_request(
-            endpoint="/api/product_database_query", 
-            params=params,
-            data=post_data
+
+        key = make_cache_key(
+            PRODUCT_QUERY_ENDPOINT, attributes, marketplace, page, page_size
+        )
+        return ProductQuery(
+            key, marketplace, attributes, page, page_size, params, post_data
         )
+
+    def product_query_key(
+        self,
+        marketplace: str = "us",
+        page: int = 1,
+        page_size: int = PRODUCT_SEARCH_LIMIT,
+        **filters: Any,
+    ) -> str:
+        """Cache key search_products would use for these arguments"""
+        return self._prepare_search(marketplace, page, page_size, filters).key
+
+    async def search_products(
+        self,
+        marketplace: str = "us",
+        page: int = 1,
+        page_size: int = PRODUCT_SEARCH_LIMIT,
+        **filters: Any,
+    ) -> Dict:
+        """Query the product database
+
+        `filters` are the attribute fields of PRODUCT_SEARCH_FIELDS
+        (product_tiers, seller_types, min_price, ...). Values may arrive as
+        loosely typed strings; the field table coerces them and builds the
+        attributes body in one pass.
+        """
+        normalize_start = time.perf_counter()
+        query = self._prepare_search(marketplace, page, page_size, filters)
+        self.metrics.observe_stage("normalize", time.perf_counter() - normalize_start)
+        if self.cache is not None:
+            cached = await self.cache.aget(query.key)
+            if cached is not None:
+                return cached
+        if self.saved_queries is not None:
+            # Possibly stale; a stale answer schedules a background refresh
+            saved = self.saved_queries.serve(query.key)
+            if saved is not None:
+                return saved
+        if self.query_engine is not None:
+            with self.metrics.stage("local_query"):
+                products = self.query_engine.answer(query.marketplace, query.attributes)
+            if products is not None:
+                return _local_page(products, query.page, query.page_size)
+        return await self._fetch_products(query)
+
+    async def refresh_products(
+        self,
+        marketplace: str = "us",
+        page: int = 1,
+        page_size: int = PRODUCT_SEARCH_LIMIT,
+        **filters: Any,
+    ) -> Tuple[str, Dict]:
+        """Fetch a search from the API, bypassing every local answer
+
+        Returns (cache key, result); the caches are updated as usual.
+        """
+        query = self._prepare_search(marketplace, page, page_size, filters)
+        return query.key, await self._fetch_products(query)
+
+    async def _fetch_products(self, query: ProductQuery) -> Dict:
+        """Fetch one page from the API, then fill the caches and stores"""
+
+        async def fetch():
+            result = await self.make_request(
+                endpoint=PRODUCT_QUERY_ENDPOINT,
+                params=query.params,
+                data=query.body,
+                record_factory=ProductRecord.from_entry,
+            )
+            if self.cache is not None:
+                await self.cache.aset(query.key, result)
+            if self.saved_queries is not None:
+                self.saved_queries.observe(query.key, result)
+            if self.product_store is not None:
+                self.product_store.ingest(result.get("data") or [])
+            if (
+                self.query_engine is not None
+                and query.page == 1
+                and _is_last_page(
+                    result, len(result.get("data") or []), query.page_size
+                )
+            ):
+                self.query_engine.store(
+                    query.marketplace, query.attributes, result.get("data") or []
+                )
+            return result
+
+        if self.shared_flight is not None:
+            fetch = functools.partial(
+                self.shared_flight.do,
+                query.key,
+                fetch,
+                lambda: self.cache.get(query.key),
+            )
+
+        try:
+            # Identical concurrent queries share a single upstream request
+            return await self.inflight.do(query.key, fetch)
+        except CircuitOpenError:
+            # While the API is down, an expired answer beats no answer
+            stale = (
+                await self.cache.aget(query.key, allow_stale=True)
+                if self.cache is not None
+                else None
+            )
+            if stale is None:
+                raise
+            logger.info("Circuit open; serving an expired cached result")
+            meta = {**(stale.get("meta") or {}), "served_stale": True}
+            return {**stale, "meta": meta}
+
+    async def iter_products(
+        self,
+        max_results: int = COLLECT_PRODUCTS_MAX,
+        page: int = 1,
+        page_size: int = PRODUCT_PAGE_SIZE_MAX,
+        prefetch: int = PAGINATION_PREFETCH,
+        **filters: Any,
+    ) -> AsyncIterator[Dict]:
+        """Yield products across pages, fetching up to `prefetch` pages ahead
+
+        Pages are requested by number so several can be in flight at once.
+        The walk stops at `max_results`, at the last page reported by
+        `meta.total_items`, or when a page has no `links.next` (or comes back
+        short when the response carries no links).
+
+        Progress (products so far out of the expected total) is reported to
+        the current tool call after each page. Cancelling the consumer
+        cancels the pages still in flight.
+        """
+        max_results = parse_int(max_results) or 0
+        page = parse_int(page) or 1
+        page_size = min(
+            parse_int(page_size) or PRODUCT_PAGE_SIZE_MAX, PRODUCT_PAGE_SIZE_MAX
+        )
+        if max_results <= 0:
+            return
+        # A walk from page 1 to the last page sees every matching product, so
+        # the whole set can answer narrower queries locally afterwards
+        collected: Optional[List[Dict]] = None
+        if self.query_engine is not None and page == 1:
+            marketplace = filters.get("marketplace", "us")
+            query = self._product_query(
+                marketplace, {k: v for k, v in filters.items() if k != "marketplace"}
+            )
+            collected = []
+        last_page = page + (max_results - 1) // page_size
+        next_page = page
+        pending = deque()
+
+        def schedule():
+            nonlocal next_page
+            pending.append(
+                asyncio.ensure_future(
+                    self.search_products(page=next_page, page_size=page_size, **filters)
+                )
+            )
+            next_page += 1
+
+        schedule()
+        yielded = 0
+        try:
+            while pending:
+                result = await pending.popleft()
+                data = result.get("data") or []
+
+                total_items = (result.get("meta") or {}).get("total_items")
+                if isinstance(total_items, int):
+                    last_page = min(last_page, (total_items - 1) // page_size + 1)
+                if "links" in result:
+                    has_more = bool((result.get("links") or {}).get("next"))
+                else:
+                    has_more = len(data) >= page_size
+                if not data or not has_more:
+                    last_page = min(last_page, next_page - len(pending) - 1)
+
+                if collected is not None:
+                    collected.extend(data)
+                    if not data or _is_last_page(result, len(collected), page_size):
+                        self.query_engine.store(*query, collected)
+                        collected = None
+
+                expected = max_results
+                if isinstance(total_items, int):
+                    available = total_items - (page - 1) * page_size
+                    expected = min(expected, max(available, 0))
+                await report_progress(
+                    min(yielded + len(data), expected),
+                    expected,
+                    f"Fetched page {next_page - len(pending) - 1}",
+                )
+
+                for product in data:
+                    yield product
+                    yielded += 1
+                    if yielded >= max_results:
+                        return
+
+                # Drop speculative pages past the end, then refill the window
+                while pending and next_page - 1 > last_page:
+                    pending.pop().cancel()
+                    next_page -= 1
+                while len(pending) < max(prefetch, 1) and next_page <= last_page:
+                    schedule()
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def collect_products(
+        self,
+        max_results: int = COLLECT_PRODUCTS_MAX,
+        page: int = 1,
+        **filters: Any,
+    ) -> Dict:
+        """Collect up to `max_results` products (capped at COLLECT_PRODUCTS_MAX)"""
+        max_results = min(
+            parse_int(max_results) or COLLECT_PRODUCTS_MAX,
+            COLLECT_PRODUCTS_MAX,
+        )
+        products = [
+            product
+            async for product in self.iter_products(
+                max_results=max_results, page=page, **filters
+            )
+        ]
+        return {"data": products, "meta": {"total_collected": len(products)}}
+
+    async def search_products_batch(
+        self,
+        queries: List[Dict[str, Any]],
+        concurrency: int = BATCH_CONCURRENCY,
+        page_size: int = PRODUCT_SEARCH_LIMIT,
+    ) -> Dict:
+        """Run many search_products queries with bounded concurrency
+
+        Identical queries are sent once. Results are keyed by each query's
+        `label`, or by its canonical JSON when no label is given. A failing
+        query records an error under its key instead of failing the batch.
+        Progress is reported as each unique query completes.
+        """
+        semaphore = asyncio.Semaphore(max(parse_int(concurrency) or 1, 1))
+        labels: Dict[str, str] = {}
+        unique: Dict[str, Dict[str, Any]] = {}
+        for query in queries:
+            filters = {k: v for k, v in query.items() if v is not None}
+            label = filters.pop("label", None)
+            key = canonical_json(filters)
+            labels[str(label) if label is not None else key] = key
+            unique.setdefault(key, filters)
+
+        done = 0
+
+        async def run(filters: Dict[str, Any]) -> Dict:
+            nonlocal done
+            async with semaphore:
+                try:
+                    outcome = await self.search_products(
+                        **{"page_size": page_size, **filters}
+                    )
+                except Exception as e:
+                    outcome = {"error": f"{type(e).__name__}: {e}"}
+            done += 1
+            await report_progress(
+                done, len(unique), f"{done} of {len(unique)} queries done"
+            )
+            return outcome
+
+        outcomes = await asyncio.gather(*(run(filters) for filters in unique.values()))
+        by_key = dict(zip(unique, outcomes))
+        results = {label: by_key[key] for label, key in labels.items()}
+        return {
+            "results": results,
+            "meta": {
+                "queries": len(queries),
+                "unique_queries": len(unique),
+                "errors": sum(1 for outcome in outcomes if "error" in outcome),
+            },
+        }
+
+    async def get_sales_estimates(
+        self,
+        asin: str,
+        marketplace: str = "us",
+        start_date: Any = None,
+        end_date: Any = None,
+    ) -> Dict:
+        """Daily sales estimates of an ASIN between two dates (inclusive)
+
+        Days already in the sales store are served locally; only the gaps
+        in its coverage are requested from the API, concurrently. Dates
+        are ``datetime.date`` objects or YYYY-MM-DD strings; the default
+        window is the last SALES_ESTIMATES_DEFAULT_DAYS complete days.
+        """
+        store = self.sales_store
+        asin = asin.strip().upper()
+        marketplace = parse_lowercase(marketplace) or "us"
+        if end_date is None:
+            end = store.today().toordinal() - 1
+        else:
+            end = _day(end_date)
+        if start_date is None:
+            start = end - SALES_ESTIMATES_DEFAULT_DAYS + 1
+        else:
+            start = _day(start_date)
+        if start > end:
+            raise ValueError("start_date must not be after end_date")
+
+        series = store.series(marketplace, asin)
+        gaps = series.gaps(start, end, merge_within=SALES_ESTIMATES_GAP_MERGE_DAYS)
+        store.days_requested += end - start + 1
+        await asyncio.gather(
+            *(
+                self._fetch_sales(series, marketplace, asin, low, high)
+                for low, high in gaps
+            )
+        )
+
+        data = []
+        for day, units, price in series.window(start, end):
+            iso_day = date.fromordinal(day).isoformat()
+            data.append(
+                {
+                    "id": f"{marketplace}/{asin}/{iso_day}",
+                    "type": "sales_estimate",
+                    "attributes": {
+                        "asin": asin,
+                        "date": iso_day,
+                        "estimated_units_sold": _whole(units),
+                        "last_known_price": price,
+                    },
+                }
+            )
+        return {
+            "data": data,
+            "meta": {
+                **series.info,
+                "marketplace": marketplace,
+                "asin": asin,
+                "start_date": date.fromordinal(start).isoformat(),
+                "end_date": date.fromordinal(end).isoformat(),
+                "fetched_ranges": [
+                    [date.fromordinal(day).isoformat() for day in gap] for gap in gaps
+                ],
+            },
+        }
+
+    async def _fetch_sales(
+        self, series: SalesSeries, marketplace: str, asin: str, start: int, end: int
+    ) -> None:
+        """Request [start, end] of a series and record it in the sales store"""
+        params = {
+            "marketplace": marketplace,
+            "asin": asin,
+            "start_date": date.fromordinal(start).isoformat(),
+            "end_date": date.fromordinal(end).isoformat(),
+        }
+
+        async def fetch():
+            result = await self.make_request(
+                endpoint=SALES_ESTIMATES_ENDPOINT, params=params, method="GET"
+            )
+            points = []
+            for entry in result.get("data") or []:
+                attributes = dict(entry.get("attributes") or {})
+                if str(attributes.get("asin", asin)).upper() != asin:
+                    continue  # Variants are series of their own
+                for point in attributes.pop("data", None) or []:
+                    try:
+                        day = _day(point["date"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    points.append(
+                        (
+                            day,
+                            point.get("estimated_units_sold"),
+                            point.get("last_known_price"),
+                        )
+                    )
+                attributes.pop("asin", None)
+                series.info.update(attributes)
+            self.sales_store.record(series, start, end, points)
+
+        key = canonical_json([SALES_ESTIMATES_ENDPOINT, params])
+        await self.inflight.do(key, fetch)
+
+    async def iter_keywords_by_asin(
+        self,
+        asins: Sequence[str],
+        marketplace: str = "us",
+        max_results: int = KEYWORDS_BY_ASIN_MAX_RESULTS,
+        concurrency: int = KEYWORDS_BY_ASIN_CONCURRENCY,
+        summary: Optional[Dict[str, Any]] = None,
+        **filters: Any,
+    ) -> AsyncIterator[Dict]:
+        """Yield the ranking keywords of many ASINs, highest search volume first
+
+        ASINs are split into chunks of KEYWORDS_BY_ASIN_CHUNK_SIZE (the most
+        one request accepts), and up to `concurrency` chunks are walked at
+        once, each following its ``links.next`` cursor. Every chunk comes back
+        sorted by exact search volume, so the chunks are merged: a keyword is
+        yielded as soon as no chunk still running can return a higher one, and
+        `max_results` keeps the top-ranked keywords rather than the first to
+        arrive. A keyword that ranks for ASINs in several chunks is yielded
+        once. A chunk that fails records an error in `summary` instead of
+        failing the walk.
+
+        `summary`, when given, is filled with chunk, page, duplicate and
+        error counts. Progress (chunks done out of all chunks) is reported to
+        the current tool call; stopping early or cancelling the consumer
+        cancels the chunks still running.
+        """
+        unknown = filters.keys() - KEYWORDS_BY_ASIN_ATTRIBUTE_NAMES
+        if unknown:
+            raise TypeError(f"Unknown keywords_by_asin filters: {sorted(unknown)}")
+        asins = uppercase_unique(parse_list(asins)) or []
+        if not asins:
+            raise ValueError("At least one ASIN is needed")
+        marketplace = parse_lowercase(marketplace) or "us"
+        max_results = min(
+            parse_int(max_results) or KEYWORDS_BY_ASIN_MAX_RESULTS,
+            KEYWORDS_BY_ASIN_MAX_RESULTS,
+        )
+        attributes = build_attributes(KEYWORDS_BY_ASIN_ATTRIBUTES, filters)
+
+        # Sorted, so the same ASINs always make the same (cacheable) requests
+        ordered = sorted(asins)
+        chunks = [
+            ordered[start : start + KEYWORDS_BY_ASIN_CHUNK_SIZE]
+            for start in range(0, len(ordered), KEYWORDS_BY_ASIN_CHUNK_SIZE)
+        ]
+        summary = summary if summary is not None else {}
+        summary.update(asins=len(asins), chunks=len(chunks), pages=0, duplicates=0)
+        summary["errors"] = []
+        semaphore = asyncio.Semaphore(max(parse_int(concurrency) or 1, 1))
+        # (chunk index, page of keywords), then (index, None) once it is finished
+        pages: asyncio.Queue = asyncio.Queue()
+
+        async def walk(index: int, chunk: List[str]) -> None:
+            params = {
+                "marketplace": marketplace,
+                "sort": "-monthly_search_volume_exact",
+                "page[size]": KEYWORDS_BY_ASIN_PAGE_SIZE,
+            }
+            body = {
+                "data": {
+                    "type": "keywords_by_asin_query",
+                    "attributes": {**attributes, "asins": chunk},
+                }
+            }
+            try:
+                async with semaphore:
+                    while True:
+                        result = await self._keywords_page(params, body)
+                        summary["pages"] += 1
+                        data = result.get("data") or []
+                        pages.put_nowait((index, data))
+                        next_link = (result.get("links") or {}).get("next")
+                        if not data or not next_link:
+                            break
+                        params = dict(httpx.URL(next_link).params)
+            except Exception as e:
+                summary["errors"].append(
+                    {"asins": chunk, "error": f"{type(e).__name__}: {e}"}
+                )
+            finally:
+                pages.put_nowait((index, None))
+
+        def volume(keyword: Dict) -> float:
+            attributes = keyword.get("attributes") or {}
+            return float(attributes.get("monthly_search_volume_exact") or 0)
+
+        tasks = [
+            asyncio.ensure_future(walk(index, chunk))
+            for index, chunk in enumerate(chunks)
+        ]
+        # Highest volume each chunk may still return; unstarted chunks are unbounded
+        bounds = [math.inf] * len(chunks)
+        ranked: List[Tuple[float, int, Dict]] = []
+        seen = set()
+        running = len(tasks)
+        yielded = 0
+        try:
+            while running:
+                index, data = await pages.get()
+                if data is None:
+                    bounds[index] = -math.inf
+                    running -= 1
+                    done = len(chunks) - running
+                    await report_progress(
+                        done, len(chunks), f"{done} of {len(chunks)} ASIN chunks done"
+                    )
+                else:
+                    for keyword in data:
+                        key = keyword.get("id") or keyword.get("attributes", {}).get(
+                            "name"
+                        )
+                        if key in seen:
+                            summary["duplicates"] += 1
+                            continue
+                        seen.add(key)
+                        heapq.heappush(ranked, (-volume(keyword), len(seen), keyword))
+                    if data:
+                        bounds[index] = volume(data[-1])
+                ceiling = max(bounds)
+                while ranked and -ranked[0][0] >= ceiling:
+                    yield heapq.heappop(ranked)[2]
+                    yielded += 1
+                    if yielded >= max_results:
+                        return
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _keywords_page(self, params: Dict[str, Any], body: Dict) -> Dict:
+        """One keywords_by_asin page, from the cache or the API"""
+        key = canonical_json([KEYWORDS_BY_ASIN_ENDPOINT, params, body])
+        if self.cache is not None:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+
+        async def fetch():
+            result = await self.make_request(
+                endpoint=KEYWORDS_BY_ASIN_ENDPOINT, params=params, data=body
+            )
+            if self.cache is not None:
+                await self.cache.aset(key, result)
+            return result
+
+        return await self.inflight.do(key, fetch)
+
+    async def keywords_by_asin(
+        self,
+        asins: Sequence[str],
+        marketplace: str = "us",
+        max_results: int = KEYWORDS_BY_ASIN_MAX_RESULTS,
+        **filters: Any,
+    ) -> Dict:
+        """Collect the deduplicated ranking keywords of any number of ASINs"""
+        summary: Dict[str, Any] = {}
+        keywords = [
+            keyword
+            async for keyword in self.iter_keywords_by_asin(
+                asins,
+                marketplace=marketplace,
+                max_results=max_results,
+                summary=summary,
+                **filters,
+            )
+        ]
+        return {
+            "data": keywords,
+            "meta": {**summary, "total_collected": len(keywords)},
+        }
+
+    async def save_query(
+        self,
+        name: str,
+        query: Optional[Dict[str, Any]] = None,
+        refresh_minutes: float = 60,
+        remove: bool = False,
+    ) -> Dict:
+        """Save (or with `remove`, delete) a search kept warm in the background
+
+        `query` takes search_products arguments. search_products calls with
+        the same arguments are then answered from the saved result.
+        """
+        if self.saved_queries is None:
+            raise RuntimeError("Saved queries are not enabled on this server")
+        if remove:
+            return {"name": name, "removed": self.saved_queries.remove(name)}
+        if query is None:
+            raise ValueError("A query is needed to save a search")
+        return self.saved_queries.save(name, query, float(refresh_minutes) * 60)
+
+    async def list_saved_queries(self) -> Dict:
+        """Saved queries with their age, schedule and the scheduler state"""
+        if self.saved_queries is None:
+            raise RuntimeError("Saved queries are not enabled on this server")
+        return self.saved_queries.snapshot()
+
+    async def analyze_products(self, **options: Any) -> Dict:
+        """Summarize products fetched so far from the local columnar store
+
+        Options are those of ProductStore.analyze (filters, marketplace,
+        group_by, metrics, percentiles, top_k, sort_by, ascending). No API
+        call is made.
+        """
+        if self.product_store is None:
+            raise RuntimeError(
+                "analyze_products needs the local product store (pip install numpy)"
+            )
+        with self.metrics.stage("analyze"):
+            return self.product_store.analyze(**options)
+
+
+def _day(value: Any) -> int:
+    """Day number (date ordinal) of a date or a YYYY-MM-DD string"""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def _whole(value: Optional[float]) -> Any:
+    """Unit counts come back as the integers they were sent as"""
+    return int(value) if value is not None and value.is_integer() else value
+
+
+def _is_last_page(result: Dict, seen: int, page_size: int) -> bool:
+    """True if a response (with `seen` products so far) ends the result set"""
+    total_items = (result.get("meta") or {}).get("total_items")
+    if isinstance(total_items, int):
+        return seen >= total_items
+    if "links" in result:
+        return not (result.get("links") or {}).get("next")
+    return len(result.get("data") or []) < page_size
+
+
+def _local_page(products: List[Dict], page: int, page_size: int) -> Dict:
+    """Shape one page of a locally answered query like an API response"""
+    start = (page - 1) * page_size
+    return {
+        "data": products[start : start + page_size],
+        "meta": {"total_items": len(products), "errors": []},
+    }
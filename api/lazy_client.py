@@ -0,0 +1,35 @@
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+class LazyAPIClient:
+    """Stand-in for JungleScoutAPI that builds the real client on first use
+
+    Attribute access (``client.search_products``, ``client.metrics``, ...)
+    is forwarded to the client made by `factory`, so the HTTP stack,
+    request models and credentials are only loaded once a tool is called,
+    not while the server is starting up.
+    """
+
+    def __init__(self, factory: Callable[[], "JungleScoutAPI"]):
+        self._factory = factory
+        self._client: Optional["JungleScoutAPI"] = None
+
+    @property
+    def built(self) -> bool:
+        return self._client is not None
+
+    def get(self) -> "JungleScoutAPI":
+        if self._client is None:
+            self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    async def aclose(self) -> None:
+        """Close the real client if it was ever built"""
+        if self._client is not None:
+            await self._client.aclose()
@@ -0,0 +1,173 @@
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds (50us .. 30s) and payload buckets in bytes
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Tool currently being served, so API-layer stages can be attributed to it
+current_tool: ContextVar[str] = ContextVar("current_tool", default="-")
+
+
+class Histogram:
+    """Fixed-bucket histogram with quantile estimates by linear interpolation"""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count * scale, 3),
+            "p50": round(self.quantile(0.5) * scale, 3),
+            "p95": round(self.quantile(0.95) * scale, 3),
+            "p99": round(self.quantile(0.99) * scale, 3),
+            "min": round(self.min * scale, 3),
+            "max": round(self.max * scale, 3),
+        }
+
+
+class Metrics:
+    """Per-stage, per-tool latency histograms plus upstream status and size stats"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages: Dict[Tuple[str, str], Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], Histogram] = {}
+        self.statuses: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def observe_stage(
+        self, stage: str, seconds: float, tool: Optional[str] = None
+    ) -> None:
+        key = (stage, tool or current_tool.get())
+        histogram = self.stages.get(key)
+        if histogram is None:
+            histogram = self.stages[key] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def observe_size(self, kind: str, size: int, tool: Optional[str] = None) -> None:
+        key = (kind, tool or current_tool.get())
+        histogram = self.sizes.get(key)
+        if histogram is None:
+            histogram = self.sizes[key] = Histogram(SIZE_BUCKETS)
+        histogram.observe(size)
+
+    def record_status(self, status_code: int) -> None:
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+
+    def record_error(self, tool: str) -> None:
+        self.errors[tool] = self.errors.get(tool, 0) + 1
+
+    @contextmanager
+    def stage(self, stage: str, tool: Optional[str] = None):
+        """Time the enclosed block as `stage`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start, tool)
+
+    def snapshot(self) -> Dict:
+        """Return a JSON-friendly view: latencies in ms, sizes in bytes"""
+        stages: Dict[str, Dict[str, Dict]] = {}
+        for (stage, tool), histogram in sorted(self.stages.items()):
+            stages.setdefault(tool, {})[stage] = histogram.summary(scale=1000)
+        sizes: Dict[str, Dict[str, Dict]] = {}
+        for (kind, tool), histogram in sorted(self.sizes.items()):
+            sizes.setdefault(tool, {})[kind] = histogram.summary()
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "latency_ms": stages,
+            "payload_bytes": sizes,
+            "upstream_status_codes": {
+                str(code): count for code, count in sorted(self.statuses.items())
+            },
+            "tool_errors": dict(self.errors),
+        }
+
+    def prometheus(self, prefix: str = "jungle_scout") -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        lines += _prometheus_histograms(f"{prefix}_stage_seconds", "stage", self.stages)
+        lines += _prometheus_histograms(f"{prefix}_payload_bytes", "kind", self.sizes)
+        lines.append(f"# TYPE {prefix}_upstream_responses_total counter")
+        for code, count in sorted(self.statuses.items()):
+            lines.append(
+                f'{prefix}_upstream_responses_total{{status="{code}"}} {count}'
+            )
+        lines.append(f"# TYPE {prefix}_tool_errors_total counter")
+        for tool, count in sorted(self.errors.items()):
+            lines.append(f'{prefix}_tool_errors_total{{tool="{tool}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _prometheus_histograms(
+    name: str, label: str, histograms: Dict[Tuple[str, str], Histogram]
+) -> List[str]:
+    lines = [f"# TYPE {name} histogram"]
+    for (value, tool), histogram in sorted(histograms.items()):
+        labels = f'{label}="{value}",tool="{tool}"'
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+            cumulative += bucket_count
+            le = f"{bound:g}" if isinstance(bound, float) else str(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum:g}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
@@ -0,0 +1,478 @@
+"""
+Columnar store of every product the server has fetched, for local analytics.
+
+Products from product_database_query responses are upserted by
+(marketplace, ASIN) into one NumPy array per numeric attribute and one
+dictionary-encoded code array per low-cardinality string attribute, so
+filters, group-bys, percentiles and top-k run vectorized over 100k+ rows
+instead of shipping raw JSON to the model. Near-unique strings (titles,
+ASINs) would gain nothing from a dictionary and are kept as plain object
+arrays.
+
+The store holds at most ``max_rows`` products: past that, the least
+recently fetched ones are evicted, so a long-running server's memory stays
+bounded.
+
+NumPy is optional: without it the store (and the analyze_products tool)
+is unavailable and the rest of the server works as before.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from config.constants import (
+    PRODUCT_STORE_INITIAL_CAPACITY,
+    PRODUCT_STORE_MAX_GROUPS,
+    PRODUCT_STORE_MAX_ROWS,
+)
+
+NUMERIC_COLUMNS = (
+    "price",
+    "reviews",
+    "rating",
+    "product_rank",
+    "approximate_30_day_revenue",
+    "approximate_30_day_units_sold",
+    "weight_value",
+    "number_of_sellers",
+    "listing_quality_score",
+    "variants",
+)
+# Dictionary-encoded, so they can be grouped by
+STRING_COLUMNS = (
+    "brand",
+    "category",
+    "seller_type",
+    "buy_box_owner",
+    "parent_asin",
+)
+# Near-unique strings, stored as they are
+TEXT_COLUMNS = ("title",)
+# marketplace is dictionary-encoded, asin stored as text
+KEY_COLUMNS = ("marketplace", "asin")
+
+DEFAULT_METRICS = ("price", "approximate_30_day_revenue", "reviews", "rating")
+DEFAULT_PERCENTILES = (25.0, 50.0, 75.0, 90.0)
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _sorted_percentiles(values: "np.ndarray", percentiles: Sequence[float]):
+    """Linearly interpolated percentiles of an already sorted array
+
+    Same results as ``np.percentile``'s default method, without the
+    per-call partitioning.
+    """
+    position = np.asarray(percentiles, dtype=np.float64) / 100 * (len(values) - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class DictionaryColumn:
+    """String column stored as int32 codes into a list of distinct values"""
+
+    __slots__ = ("codes", "values", "_lookup")
+
+    def __init__(self, capacity: int):
+        self.codes = np.full(capacity, -1, dtype=np.int32)
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    def encode(self, value: Any) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: Any) -> int:
+        """Code of an existing value, case-insensitively; -2 if never seen"""
+        code = self._lookup.get(str(value))
+        if code is not None:
+            return code
+        wanted = str(value).lower()
+        for index, known in enumerate(self.values):
+            if known.lower() == wanted:
+                return index
+        return -2
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code] if code >= 0 else None
+
+    def grow(self, capacity: int) -> None:
+        codes = np.full(capacity, -1, dtype=np.int32)
+        codes[: len(self.codes)] = self.codes
+        self.codes = codes
+
+    def compact(self, keep: "np.ndarray", size: int) -> None:
+        """Move rows `keep` to the front and forget values no row uses anymore"""
+        kept = self.codes[keep]
+        used = np.unique(kept[kept >= 0])
+        remap = np.full(len(self.values) + 1, -1, dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        # Code -1 (missing) maps to the trailing -1
+        self.codes[: len(keep)] = remap[kept]
+        self.codes[len(keep) : size] = -1
+        self.values = [self.values[code] for code in used]
+        self._lookup = {value: code for code, value in enumerate(self.values)}
+
+
+class TextColumn:
+    """String column of near-unique values, stored as a plain object array"""
+
+    __slots__ = ("values",)
+
+    def __init__(self, capacity: int):
+        self.values = np.full(capacity, None, dtype=object)
+
+    def matches(self, wanted: Iterable[Any], size: int) -> "np.ndarray":
+        """Rows equal to one of `wanted`, case-insensitively"""
+        wanted = {str(value).lower() for value in wanted}
+        return np.fromiter(
+            (
+                value is not None and value.lower() in wanted
+                for value in self.values[:size]
+            ),
+            dtype=bool,
+            count=size,
+        )
+
+    def decode(self, index: int) -> Optional[str]:
+        return self.values[index]
+
+    def grow(self, capacity: int) -> None:
+        values = np.full(capacity, None, dtype=object)
+        values[: len(self.values)] = self.values
+        self.values = values
+
+    def compact(self, keep: "np.ndarray", size: int) -> None:
+        self.values[: len(keep)] = self.values[keep]
+        self.values[len(keep) : size] = None
+
+
+class ProductStore:
+    """Array-backed product table keyed by (marketplace, ASIN)"""
+
+    def __init__(
+        self,
+        capacity: int = PRODUCT_STORE_INITIAL_CAPACITY,
+        max_rows: int = PRODUCT_STORE_MAX_ROWS,
+    ):
+        if np is None:
+            raise ImportError("ProductStore requires numpy (pip install numpy)")
+        capacity = max(capacity, 1)
+        self.max_rows = max(max_rows, 1)
+        self.size = 0
+        self.numeric: Dict[str, "np.ndarray"] = {
+            name: np.full(capacity, np.nan) for name in NUMERIC_COLUMNS
+        }
+        self.strings: Dict[str, DictionaryColumn] = {
+            name: DictionaryColumn(capacity)
+            for name in STRING_COLUMNS + ("marketplace",)
+        }
+        self.texts: Dict[str, TextColumn] = {
+            name: TextColumn(capacity) for name in TEXT_COLUMNS + ("asin",)
+        }
+        # Ingest generation that last wrote each row, for eviction
+        self.fetched = np.zeros(capacity, dtype=np.int64)
+        self._generation = 0
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self.updated_at = 0.0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.numeric[NUMERIC_COLUMNS[0]])
+
+    def _reserve(self, rows: int) -> None:
+        capacity = self.capacity
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        for name, column in self.numeric.items():
+            grown = np.full(capacity, np.nan)
+            grown[: self.size] = column[: self.size]
+            self.numeric[name] = grown
+        for column in self.strings.values():
+            column.grow(capacity)
+        for column in self.texts.values():
+            column.grow(capacity)
+        fetched = np.zeros(capacity, dtype=np.int64)
+        fetched[: self.size] = self.fetched[: self.size]
+        self.fetched = fetched
+
+    def _evict(self, keep_rows: int) -> None:
+        """Keep only the `keep_rows` most recently fetched rows"""
+        size = self.size
+        newest_first = np.argsort(-self.fetched[:size], kind="stable")
+        keep = np.sort(newest_first[:keep_rows])
+        kept = len(keep)
+        for column in self.numeric.values():
+            column[:kept] = column[keep]
+            column[kept:size] = np.nan
+        for column in (*self.strings.values(), *self.texts.values()):
+            column.compact(keep, size)
+        self.fetched[:kept] = self.fetched[keep]
+        self.fetched[kept:size] = 0
+        marketplaces = self.strings["marketplace"]
+        asins = self.texts["asin"].values
+        self._rows = {
+            (marketplaces.values[code], asins[row]): row
+            for row, code in enumerate(marketplaces.codes[:kept].tolist())
+        }
+        self.size = kept
+        self.evicted += size - kept
+
+    def ingest(self, products: Iterable[Dict]) -> int:
+        """Upsert JSON:API product entries; returns the number of rows written"""
+        rows: List[int] = []
+        numeric: Dict[str, List[float]] = {name: [] for name in NUMERIC_COLUMNS}
+        codes: Dict[str, List[int]] = {name: [] for name in self.strings}
+        texts: Dict[str, List[Optional[str]]] = {name: [] for name in self.texts}
+        pending: Dict[Tuple[str, str], int] = {}
+        next_row = self.size
+        for product in products:
+            marketplace, _, asin = str(product.get("id") or "").rpartition("/")
+            if not asin:
+                continue
+            marketplace = marketplace.lower() or "us"
+            key = (marketplace, asin)
+            row = self._rows.get(key, pending.get(key))
+            if row is None:
+                row = pending[key] = next_row
+                next_row += 1
+            attributes = product.get("attributes")
+            if attributes is None:
+                attributes = {}
+            rows.append(row)
+            for name in NUMERIC_COLUMNS:
+                value = attributes.get(name)
+                numeric[name].append(
+                    value if isinstance(value, (int, float)) else np.nan
+                )
+            for name in STRING_COLUMNS:
+                codes[name].append(self.strings[name].encode(attributes.get(name)))
+            for name in TEXT_COLUMNS:
+                value = attributes.get(name)
+                texts[name].append(None if value is None else str(value))
+            codes["marketplace"].append(self.strings["marketplace"].encode(marketplace))
+            texts["asin"].append(asin)
+        if not rows:
+            return 0
+
+        self._reserve(next_row)
+        index = np.asarray(rows, dtype=np.int64)
+        for name, values in numeric.items():
+            self.numeric[name][index] = np.asarray(values, dtype=np.float64)
+        for name, values in codes.items():
+            self.strings[name].codes[index] = np.asarray(values, dtype=np.int32)
+        for name, values in texts.items():
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            self.texts[name].values[index] = column
+        self._generation += 1
+        self.fetched[index] = self._generation
+        self._rows.update(pending)
+        self.size = next_row
+        if self.size > self.max_rows:
+            # Evict a tenth beyond the cap so the next pages don't evict again
+            self._evict(self.max_rows - self.max_rows // 10)
+        self.updated_at = time.time()
+        return len(rows)
+
+    def clear(self) -> None:
+        for column in self.numeric.values():
+            column[: self.size] = np.nan
+        for column in self.strings.values():
+            column.codes[: self.size] = -1
+        for column in self.texts.values():
+            column.values[: self.size] = None
+        self.fetched[: self.size] = 0
+        self._rows.clear()
+        self.size = 0
+
+    def mask(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        marketplace: Optional[str] = None,
+    ) -> "np.ndarray":
+        """Boolean row mask for `filters`
+
+        Numeric columns take ``{"min": x, "max": y}`` (either bound optional)
+        or an exact number; string columns take one value or a list of
+        values (case-insensitive).
+        """
+        selected = np.ones(self.size, dtype=bool)
+        conditions = dict(filters or {})
+        if marketplace:
+            conditions["marketplace"] = marketplace
+        for name, condition in conditions.items():
+            if name in self.numeric:
+                column = self.numeric[name][: self.size]
+                if isinstance(condition, dict):
+                    low, high = condition.get("min"), condition.get("max")
+                    if low is not None:
+                        selected &= column >= float(low)
+                    if high is not None:
+                        selected &= column <= float(high)
+                else:
+                    selected &= column == float(condition)
+            elif name in self.strings:
+                column = self.strings[name]
+                values = condition if isinstance(condition, list) else [condition]
+                wanted = [column.code_of(value) for value in values]
+                selected &= np.isin(column.codes[: self.size], wanted)
+            elif name in self.texts:
+                values = condition if isinstance(condition, list) else [condition]
+                selected &= self.texts[name].matches(values, self.size)
+            else:
+                columns = sorted([*self.numeric, *self.strings, *self.texts])
+                raise ValueError(f"Unknown column {name!r}; expected one of {columns}")
+        return selected
+
+    def _summarize(
+        self,
+        rows: "np.ndarray",
+        metrics: Sequence[str],
+        percentiles: Sequence[float],
+    ) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"count": int(len(rows))}
+        for name in metrics:
+            values = self.numeric[name][rows]
+            # One sort serves min, max and every percentile (NaN sorts last)
+            values = np.sort(values)
+            values = values[: len(values) - int(np.isnan(values).sum())]
+            if not len(values):
+                continue
+            summary[f"{name}_mean"] = round(float(values.mean()), 4)
+            summary[f"{name}_sum"] = round(float(values.sum()), 4)
+            summary[f"{name}_min"] = float(values[0])
+            summary[f"{name}_max"] = float(values[-1])
+            for q, value in zip(percentiles, _sorted_percentiles(values, percentiles)):
+                summary[f"{name}_p{q:g}"] = round(float(value), 4)
+        return summary
+
+    def row(self, index: int, columns: Sequence[str]) -> Dict[str, Any]:
+        """Decode one row into JSON:API shape (id + attributes)"""
+        marketplace = self.strings["marketplace"].decode(
+            int(self.strings["marketplace"].codes[index])
+        )
+        asin = self.texts["asin"].decode(index)
+        attributes: Dict[str, Any] = {}
+        for name in columns:
+            if name in self.numeric:
+                value = float(self.numeric[name][index])
+                attributes[name] = None if np.isnan(value) else value
+            elif name in self.strings:
+                column = self.strings[name]
+                attributes[name] = column.decode(int(column.codes[index]))
+            elif name in self.texts:
+                attributes[name] = self.texts[name].decode(index)
+        return {"id": f"{marketplace}/{asin}", "attributes": attributes}
+
+    def analyze(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        marketplace: Optional[str] = None,
+        group_by: Optional[str] = None,
+        metrics: Optional[Sequence[str]] = None,
+        percentiles: Optional[Sequence[float]] = None,
+        top_k: int = 0,
+        sort_by: str = "approximate_30_day_revenue",
+        ascending: bool = False,
+        max_groups: int = PRODUCT_STORE_MAX_GROUPS,
+    ) -> Dict[str, Any]:
+        """Filter, group and summarize stored products
+
+        Returns JSON:API-shaped ``data`` with one summary row per group
+        (count, mean, sum, min, max and percentiles for each metric), the
+        `top_k` matching products by `sort_by` under ``top``, and row counts
+        in ``meta``.
+        """
+        start = time.perf_counter()
+        metrics = list(metrics or DEFAULT_METRICS)
+        percentiles = list(percentiles or DEFAULT_PERCENTILES)
+        unknown = [name for name in metrics + [sort_by] if name not in self.numeric]
+        if unknown:
+            raise ValueError(
+                f"Unknown numeric columns {unknown}; expected {list(NUMERIC_COLUMNS)}"
+            )
+        if group_by is not None and group_by not in self.strings:
+            raise ValueError(
+                f"Cannot group by {group_by!r}; expected one of {sorted(self.strings)}"
+            )
+
+        rows = np.flatnonzero(self.mask(filters, marketplace))
+        data: List[Dict[str, Any]] = []
+        if group_by is None:
+            data.append(
+                {"id": "all", "attributes": self._summarize(rows, metrics, percentiles)}
+            )
+        else:
+            column = self.strings[group_by]
+            # One stable sort by code splits the rows into contiguous groups
+            group_codes = column.codes[rows]
+            order = np.argsort(group_codes, kind="stable")
+            counts = np.bincount(group_codes + 1, minlength=len(column.values) + 1)
+            ends = np.cumsum(counts)
+            # Largest groups first, capped so high-cardinality keys stay readable
+            for slot in np.argsort(-counts, kind="stable")[:max_groups]:
+                if not counts[slot]:
+                    break
+                group_rows = rows[order[ends[slot] - counts[slot] : ends[slot]]]
+                data.append(
+                    {
+                        "id": column.decode(int(slot) - 1) or "(none)",
+                        "attributes": self._summarize(group_rows, metrics, percentiles),
+                    }
+                )
+
+        top: List[Dict[str, Any]] = []
+        if top_k > 0 and len(rows):
+            values = self.numeric[sort_by][rows]
+            # NaN sorts last either way
+            keys = values if ascending else -values
+            if top_k < len(keys):
+                candidates = np.argpartition(keys, top_k - 1)[:top_k]
+                order = candidates[np.argsort(keys[candidates], kind="stable")]
+            else:
+                order = np.argsort(keys, kind="stable")
+            columns = ("title", "brand", "seller_type", *metrics, sort_by)
+            top = [self.row(int(rows[i]), dict.fromkeys(columns)) for i in order]
+
+        return {
+            "data": data,
+            "top": top,
+            "meta": {
+                "matched_rows": int(len(rows)),
+                "total_rows": self.size,
+                "groups": len(data),
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+            },
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows": self.size,
+            "capacity": self.capacity,
+            "max_rows": self.max_rows,
+            "evicted": self.evicted,
+            "bytes": sum(column.nbytes for column in self.numeric.values())
+            + sum(column.codes.nbytes for column in self.strings.values())
+            + sum(column.values.nbytes for column in self.texts.values()),
+        }
@@ -0,0 +1,59 @@
+"""
+Progress of the tool call being served.
+
+The tool handler installs a reporter for each call (backed by the MCP
+request context), and API methods that span many upstream requests report
+through `report_progress` as pages or sub-queries complete. The reporter
+travels in a context variable, so tasks spawned for concurrent pages or
+batch queries report to the call that spawned them. Outside a tool call,
+or when the client sent no progress token, reporting is a no-op.
+"""
+
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+from config.logging_config import get_logger
+
+logger = get_logger("progress")
+
+ReportFn = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+
+class ProgressReporter:
+    """Forwards progress updates for one tool call, never failing the call"""
+
+    def __init__(self, report: ReportFn):
+        self._report = report
+        self.sent = 0
+        self.last = 0.0
+
+    async def update(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        # Progress must increase; concurrent completions may arrive out of order
+        if progress < self.last:
+            return
+        self.last = progress
+        try:
+            await self._report(progress, total, message)
+        except Exception as e:
+            logger.debug("Could not send progress notification: %r", e)
+            return
+        self.sent += 1
+
+
+current_progress: ContextVar[Optional[ProgressReporter]] = ContextVar(
+    "current_progress", default=None
+)
+
+
+async def report_progress(
+    progress: float, total: Optional[float] = None, message: Optional[str] = None
+) -> None:
+    """Report progress of the current tool call, if it has a reporter"""
+    reporter = current_progress.get()
+    if reporter is not None:
+        await reporter.update(progress, total, message)
@@ -0,0 +1,248 @@
+"""
+Answer refinement queries from product sets already fetched in full.
+
+When a product_database_query has been walked to its last page, every
+product matching it is known. A later query that only tightens its range
+bounds (``min_rating`` 4.0 -> 4.5) or narrows its seller types, with every
+other filter unchanged, matches a subset of those products, so it can be
+answered by filtering the stored set locally instead of calling the API.
+Products keep the upstream order, so the API's sort carries over.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from api.cache import canonical_json
+from config.constants import (
+    CACHE_TTL_SECONDS,
+    QUERY_ENGINE_MAX_PRODUCTS,
+    QUERY_ENGINE_MAX_SETS,
+)
+
+# min_/max_ filter suffix -> product attribute the bound applies to
+RANGE_ATTRIBUTES = {
+    "price": "price",
+    "rank": "product_rank",
+    "sales": "approximate_30_day_units_sold",
+    "revenue": "approximate_30_day_revenue",
+    "reviews": "reviews",
+    "rating": "rating",
+    "weight": "weight_value",
+}
+
+# Inclusion-list filter -> product attribute whose value must be in the list
+SUBSET_ATTRIBUTES = {
+    "seller_types": "seller_type",
+}
+
+Bounds = Dict[str, Tuple[Optional[float], Optional[float]]]
+
+
+def split_filters(
+    attributes: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Bounds, Dict[str, FrozenSet[str]]]:
+    """Split query attributes into (fixed, range bounds, inclusion sets)
+
+    Fixed filters (keywords, flags, net price, tiers) cannot be checked
+    against product attributes, so they must match exactly.
+    """
+    fixed: Dict[str, Any] = {}
+    bounds: Bounds = {}
+    subsets: Dict[str, FrozenSet[str]] = {}
+    for name, value in attributes.items():
+        side, _, metric = name.partition("_")
+        if side in ("min", "max") and metric in RANGE_ATTRIBUTES:
+            low, high = bounds.get(metric, (None, None))
+            bounds[metric] = (value, high) if side == "min" else (low, value)
+        elif name in SUBSET_ATTRIBUTES:
+            subsets[name] = frozenset(str(v).lower() for v in value)
+        else:
+            fixed[name] = value
+    return fixed, bounds, subsets
+
+
+class FullResultSet:
+    """Every product matching one query, plus the query's parsed filters"""
+
+    __slots__ = ("bounds", "subsets", "products", "expires_at")
+
+    def __init__(
+        self,
+        bounds: Bounds,
+        subsets: Dict[str, FrozenSet[str]],
+        products: List[Dict],
+        expires_at: float,
+    ):
+        self.bounds = bounds
+        self.subsets = subsets
+        self.products = products
+        self.expires_at = expires_at
+
+    def contains(self, bounds: Bounds, subsets: Dict[str, FrozenSet[str]]) -> bool:
+        """True if a query with these filters matches a subset of this set"""
+        for metric, (low, high) in self.bounds.items():
+            new_low, new_high = bounds.get(metric, (None, None))
+            if low is not None and (new_low is None or new_low < low):
+                return False
+            if high is not None and (new_high is None or new_high > high):
+                return False
+        for name, allowed in self.subsets.items():
+            if name not in subsets or not subsets[name] <= allowed:
+                return False
+        return True
+
+    def select(self, bounds: Bounds, subsets: Dict[str, FrozenSet[str]]) -> List[Dict]:
+        """Filter the stored products down to a contained query"""
+        checks: List[Tuple[str, Optional[float], Optional[float]]] = []
+        for metric, (low, high) in bounds.items():
+            if self.bounds.get(metric, (None, None)) != (low, high):
+                checks.append((RANGE_ATTRIBUTES[metric], low, high))
+        members = [
+            (SUBSET_ATTRIBUTES[name], allowed)
+            for name, allowed in subsets.items()
+            if self.subsets.get(name) != allowed
+        ]
+        if not checks and not members:
+            return list(self.products)
+
+        selected = []
+        for product in self.products:
+            attributes = product.get("attributes")
+            if attributes is None:
+                attributes = {}
+            for attribute, low, high in checks:
+                value = attributes.get(attribute)
+                if (
+                    value is None
+                    or (low is not None and value < low)
+                    or (high is not None and value > high)
+                ):
+                    break
+            else:
+                for attribute, allowed in members:
+                    value = attributes.get(attribute)
+                    if value is None or str(value).lower() not in allowed:
+                        break
+                else:
+                    selected.append(product)
+        return selected
+
+
+class LocalQueryEngine:
+    """LRU store of fully fetched product sets that answers contained queries"""
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL_SECONDS,
+        max_sets: int = QUERY_ENGINE_MAX_SETS,
+        max_products: int = QUERY_ENGINE_MAX_PRODUCTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_sets = max_sets
+        self.max_products = max_products
+        self.clock = clock
+        self._sets: "OrderedDict[str, FullResultSet]" = OrderedDict()
+        # Signature of the fixed filters -> keys of sets sharing them
+        self._by_signature: Dict[str, Set[str]] = {}
+        self._signatures: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def _signature(marketplace: str, fixed: Dict[str, Any]) -> str:
+        return canonical_json({"marketplace": marketplace, "fixed": fixed})
+
+    def _find(
+        self,
+        signature: str,
+        bounds: Bounds,
+        subsets: Dict[str, FrozenSet[str]],
+    ) -> Optional[FullResultSet]:
+        """Smallest live set containing the query, if any"""
+        now = self.clock()
+        best: Optional[FullResultSet] = None
+        best_key = None
+        for key in list(self._by_signature.get(signature, ())):
+            entry = self._sets[key]
+            if entry.expires_at <= now:
+                self._remove(key)
+                continue
+            if entry.contains(bounds, subsets) and (
+                best is None or len(entry.products) < len(best.products)
+            ):
+                best, best_key = entry, key
+        if best_key is not None:
+            self._sets.move_to_end(best_key)
+        return best
+
+    def answer(self, marketplace: str, attributes: Dict[str, Any]) -> Optional[List]:
+        """Products matching the query, or None if no stored set contains it"""
+        fixed, bounds, subsets = split_filters(attributes)
+        entry = self._find(self._signature(marketplace, fixed), bounds, subsets)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.select(bounds, subsets)
+
+    def store(
+        self, marketplace: str, attributes: Dict[str, Any], products: List[Dict]
+    ) -> bool:
+        """Remember the complete result of a query; False if not stored
+
+        Sets over `max_products`, and sets already contained in a stored
+        one, are skipped.
+        """
+        if len(products) > self.max_products:
+            return False
+        fixed, bounds, subsets = split_filters(attributes)
+        signature = self._signature(marketplace, fixed)
+        if self._find(signature, bounds, subsets) is not None:
+            return False
+
+        key = canonical_json(
+            {
+                "signature": signature,
+                "bounds": bounds,
+                "subsets": {name: sorted(values) for name, values in subsets.items()},
+            }
+        )
+        self._remove(key)
+        self._sets[key] = FullResultSet(
+            bounds, subsets, list(products), self.clock() + self.ttl
+        )
+        self._by_signature.setdefault(signature, set()).add(key)
+        self._signatures[key] = signature
+        self.stores += 1
+        while len(self._sets) > self.max_sets:
+            self._remove(next(iter(self._sets)))
+        return True
+
+    def _remove(self, key: str) -> None:
+        if self._sets.pop(key, None) is None:
+            return
+        signature = self._signatures.pop(key)
+        keys = self._by_signature[signature]
+        keys.discard(key)
+        if not keys:
+            del self._by_signature[signature]
+
+    def clear(self) -> None:
+        self._sets.clear()
+        self._by_signature.clear()
+        self._signatures.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of stored sets and products"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "sets": len(self._sets),
+            "products": sum(len(entry.products) for entry in self._sets.values()),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
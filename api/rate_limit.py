@@ -0,0 +1,248 @@
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, Mapping, Optional
+
+from config.constants import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_CONCURRENCY_INITIAL,
+    RATE_LIMIT_CONCURRENCY_MAX,
+    RATE_LIMIT_CONCURRENCY_MIN,
+    RATE_LIMIT_REQUESTS_PER_SECOND,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the server-requested wait in seconds, if the response carries one
+
+    Understands ``Retry-After`` (delta-seconds or HTTP date) and the common
+    ``X-RateLimit-Reset``/``RateLimit-Reset`` headers when the remaining
+    budget is exhausted.
+    """
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after).timestamp()
+                return max(0.0, retry_at - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    remaining = headers.get("x-ratelimit-remaining", headers.get("ratelimit-remaining"))
+    reset = headers.get("x-ratelimit-reset", headers.get("ratelimit-reset"))
+    if remaining is not None and reset is not None:
+        try:
+            if float(remaining) > 0:
+                return None
+            reset = float(reset)
+        except ValueError:
+            return None
+        # Large values are epoch timestamps, small ones are delta-seconds
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
+
+
+class TokenBucket:
+    """Token bucket that spaces requests to a steady rate with a bounded burst"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        refill = (now - self.updated) * self.rate
+        self.tokens = min(self.capacity, self.tokens + refill)
+        self.updated = now
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g. after a Retry-After)"""
+        now = self.clock()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+    def available(self) -> float:
+        """Tokens that could be taken right now (0 while paused)"""
+        now = self.clock()
+        if now < self.paused_until:
+            return 0.0
+        self._refill(now)
+        return self.tokens
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting"""
+        now = self.clock()
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        # The lock keeps waiters in FIFO order so a burst can't starve anyone
+        async with self._lock:
+            while True:
+                now = self.clock()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit: grows by one per window of successes, halves on 429"""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        decrease_factor: float = 0.5,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken but cancelled before taking the slot: pass it on
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / max(self.limit, 1))
+        self._wake()
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, deferring to server-provided waits"""
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 1)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class RateLimiter:
+    """Client-side limiter shared by every tool that goes through the API client"""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        initial_concurrency: int = RATE_LIMIT_CONCURRENCY_INITIAL,
+        min_concurrency: int = RATE_LIMIT_CONCURRENCY_MIN,
+        max_concurrency: int = RATE_LIMIT_CONCURRENCY_MAX,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        # A shared bucket (see api.shared_state) spreads one budget over workers
+        self.bucket = bucket or TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(
+            initial_concurrency, min_concurrency, max_concurrency
+        )
+        self.throttled = 0
+        self.retries = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot and one rate token for a request"""
+        await self.concurrency.acquire()
+        try:
+            await self.bucket.acquire()
+            yield
+        finally:
+            self.concurrency.release()
+
+    def observe(
+        self, status_code: int, headers: Mapping[str, str], pause_all: bool = True
+    ) -> Optional[float]:
+        """Feed a response back into the limiter and return any requested wait
+
+        With `pause_all` off (one key of a credential pool was throttled), a
+        Retry-After is returned but doesn't pause every caller.
+        """
+        retry_after = parse_retry_after(headers)
+        if status_code == 429:
+            self.throttled += 1
+            self.concurrency.on_throttle()
+        elif status_code < 500:
+            self.concurrency.on_success()
+        if retry_after and pause_all:
+            # Pause every caller, not just this one, so retries don't stampede
+            self.bucket.pause(retry_after)
+        return retry_after
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "tokens": round(self.bucket.tokens, 2),
+            "throttled": self.throttled,
+            "retries": self.retries,
+        }
@@ -0,0 +1,184 @@
+"""
+Tail-latency hedging and a circuit breaker for upstream requests.
+
+Both are opt-in.
+
+Hedging: every call the API client makes is a read (the ``*_query``
+endpoints), so a request that has not answered by a deadline can safely
+be sent again; the first answer wins and the other is cancelled. The
+deadline is a high percentile of recent latencies for the endpoint, so it
+follows the upstream instead of being a guess. Hedges are paid from a
+budget earned as a fraction of ordinary requests (5% by default), which
+bounds the extra quota even when the upstream is slow across the board.
+
+Circuit breaker: after several consecutive failures (network errors,
+timeouts, 5xx) the circuit opens and requests fail immediately with
+CircuitOpenError instead of each waiting for its own timeout; product
+searches fall back to expired cached results when there are any. After a
+cooldown a single probe is let through (half-open): success closes the
+circuit, failure opens it again.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config.constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN_PROBES,
+    CIRCUIT_RESET_SECONDS,
+    HEDGE_BUDGET_BURST,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+)
+from config.logging_config import get_logger
+
+logger = get_logger("resilience")
+
+
+class CircuitOpenError(RuntimeError):
+    """The upstream is considered down; the request was not sent"""
+
+
+class HedgePolicy:
+    """When to send a duplicate of a slow request, and how many to allow"""
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        budget_ratio: float = HEDGE_BUDGET_RATIO,
+        budget_burst: float = HEDGE_BUDGET_BURST,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        min_delay: float = HEDGE_MIN_DELAY,
+        window: int = HEDGE_LATENCY_WINDOW,
+    ):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.credit = budget_burst
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.sent = 0
+        self.won = 0
+        self.over_budget = 0
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a successful response"""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            latencies = self._latencies[endpoint] = deque(maxlen=self.window)
+        latencies.append(seconds)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging (None until enough samples are in)"""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        rank = math.ceil(self.percentile / 100 * len(ordered))
+        index = min(len(ordered) - 1, rank - 1)
+        return max(self.min_delay, ordered[index])
+
+    def earn(self) -> None:
+        """An ordinary request adds a fraction of a hedge to the budget"""
+        self.credit = min(self.budget_burst, self.credit + self.budget_ratio)
+
+    def spend(self) -> bool:
+        """Take one hedge from the budget, if there is one"""
+        # Tolerates float drift from summing budget_ratio
+        if self.credit < 1 - 1e-9:
+            self.over_budget += 1
+            return False
+        self.credit -= 1
+        self.sent += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "won": self.won,
+            "over_budget": self.over_budget,
+            "budget": round(self.credit, 2),
+            "delays": {endpoint: self.delay(endpoint) for endpoint in self._latencies},
+        }
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe -> closed"""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_SECONDS,
+        half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0  # Consecutive
+        self.opened_at = 0.0
+        self.probes = 0  # Probes in flight while half-open
+        self.opened = 0
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now"""
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            if self.clock() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self._message())
+            self.state, self.probes = "half_open", 0
+            logger.info("Circuit half-open: probing the upstream")
+        if self.probes >= self.half_open_probes:
+            self.rejected += 1
+            raise CircuitOpenError(self._message())
+        self.probes += 1
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("Circuit closed: the upstream answered the probe")
+        self.state, self.failures, self.probes = "closed", 0, 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or (
+            self.state == "closed" and self.failures >= self.failure_threshold
+        ):
+            self.state, self.opened_at, self.probes = "open", self.clock(), 0
+            self.opened += 1
+            logger.warning(
+                "Circuit open after %d consecutive failures; failing fast for %.0fs",
+                self.failures,
+                self.reset_timeout,
+            )
+
+    def release_probe(self) -> None:
+        """A probe ended without a verdict (e.g. it was cancelled)"""
+        if self.state == "half_open" and self.probes > 0:
+            self.probes -= 1
+
+    def _message(self) -> str:
+        wait = max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+        return (
+            "The Jungle Scout API is failing; requests are paused "
+            f"(next attempt in {wait:.0f}s)"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.opened,
+            "rejected": self.rejected,
+        }
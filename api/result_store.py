@@ -0,0 +1,339 @@
+"""
+Tool results kept on the server under opaque handles.
+
+A tool called with ``as_handle`` stores its rows here and returns a short
+summary with the handle; the rows are then read a slice at a time (through
+the ``results://`` resources or the read_result tool), optionally sorted by
+a column and projected to some columns, so a large result is never sent
+whole.
+
+Rows are kept as compact JSON lines. When the in-memory total passes
+`max_memory`, the least recently read results are spilled to a file with
+a line-offset index, so a slice reads only its own lines back. Spilled
+results beyond `max_disk` are dropped, and every handle expires `ttl`
+seconds after it was last read. Handles are local to the process that
+made them, so a server running several HTTP workers (where the next
+request may reach another worker) disables the store.
+"""
+
+import json
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.constants import (
+    RESULT_HANDLE_TTL_SECONDS,
+    RESULT_STORE_MAX_DISK_BYTES,
+    RESULT_STORE_MAX_MEMORY_BYTES,
+    RESULT_VIEW_DEFAULT_ROWS,
+    RESULT_VIEW_MAX_ROWS,
+)
+from models.records import to_json
+
+# Rough per-row cost of a bytes object on top of its contents
+_ROW_OVERHEAD = 40
+
+
+class UnknownHandleError(LookupError):
+    """The handle never existed, expired or was evicted"""
+
+
+class StoredResult:
+    """Rows of one result, in memory or spilled to a file"""
+
+    __slots__ = (
+        "handle",
+        "tool",
+        "meta",
+        "columns",
+        "count",
+        "size",
+        "created_at",
+        "expires_at",
+        "lines",
+        "path",
+        "offsets",
+        "orders",
+    )
+
+    def __init__(self, handle, tool, meta, columns, lines, created_at, expires_at):
+        self.handle = handle
+        self.tool = tool
+        self.meta = meta
+        self.columns = columns
+        self.count = len(lines)
+        self.size = sum(len(line) for line in lines) + _ROW_OVERHEAD * len(lines)
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.lines: Optional[List[bytes]] = lines
+        self.path: Optional[str] = None
+        self.offsets: Optional[array] = None  # Start of each line, then the end
+        self.orders: Dict[Tuple[str, bool], array] = {}  # Cached sort orders
+
+    @property
+    def spilled(self) -> bool:
+        return self.lines is None
+
+    def spill(self, path: str) -> None:
+        offsets = array("q", [0])
+        with open(path, "wb") as f:
+            for line in self.lines:
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        self.path, self.offsets, self.lines = path, offsets, None
+
+    def read(self, indexes: Sequence[int]) -> List[Dict[str, Any]]:
+        """Decode the rows at `indexes`, in that order"""
+        if self.lines is not None:
+            return [json.loads(self.lines[index]) for index in indexes]
+        rows = []
+        with open(self.path, "rb") as f:
+            for index in indexes:
+                f.seek(self.offsets[index])
+                rows.append(
+                    json.loads(f.read(self.offsets[index + 1] - self.offsets[index]))
+                )
+        return rows
+
+    def read_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Decode rows [start, stop) with one read when spilled"""
+        if self.lines is not None or start >= stop:
+            return self.read(range(start, stop))
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[start])
+            block = f.read(self.offsets[stop] - self.offsets[start])
+        return [json.loads(line) for line in block.splitlines()]
+
+    def discard(self) -> None:
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.lines = self.offsets = self.path = None
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        return {
+            "handle": self.handle,
+            "uri": f"results://{self.handle}",
+            "tool": self.tool,
+            "rows": self.count,
+            "columns": self.columns,
+            "meta": self.meta,
+            "expires_in_seconds": round(max(0.0, self.expires_at - now)),
+        }
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Order numbers before strings before everything else; None sorts last"""
+    if value is None:
+        return (3, 0)
+    if isinstance(value, bool):
+        return (0, int(value))
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value.lower())
+    return (2, json.dumps(value, sort_keys=True, default=to_json))
+
+
+class ResultStore:
+    """Bounded store of tool results, addressed by opaque handles"""
+
+    def __init__(
+        self,
+        max_memory: int = RESULT_STORE_MAX_MEMORY_BYTES,
+        max_disk: int = RESULT_STORE_MAX_DISK_BYTES,
+        ttl: float = RESULT_HANDLE_TTL_SECONDS,
+        spill_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.ttl = ttl
+        self.clock = clock
+        self._spill_dir = spill_dir
+        self._own_spill_dir = False
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.spilled = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def put(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        meta: Optional[Dict[str, Any]] = None,
+        tool: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Store rows under a new handle; returns the result's summary"""
+        if not self.enabled:
+            raise RuntimeError(
+                "Result handles are not available when the server runs several "
+                "workers (a handle only exists in the worker that made it); "
+                "call the tool without as_handle"
+            )
+        lines = [
+            json.dumps(row, separators=(",", ":"), default=to_json).encode() + b"\n"
+            for row in rows
+        ]
+        columns: Dict[str, None] = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+        now = self.clock()
+        handle = secrets.token_urlsafe(12)
+        result = StoredResult(
+            handle, tool, meta, list(columns), lines, now, now + self.ttl
+        )
+        self._results[handle] = result
+        self.memory_bytes += result.size
+        self._enforce_bounds(now)
+        return result.summary(now)
+
+    def get(self, handle: str) -> StoredResult:
+        """Look up a result and extend its lifetime"""
+        now = self.clock()
+        self._expire(now)
+        result = self._results.get(handle)
+        if result is None:
+            raise UnknownHandleError(
+                f"Unknown or expired result handle {handle!r}; run the tool again"
+            )
+        result.expires_at = now + self.ttl
+        self._results.move_to_end(handle)
+        return result
+
+    def summary(self, handle: str) -> Dict[str, Any]:
+        return self.get(handle).summary(self.clock())
+
+    def view(
+        self,
+        handle: str,
+        offset: int = 0,
+        limit: int = RESULT_VIEW_DEFAULT_ROWS,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """A slice of a result's rows, optionally sorted and projected
+
+        Sorting decodes the sort column once per (column, direction); the
+        order is kept, so paging through a sorted view reads only the rows
+        of each page.
+        """
+        result = self.get(handle)
+        offset = max(int(offset), 0)
+        limit = max(0, min(int(limit), RESULT_VIEW_MAX_ROWS))
+        stop = min(offset + limit, result.count)
+        if sort_by:
+            order = self._order(result, sort_by, descending)
+            rows = result.read(order[offset:stop])
+        else:
+            rows = result.read_range(offset, stop)
+        if fields:
+            rows = [{field: row.get(field) for field in fields} for row in rows]
+        return {
+            "handle": handle,
+            "rows": result.count,
+            "offset": offset,
+            "returned": len(rows),
+            "data": rows,
+        }
+
+    def _order(self, result: StoredResult, column: str, descending: bool) -> array:
+        key = (column, descending)
+        order = result.orders.get(key)
+        if order is None:
+            values = [
+                _sort_key(row.get(column)) for row in result.read_range(0, result.count)
+            ]
+            # Missing values stay last in either direction
+            present = [i for i in range(result.count) if values[i][0] != 3]
+            missing = [i for i in range(result.count) if values[i][0] == 3]
+            present.sort(key=values.__getitem__, reverse=descending)
+            order = result.orders[key] = array("l", present + missing)
+        return order
+
+    def delete(self, handle: str) -> bool:
+        result = self._results.pop(handle, None)
+        if result is None:
+            return False
+        self._forget(result)
+        return True
+
+    def _forget(self, result: StoredResult) -> None:
+        if result.spilled:
+            self.disk_bytes -= result.size
+        else:
+            self.memory_bytes -= result.size
+        result.discard()
+
+    def _expire(self, now: float) -> None:
+        for handle in [h for h, r in self._results.items() if r.expires_at <= now]:
+            self._forget(self._results.pop(handle))
+            self.expired += 1
+
+    def _enforce_bounds(self, now: float) -> None:
+        self._expire(now)
+        # Spill the least recently read results until memory fits
+        for result in list(self._results.values()):
+            if self.memory_bytes <= self.max_memory:
+                break
+            if result.spilled:
+                continue
+            if self.max_disk > 0:
+                result.spill(self._spill_path(result.handle))
+                self.memory_bytes -= result.size
+                self.disk_bytes += result.size
+                self.spilled += 1
+            else:
+                self._forget(self._results.pop(result.handle))
+                self.evicted += 1
+        # Then drop the least recently read spilled results until disk fits
+        for result in list(self._results.values()):
+            if self.disk_bytes <= self.max_disk:
+                break
+            if result.spilled:
+                self._forget(self._results.pop(result.handle))
+                self.evicted += 1
+
+    def _spill_path(self, handle: str) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="jungle-scout-results-")
+            self._own_spill_dir = True
+        else:
+            os.makedirs(self._spill_dir, exist_ok=True)
+        return os.path.join(self._spill_dir, f"{handle}.ndjson")
+
+    def close(self) -> None:
+        """Drop every result and remove the spill files"""
+        for result in self._results.values():
+            result.discard()
+        self._results.clear()
+        self.memory_bytes = self.disk_bytes = 0
+        if self._own_spill_dir and self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir, self._own_spill_dir = None, False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "results": len(self._results),
+            "spilled_results": sum(1 for r in self._results.values() if r.spilled),
+            "memory_bytes": self.memory_bytes,
+            "disk_bytes": self.disk_bytes,
+            "spills": self.spilled,
+            "evictions": self.evicted,
+            "expirations": self.expired,
+        }
@@ -0,0 +1,187 @@
+"""
+Daily sales estimates per ASIN, with the date ranges already fetched.
+
+Each (marketplace, ASIN) series keeps its days, units and prices in
+parallel typed arrays sorted by date, plus the list of date ranges that
+have been fetched from the API. A request for a window only goes upstream
+for the gaps in that coverage, so sliding a 90-day window forward by a day
+costs a one-day request instead of a 90-day one.
+
+Only complete days are marked as covered: the current day's estimate is
+still moving, so a window that includes today fetches today again.
+"""
+
+import bisect
+import math
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.constants import SALES_STORE_MAX_ASINS
+
+# Day numbers are proleptic Gregorian ordinals (date.toordinal)
+Range = Tuple[int, int]
+Point = Tuple[int, Optional[float], Optional[float]]
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class SalesSeries:
+    """Daily units sold and price of one ASIN, and the days known to be fetched"""
+
+    __slots__ = ("days", "units", "prices", "covered", "info")
+
+    def __init__(self):
+        self.days = array("l")
+        self.units = array("d")
+        self.prices = array("d")
+        self.covered: List[Range] = []  # Sorted, non-overlapping, inclusive
+        self.info: Dict[str, Any] = {}  # Latest non-series attributes
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def upsert(self, points: Iterable[Point]) -> None:
+        """Add or replace (day, units, price) points"""
+        new = sorted(
+            (day, _number(units), _number(price)) for day, units, price in points
+        )
+        if not new:
+            return
+        if not self.days or new[0][0] > self.days[-1]:
+            # The usual case: days after everything stored
+            for day, units, price in new:
+                if self.days and self.days[-1] == day:
+                    self.units[-1], self.prices[-1] = units, price
+                    continue
+                self.days.append(day)
+                self.units.append(units)
+                self.prices.append(price)
+            return
+        merged = {
+            day: (units, price)
+            for day, units, price in zip(self.days, self.units, self.prices)
+        }
+        merged.update((day, (units, price)) for day, units, price in new)
+        days = sorted(merged)
+        self.days = array("l", days)
+        self.units = array("d", (merged[day][0] for day in days))
+        self.prices = array("d", (merged[day][1] for day in days))
+
+    def cover(self, start: int, end: int) -> None:
+        """Mark [start, end] as fetched, merging touching ranges"""
+        if start > end:
+            return
+        ranges = []
+        for low, high in self.covered:
+            if high + 1 < start or low > end + 1:
+                ranges.append((low, high))
+            else:
+                start, end = min(start, low), max(end, high)
+        ranges.append((start, end))
+        ranges.sort()
+        self.covered = ranges
+
+    def gaps(self, start: int, end: int, merge_within: int = 0) -> List[Range]:
+        """Ranges of [start, end] not fetched yet
+
+        Gaps separated by at most `merge_within` fetched days become one
+        range: refetching a few days is cheaper than another request.
+        """
+        gaps: List[Range] = []
+        cursor = start
+        for low, high in self.covered:
+            if high < cursor:
+                continue
+            if low > end:
+                break
+            if low > cursor:
+                gaps.append((cursor, low - 1))
+            cursor = max(cursor, high + 1)
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+
+        merged: List[Range] = []
+        for gap in gaps:
+            if merged and gap[0] - merged[-1][1] - 1 <= merge_within:
+                merged[-1] = (merged[-1][0], gap[1])
+            else:
+                merged.append(gap)
+        return merged
+
+    def window(self, start: int, end: int) -> List[Point]:
+        """Stored points for days in [start, end], in date order"""
+        low = bisect.bisect_left(self.days, start)
+        high = bisect.bisect_right(self.days, end)
+        return [
+            (
+                self.days[index],
+                None if math.isnan(self.units[index]) else self.units[index],
+                None if math.isnan(self.prices[index]) else self.prices[index],
+            )
+            for index in range(low, high)
+        ]
+
+
+class SalesEstimateStore:
+    """LRU-bounded map of (marketplace, ASIN) to its SalesSeries"""
+
+    def __init__(
+        self,
+        max_series: int = SALES_STORE_MAX_ASINS,
+        today: Callable[[], date] = utc_today,
+    ):
+        self.max_series = max_series
+        self.today = today
+        self._series: "OrderedDict[Tuple[str, str], SalesSeries]" = OrderedDict()
+        self.days_requested = 0
+        self.days_fetched = 0
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def series(self, marketplace: str, asin: str) -> SalesSeries:
+        key = (marketplace, asin)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = SalesSeries()
+            if len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(key)
+        return series
+
+    def record(
+        self,
+        series: SalesSeries,
+        start: int,
+        end: int,
+        points: Iterable[Point],
+    ) -> None:
+        """Store a fetched range; only its complete days count as covered"""
+        series.upsert(points)
+        series.cover(start, min(end, self.today().toordinal() - 1))
+        self.days_fetched += end - start + 1
+
+    def stats(self) -> Dict[str, Any]:
+        points = sum(len(series) for series in self._series.values())
+        return {
+            "asins": len(self._series),
+            "points": points,
+            # Three 8-byte array items per point
+            "bytes": points * 24,
+            "days_requested": self.days_requested,
+            "days_fetched": self.days_fetched,
+        }
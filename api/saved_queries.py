@@ -0,0 +1,313 @@
+"""
+Saved queries kept warm by a background refresh scheduler.
+
+A saved query is a set of ``search_products`` parameters with a refresh
+interval. The scheduler re-runs each one when its interval (with jitter)
+elapses, and a tool call that matches a saved query is answered from its
+last result at once, even if that result is stale; a stale hit moves the
+query's refresh forward instead of waiting on the API (stale-while-
+revalidate).
+
+Refreshes must not crowd out interactive calls, so the scheduler:
+
+- runs at most `max_concurrency` refreshes at a time,
+- spends at most `budget_per_hour` upstream requests per hour, and
+- only starts a refresh while the shared rate limiter has `reserve`
+  concurrency slots free for interactive calls.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
+from api.rate_limit import TokenBucket
+from config.constants import (
+    SAVED_QUERY_CONCURRENCY,
+    SAVED_QUERY_JITTER,
+    SAVED_QUERY_MAX,
+    SAVED_QUERY_REFRESH_BUDGET,
+    SAVED_QUERY_RESERVED_SLOTS,
+    SAVED_QUERY_RETRY_DELAY,
+)
+from config.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+logger = get_logger("saved_queries")
+
+
+class SavedQuery:
+    """One saved query, its last result and its refresh schedule"""
+
+    def __init__(self, name: str, params: Dict[str, Any], interval: float, key: str):
+        self.name = name
+        self.params = params
+        self.interval = interval
+        self.key = key
+        self.result: Optional[Dict] = None
+        self.fetched_at: Optional[float] = None
+        self.next_refresh = 0.0
+        self.refreshing = False
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def is_stale(self, now: float) -> bool:
+        return self.fetched_at is None or now - self.fetched_at >= self.interval
+
+    def describe(self, now: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "query": self.params,
+            "refresh_seconds": self.interval,
+            "age_seconds": (
+                round(now - self.fetched_at, 1) if self.fetched_at is not None else None
+            ),
+            "next_refresh_in": round(max(0.0, self.next_refresh - now), 1),
+            "stale": self.is_stale(now),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class SavedQueries:
+    """Registry of saved queries plus the asyncio task that refreshes them"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_queries: int = SAVED_QUERY_MAX,
+        max_concurrency: int = SAVED_QUERY_CONCURRENCY,
+        budget_per_hour: float = SAVED_QUERY_REFRESH_BUDGET,
+        jitter: float = SAVED_QUERY_JITTER,
+        reserve: int = SAVED_QUERY_RESERVED_SLOTS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.max_queries = max_queries
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.reserve = reserve
+        self.clock = clock
+        # A full hour's budget may be spent back-to-back, then it refills
+        self.budget = TokenBucket(
+            budget_per_hour / 3600, max(budget_per_hour, 1), clock=clock
+        )
+        self._queries: Dict[str, SavedQuery] = {}
+        self._by_key: Dict[str, SavedQuery] = {}
+        self._api: Optional["JungleScoutAPI"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._running: Set[asyncio.Task] = set()
+        self.served_fresh = 0
+        self.served_stale = 0
+        self.deferred = 0
+
+    def attach(self, api: "JungleScoutAPI") -> None:
+        """Bind to the API client that runs refreshes; loads saved definitions"""
+        self._api = api
+        if self.path and os.path.exists(self.path):
+            with open(self.path) as f:
+                definitions = json.load(f)
+            for definition in definitions:
+                self._add(
+                    definition["name"], definition["query"], definition["interval"]
+                )
+            # Spread the first refreshes instead of firing them all at once
+            now = self.clock()
+            for query in self._queries.values():
+                query.next_refresh = now + random.uniform(
+                    0, self.jitter * query.interval
+                )
+            self._poke()
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def _add(self, name: str, params: Dict[str, Any], interval: float) -> SavedQuery:
+        key = self._api.product_query_key(**params)
+        if name not in self._queries and len(self._queries) >= self.max_queries:
+            raise ValueError(f"At most {self.max_queries} saved queries")
+        previous = self._queries.pop(name, None)
+        if previous is not None:
+            self._forget_key(previous)
+        query = SavedQuery(name, params, interval, key)
+        if previous is not None and previous.key == key:
+            query.result, query.fetched_at = previous.result, previous.fetched_at
+        self._queries[name] = query
+        self._by_key[key] = query
+        return query
+
+    def _forget_key(self, query: SavedQuery) -> None:
+        if self._by_key.get(query.key) is query:
+            del self._by_key[query.key]
+
+    def _persist(self) -> None:
+        if not self.path:
+            return
+        definitions = [
+            {"name": q.name, "query": q.params, "interval": q.interval}
+            for q in self._queries.values()
+        ]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(definitions, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def save(self, name: str, params: Dict[str, Any], interval: float) -> Dict:
+        """Register (or replace) a saved query and schedule its first refresh"""
+        query = self._add(name, params, interval)
+        if query.result is None:
+            query.next_refresh = self.clock()
+        else:
+            query.next_refresh = query.fetched_at + self._jittered(interval)
+        self._persist()
+        self._poke()
+        return query.describe(self.clock())
+
+    def remove(self, name: str) -> bool:
+        query = self._queries.pop(name, None)
+        if query is None:
+            return False
+        self._forget_key(query)
+        self._persist()
+        return True
+
+    def serve(self, key: str) -> Optional[Dict]:
+        """Answer a tool call from a saved query's last result, if any
+
+        A stale result is still returned; its query is moved to the front of
+        the refresh queue.
+        """
+        query = self._by_key.get(key)
+        if query is None or query.result is None:
+            return None
+        now = self.clock()
+        if query.is_stale(now):
+            self.served_stale += 1
+            if not query.refreshing:
+                query.next_refresh = min(query.next_refresh, now)
+                self._poke()
+        else:
+            self.served_fresh += 1
+        return query.result
+
+    def observe(self, key: str, result: Dict) -> None:
+        """Keep a result fetched for a saved query, whoever fetched it"""
+        query = self._by_key.get(key)
+        if query is not None:
+            self._store(query, result)
+
+    def _store(self, query: SavedQuery, result: Dict) -> None:
+        query.result = result
+        query.fetched_at = self.clock()
+        query.next_refresh = query.fetched_at + self._jittered(query.interval)
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _poke(self) -> None:
+        """Start the scheduler if needed and have it re-check the queue"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Started by the first call made inside the event loop
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._wake.set()
+
+    def _has_headroom(self) -> bool:
+        """True if the limiter has slots to spare beyond the interactive reserve"""
+        concurrency = self._api.rate_limiter.concurrency
+        return concurrency.in_flight + self.reserve < int(concurrency.limit)
+
+    def _dispatch(self) -> Optional[float]:
+        """Start due refreshes; return seconds until the queue needs a look"""
+        now = self.clock()
+        due = sorted(
+            (q for q in self._queries.values() if not q.refreshing),
+            key=lambda q: q.next_refresh,
+        )
+        for query in due:
+            if query.next_refresh > now:
+                return query.next_refresh - now
+            if len(self._running) >= self.max_concurrency:
+                return None  # A finishing refresh wakes the loop
+            if not self._has_headroom():
+                self.deferred += 1
+                return SAVED_QUERY_RETRY_DELAY
+            if not self.budget.try_acquire():
+                self.deferred += 1
+                return (1 - self.budget.tokens) / self.budget.rate
+            query.refreshing = True
+            task = asyncio.ensure_future(self._refresh(query))
+            self._running.add(task)
+            task.add_done_callback(self._refresh_done)
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            delay = self._dispatch()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh(self, query: SavedQuery) -> None:
+        try:
+            key, result = await self._api.refresh_products(**query.params)
+        except Exception as e:
+            query.failures += 1
+            query.last_error = f"{type(e).__name__}: {e}"
+            # Back off, but never past the regular interval
+            retry = min(query.interval, SAVED_QUERY_RETRY_DELAY * 2**query.failures)
+            query.next_refresh = self.clock() + retry
+            logger.warning("Refreshing saved query %r failed: %s", query.name, e)
+        else:
+            query.refreshes += 1
+            query.last_error = None
+            if self._queries.get(query.name) is query:
+                self._store(query, result)
+        finally:
+            query.refreshing = False
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if not task.cancelled():
+            task.exception()
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        """Cancel the scheduler and any refreshes in flight"""
+        tasks: List[asyncio.Task] = list(self._running)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "saved_queries": [q.describe(now) for q in self._queries.values()],
+            "scheduler": self.stats(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "saved_queries": len(self._queries),
+            "refreshing": len(self._running),
+            "served_fresh": self.served_fresh,
+            "served_stale": self.served_stale,
+            "deferred": self.deferred,
+            "budget_tokens": round(self.budget.tokens, 2),
+        }
@@ -0,0 +1,461 @@
+"""
+State shared by several server processes (HTTP mode with multiple workers).
+
+Workers open the same backend URL and share three things through it:
+
+- the response cache (a ResponseCache backend),
+- the upstream request-rate budget (a token bucket), and
+- in-flight deduplication (short leases on query keys: one worker fetches,
+  the others wait for its result to land in the shared cache).
+
+``snapshot_path`` names a SQLite file the workers can also keep their
+since_last snapshots in: next to a SQLite state file, or in the temp
+directory for Redis (workers of one server run on one host).
+
+``sqlite:///path/to/state.db`` needs nothing beyond the standard library;
+``redis://host:port/db`` uses the optional ``redis`` package.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from api.cache import SQLiteCacheBackend
+from config.constants import (
+    CACHE_MAX_ENTRIES,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_REQUESTS_PER_SECOND,
+    SHARED_LEASE_SECONDS,
+    SHARED_POLL_INTERVAL,
+)
+from models.records import to_json
+
+
+async def _off_loop(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking backend call in a thread, so waiting on another
+    worker's lock (SQLite busy timeout, a Redis round trip) doesn't stall
+    this worker's event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+def _in_background(fn: Callable[..., Any], *args: Any) -> None:
+    """Start a blocking backend write in a thread without waiting for it
+
+    For sync callers on the event loop (a 429 pausing the bucket); without a
+    running loop the write happens inline.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        fn(*args)
+        return
+    loop.run_in_executor(None, fn, *args)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # Autocommit mode so each operation can take its own BEGIN IMMEDIATE lock
+    conn = sqlite3.connect(
+        path, timeout=10, isolation_level=None, check_same_thread=False
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class SQLiteTokenBucket:
+    """Token bucket whose state lives in SQLite, so every worker draws from it
+
+    Same interface as TokenBucket (``acquire``, ``pause``, ``tokens``).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+        capacity: float = RATE_LIMIT_BURST,
+        name: str = "upstream",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self.clock = clock
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_budget ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated REAL NOT NULL, paused_until REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO rate_budget VALUES (?, ?, ?, 0)",
+            (name, capacity, clock()),
+        )
+        self._lock = asyncio.Lock()
+        # One transaction at a time on the connection, across executor threads
+        self._mutex = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return seconds to wait"""
+        with self._mutex:
+            return self._take_locked()
+
+    def _take_locked(self) -> float:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, updated, paused_until = self._conn.execute(
+                "SELECT tokens, updated, paused_until FROM rate_budget WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            now = self.clock()
+            if now < paused_until:
+                return paused_until - now
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._conn.execute(
+                "UPDATE rate_budget SET tokens = ?, updated = ? WHERE name = ?",
+                (tokens, now, self.name),
+            )
+            return wait
+        finally:
+            self._conn.execute("COMMIT")
+
+    async def acquire(self) -> None:
+        # The local lock keeps this worker's waiters in FIFO order
+        async with self._lock:
+            while True:
+                wait = await _off_loop(self._take)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stop every worker from taking tokens for `seconds`"""
+        now = self.clock()
+        _in_background(self._pause, now + seconds, now)
+
+    def _pause(self, until: float, now: float) -> None:
+        with self._mutex:
+            self._conn.execute(
+                "UPDATE rate_budget SET paused_until = MAX(paused_until, ?), "
+                "tokens = MIN(tokens, 0), updated = ? WHERE name = ?",
+                (until, now, self.name),
+            )
+
+    @property
+    def tokens(self) -> float:
+        with self._mutex:
+            tokens, updated = self._conn.execute(
+                "SELECT tokens, updated FROM rate_budget WHERE name = ?", (self.name,)
+            ).fetchone()
+        return min(self.capacity, tokens + (self.clock() - updated) * self.rate)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SQLiteLeases:
+    """Short exclusive claims on query keys, visible to every worker"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = SHARED_LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.clock = clock
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS inflight_leases ("
+            "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        # SharedFlight calls in from executor threads; one transaction at a time
+        self._mutex = threading.Lock()
+
+    def acquire(self, key: str) -> bool:
+        """Claim `key` unless another live claim holds it"""
+        with self._mutex:
+            return self._acquire_locked(key)
+
+    def _acquire_locked(self, key: str) -> bool:
+        now = self.clock()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "DELETE FROM inflight_leases WHERE key = ? AND expires_at <= ?",
+                (key, now),
+            )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO inflight_leases VALUES (?, ?, ?)",
+                (key, self.owner, now + self.ttl),
+            )
+            return cursor.rowcount == 1
+        finally:
+            self._conn.execute("COMMIT")
+
+    def release(self, key: str) -> None:
+        with self._mutex:
+            self._conn.execute(
+                "DELETE FROM inflight_leases WHERE key = ? AND owner = ?",
+                (key, self.owner),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# KEYS[1] bucket hash; ARGV rate, capacity, now. Returns seconds to wait
+# (0 when a token was taken), as a string to keep the float intact.
+_REDIS_TAKE = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'paused_until')
+local rate, capacity, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local paused_until = tonumber(state[3]) or 0
+if now < paused_until then return tostring(paused_until - now) end
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+return tostring(wait)
+"""
+
+_REDIS_PAUSE = """
+local paused_until = tonumber(redis.call('HGET', KEYS[1], 'paused_until')) or 0
+local now, seconds = tonumber(ARGV[1]), tonumber(ARGV[2])
+redis.call('HSET', KEYS[1], 'paused_until', math.max(paused_until, now + seconds),
+           'tokens', 0, 'updated', now)
+return 1
+"""
+
+_REDIS_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+class RedisCacheBackend:
+    """Response cache storage in Redis; expiry and eviction are left to Redis
+
+    Entries carry a Redis TTL matching the cache TTL, and the LRU bound is
+    Redis's own ``maxmemory-policy`` rather than `max_entries`.
+    """
+
+    blocking = True
+
+    def __init__(self, client: Any, prefix: str = "jungle_scout:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict]]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        expires_at, value = json.loads(raw)
+        return expires_at, value
+
+    def set(self, key: str, expires_at: float, value: Dict) -> int:
+        payload = json.dumps(
+            [expires_at, value], separators=(",", ":"), default=to_json
+        )
+        self.client.set(self.prefix + key, payload, pxat=max(int(expires_at * 1000), 1))
+        return 0
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+
+    def close(self) -> None:
+        pass
+
+
+class RedisTokenBucket:
+    """Token bucket shared through Redis (atomic via a Lua script)"""
+
+    def __init__(
+        self,
+        client: Any,
+        rate: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+        capacity: float = RATE_LIMIT_BURST,
+        name: str = "upstream",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.rate = rate
+        self.capacity = capacity
+        self.key = f"jungle_scout:rate:{name}"
+        self.clock = clock
+        self._take = client.register_script(_REDIS_TAKE)
+        self._pause = client.register_script(_REDIS_PAUSE)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                wait = float(
+                    await _off_loop(
+                        functools.partial(
+                            self._take,
+                            keys=[self.key],
+                            args=[self.rate, self.capacity, self.clock()],
+                        )
+                    )
+                )
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        _in_background(
+            functools.partial(
+                self._pause, keys=[self.key], args=[self.clock(), seconds]
+            )
+        )
+
+    @property
+    def tokens(self) -> float:
+        tokens, updated = self.client.hmget(self.key, "tokens", "updated")
+        if tokens is None:
+            return self.capacity
+        elapsed = self.clock() - float(updated)
+        return min(self.capacity, float(tokens) + elapsed * self.rate)
+
+    def close(self) -> None:
+        pass
+
+
+class RedisLeases:
+    """Query-key leases as ``SET NX PX`` keys in Redis"""
+
+    def __init__(self, client: Any, ttl: float = SHARED_LEASE_SECONDS):
+        self.client = client
+        self.ttl = ttl
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._release = client.register_script(_REDIS_RELEASE)
+
+    def acquire(self, key: str) -> bool:
+        return bool(
+            self.client.set(
+                f"jungle_scout:lease:{key}",
+                self.owner,
+                nx=True,
+                px=int(self.ttl * 1000),
+            )
+        )
+
+    def release(self, key: str) -> None:
+        self._release(keys=[f"jungle_scout:lease:{key}"], args=[self.owner])
+
+    def close(self) -> None:
+        pass
+
+
+class SharedFlight:
+    """Cross-process counterpart of SingleFlight, built on leases
+
+    The worker that claims a key runs the fetch (which fills the shared
+    cache); the others poll the cache until the result appears or the
+    claim is released or expires, in which case they fetch themselves.
+    `lookup` reads the shared cache, so like the lease calls it runs in a
+    thread.
+    """
+
+    def __init__(self, leases: Any, poll_interval: float = SHARED_POLL_INTERVAL):
+        self.leases = leases
+        self.poll_interval = poll_interval
+        self.shared = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        lookup: Callable[[], Optional[Any]],
+    ) -> Any:
+        waited = False
+        while True:
+            if await _off_loop(self.leases.acquire, key):
+                try:
+                    if waited:
+                        # The holder may have filled the cache and released
+                        # between our last lookup and this claim
+                        value = await _off_loop(lookup)
+                        if value is not None:
+                            self.shared += 1
+                            return value
+                    return await fn()
+                finally:
+                    await _off_loop(self.leases.release, key)
+            waited = True
+            await asyncio.sleep(self.poll_interval)
+            value = await _off_loop(lookup)
+            if value is not None:
+                self.shared += 1
+                return value
+
+
+class SharedState:
+    """The cache backend, rate budget and leases opened from one backend URL"""
+
+    def __init__(
+        self,
+        url: str,
+        rate: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        self.url = url
+        parsed = urlparse(url)
+        if parsed.scheme == "sqlite":
+            # sqlite:///relative.db or sqlite:////absolute/path.db
+            path = parsed.path[1:] if parsed.path.startswith("/") else parsed.path
+            if not path:
+                raise ValueError(f"No database path in shared state URL {url!r}")
+            self.cache_backend = SQLiteCacheBackend(path, max_entries)
+            self.bucket = SQLiteTokenBucket(path, rate, burst)
+            self.leases = SQLiteLeases(path)
+            root, extension = os.path.splitext(path)
+            self.snapshot_path = f"{root}-snapshots{extension or '.db'}"
+        elif parsed.scheme in ("redis", "rediss", "unix"):
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "A redis:// shared state URL needs the redis package "
+                    "(pip install redis)"
+                ) from e
+            client = redis.Redis.from_url(url)
+            self.cache_backend = RedisCacheBackend(client)
+            self.bucket = RedisTokenBucket(client, rate, burst)
+            self.leases = RedisLeases(client)
+            digest = hashlib.sha1(url.encode()).hexdigest()[:12]
+            self.snapshot_path = os.path.join(
+                tempfile.gettempdir(), f"jungle-scout-snapshots-{digest}.db"
+            )
+        else:
+            raise ValueError(
+                f"Unsupported shared state URL {url!r}; use sqlite:/// or redis://"
+            )
+        self.flight = SharedFlight(self.leases)
+
+    def close(self) -> None:
+        for part in (self.cache_backend, self.bucket, self.leases):
+            part.close()
@@ -0,0 +1,204 @@
+"""
+Snapshots of query results, for returning only what changed since last time.
+
+A tool called with ``since_last`` compares its result with the snapshot
+kept from the previous run of the same query (same tool, same
+parameters), then replaces the snapshot. Only added and removed rows, and
+for changed rows only the attributes that differ, are returned, so a
+daily monitoring query costs about the size of the change rather than the
+size of the result set.
+
+Snapshots map each row id (marketplace/ASIN for products) to its type and
+attribute values. They live in SQLite, in memory by default or in a file
+(JUNGLE_SCOUT_SNAPSHOT_PATH, or one next to JUNGLE_SCOUT_SHARED_STATE) so
+they survive restarts and are shared by HTTP workers, bounded to the most
+recently used queries.
+"""
+
+import json
+import sqlite3
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from api.cache import canonical_json
+from config.constants import SNAPSHOT_IGNORED_ATTRIBUTES, SNAPSHOT_MAX_QUERIES
+from models.records import to_json
+
+
+def _split_rows(rows: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+    """Split stored snapshot rows into (types, attributes) by row id
+
+    Snapshots written before rows carried their type hold only the
+    attributes; their type is unknown (None).
+    """
+    types, attributes = {}, {}
+    for row_id, row in rows.items():
+        if isinstance(row, dict):
+            types[row_id], attributes[row_id] = None, row
+        else:
+            types[row_id], attributes[row_id] = row
+    return types, attributes
+
+
+class SnapshotStore:
+    """Last result of each query, keyed by row id, persisted in SQLite"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_queries: int = SNAPSHOT_MAX_QUERIES,
+        ignored: Iterable[str] = SNAPSHOT_IGNORED_ATTRIBUTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_queries = max_queries
+        self.ignored = frozenset(ignored)
+        self.clock = clock
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "key TEXT PRIMARY KEY, taken_at REAL NOT NULL, rows BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self.diffs = 0
+        self.rows_unchanged = 0
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def diff(self, tool: str, params: Dict[str, Any], result: Dict) -> Dict:
+        """Changes in `result` since the last run of (tool, params)
+
+        Returns a result shaped like the original: ``data`` holds one entry
+        per added, changed or removed row, marked by its ``change``; changed
+        rows carry only the differing attributes (new values) and their
+        ``previous`` values. The first run of a query reports every row as
+        added. Batch results are diffed query by query.
+        """
+        if isinstance(result.get("results"), dict):
+            return {
+                **result,
+                "results": {
+                    label: (
+                        sub_result
+                        if "error" in sub_result
+                        else self.diff(tool, {**params, "label": label}, sub_result)
+                    )
+                    for label, sub_result in result["results"].items()
+                },
+            }
+
+        key = canonical_json([tool, params])
+        # Round-tripped through JSON so stored and fresh values compare equal
+        blob = json.dumps(
+            {
+                item.get("id"): [
+                    item.get("type"),
+                    {
+                        name: value
+                        for name, value in (item.get("attributes") or {}).items()
+                        if name not in self.ignored
+                    },
+                ]
+                for item in result.get("data") or []
+            },
+            separators=(",", ":"),
+            default=to_json,
+        ).encode()
+        types, current = _split_rows(json.loads(blob))
+
+        row = self._conn.execute(
+            "SELECT taken_at, rows FROM snapshots WHERE key = ?", (key,)
+        ).fetchone()
+        previous_at, previous_types, previous = None, {}, {}
+        if row is not None:
+            previous_at = row[0]
+            previous_types, previous = _split_rows(json.loads(zlib.decompress(row[1])))
+
+        changes = []
+        counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        for row_id, attributes in current.items():
+            old = previous.get(row_id)
+            if old is None:
+                counts["added"] += 1
+                changes.append(
+                    {
+                        "id": row_id,
+                        "type": types[row_id],
+                        "change": "added",
+                        "attributes": attributes,
+                    }
+                )
+                continue
+            differing = [
+                name
+                for name in {**old, **attributes}
+                if old.get(name) != attributes.get(name)
+            ]
+            if not differing:
+                counts["unchanged"] += 1
+                continue
+            counts["changed"] += 1
+            changes.append(
+                {
+                    "id": row_id,
+                    "type": types[row_id],
+                    "change": "changed",
+                    "attributes": {name: attributes.get(name) for name in differing},
+                    "previous": {name: old.get(name) for name in differing},
+                }
+            )
+        for row_id in previous.keys() - current.keys():
+            counts["removed"] += 1
+            changes.append(
+                {
+                    "id": row_id,
+                    "type": previous_types[row_id],
+                    "change": "removed",
+                    "attributes": {},
+                }
+            )
+
+        self._store(key, blob)
+        self.diffs += 1
+        self.rows_unchanged += counts["unchanged"]
+        since = None
+        if previous_at is not None:
+            since = datetime.fromtimestamp(previous_at, timezone.utc).isoformat()
+        return {
+            "data": changes,
+            "meta": {
+                **(result.get("meta") or {}),
+                "since": since,
+                **counts,
+            },
+        }
+
+    def _store(self, key: str, blob: bytes) -> None:
+        now = self.clock()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+            (key, now, zlib.compress(blob)),
+        )
+        # Keep the most recently run queries
+        self._conn.execute(
+            "DELETE FROM snapshots WHERE key IN ("
+            "SELECT key FROM snapshots ORDER BY taken_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_queries,),
+        )
+        self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queries": len(self),
+            "diffs": self.diffs,
+            "rows_unchanged": self.rows_unchanged,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
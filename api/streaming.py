@@ -0,0 +1,142 @@
+"""
+Incremental decoding of JSON:API documents.
+
+StreamingPageDecoder is fed the response body chunk by chunk and hands
+back each ``data[]`` entry as soon as its closing brace arrives, so a
+large page never exists as one buffered body or one nested dict tree.
+Other top-level members (``links``, ``meta``) are small and are decoded
+whole.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+# Parser states
+_START, _KEY, _COLON, _VALUE, _ITEM, _ITEM_SEP, _MEMBER_SEP, _DONE = range(8)
+
+
+class StreamingPageDecoder:
+    """Push parser for ``{"data": [...], ...}`` documents"""
+
+    def __init__(
+        self,
+        item_factory: Optional[Callable[[Any], Any]] = None,
+        array_key: str = "data",
+    ):
+        self.item_factory = item_factory
+        self.array_key = array_key
+        self.document: Dict[str, Any] = {}
+        self.bytes_read = 0
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key: Optional[str] = None
+        self._eof = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume a chunk of the body and return the entries it completed"""
+        self.bytes_read += len(chunk)
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """Finish the document; returns any last entries"""
+        self._buffer = self._buffer[self._pos :] + self._text.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        items = self._parse()
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON document")
+        return items
+
+    def _skip_whitespace(self) -> Optional[str]:
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _decode_value(self) -> Any:
+        """Decode one complete value at the cursor, or raise _NeedMore"""
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            raise _NeedMore from None
+        # A number ending exactly at the buffer edge may continue in the
+        # next chunk
+        if end == len(self._buffer) and not self._eof:
+            raise _NeedMore
+        self._pos = end
+        return value
+
+    def _expect(self, char: Optional[str], allowed: str) -> None:
+        if char not in tuple(allowed):
+            raise ValueError(
+                f"Unexpected {char!r} at offset {self.bytes_read}; expected {allowed!r}"
+            )
+
+    def _parse(self) -> List[Any]:
+        items: List[Any] = []
+        try:
+            while self._state != _DONE:
+                char = self._skip_whitespace()
+                if char is None:
+                    break
+                state = self._state
+                if state == _START:
+                    self._expect(char, "{")
+                    self._pos += 1
+                    self._state = _KEY
+                elif state == _KEY:
+                    if char == "}":
+                        self._pos += 1
+                        self._state = _DONE
+                        continue
+                    self._expect(char, '"')
+                    self._key = self._decode_value()
+                    self._state = _COLON
+                elif state == _COLON:
+                    self._expect(char, ":")
+                    self._pos += 1
+                    self._state = _VALUE
+                elif state == _VALUE:
+                    if self._key == self.array_key and char == "[":
+                        self._pos += 1
+                        self.document[self._key] = None
+                        self._state = _ITEM
+                    else:
+                        self.document[self._key] = self._decode_value()
+                        self._state = _MEMBER_SEP
+                elif state == _ITEM:
+                    if char == "]":
+                        self._pos += 1
+                        self._state = _MEMBER_SEP
+                        continue
+                    item = self._decode_value()
+                    if self.item_factory is not None:
+                        item = self.item_factory(item)
+                    items.append(item)
+                    self._state = _ITEM_SEP
+                elif state == _ITEM_SEP:
+                    self._expect(char, ",]")
+                    self._pos += 1
+                    self._state = _ITEM if char == "," else _MEMBER_SEP
+                elif state == _MEMBER_SEP:
+                    self._expect(char, ",}")
+                    self._pos += 1
+                    self._state = _KEY if char == "," else _DONE
+        except _NeedMore:
+            pass
+        return items
+
+
+class _NeedMore(Exception):
+    """The buffer ends inside a value"""
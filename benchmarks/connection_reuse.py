@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold vs warm connections against a local stand-in server.
+
+"cold" closes the client after every call, so each request pays client
+construction (including loading the SSL context) and TCP setup again, like the
+old per-call ``AsyncClient``. "warm" keeps the shared pool open across calls.
+The local server speaks plain HTTP; against the real API the DNS lookup and
+TLS handshake widen the gap further.
+
+Usage: python -m benchmarks.connection_reuse [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from api.jungle_scout import JungleScoutAPI
+from api.rate_limit import RateLimiter
+from benchmarks.local_server import LocalServer
+
+
+async def _run(api_client: JungleScoutAPI, iterations: int, cold: bool):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await api_client.search_products(include_keywords=["organic"])
+        timings.append((time.perf_counter() - start) * 1000)
+        if cold:
+            await api_client.aclose()
+    await api_client.aclose()
+    return timings
+
+
+def _report(label: str, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<5} mean={statistics.mean(timings):7.3f}ms "
+        f"p50={statistics.median(timings):7.3f}ms p95={p95:7.3f}ms"
+    )
+
+
+async def main(iterations: int):
+    with LocalServer() as server:
+        api_client = JungleScoutAPI(
+            "key",
+            "key-id",
+            base_url=server.base_url,
+            # Don't let client-side pacing cap the numbers we're measuring
+            rate_limiter=RateLimiter(rate=1e9, burst=1e9),
+        )
+        await _run(api_client, 10, cold=False)
+        cold = await _run(api_client, iterations, cold=True)
+        warm = await _run(api_client, iterations, cold=False)
+    print(f"{iterations} sequential requests against {server.base_url}")
+    _report("cold", cold)
+    _report("warm", warm)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Throughput of the streamable-HTTP server with 1, 2 and 4 worker processes.
+
+Starts the mock upstream on a real port, then for each worker count starts
+``server.py --transport streamable-http`` against it (with a fresh shared
+state file) and fires concurrent ``tools/call`` requests at ``/mcp``.
+
+Two scenarios per worker count:
+
+- ``shared``: every agent asks the same question with the cache on, so the
+  shared cache and cross-worker in-flight leases should keep upstream
+  calls near one no matter how many workers answer.
+- ``uncached``: the cache is off and every call asks a different question
+  (its own min_price), so in-flight coalescing cannot merge them either:
+  every call reaches the (slow) upstream and throughput is bounded by
+  request handling and upstream latency.
+
+Worker processes only add throughput when there are cores to run them on;
+the number of CPUs is printed with the results.
+
+Usage: python -m benchmarks.http_load [calls] [concurrency]
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+WORKER_COUNTS = (1, 2, 4)
+HEADERS = {"Accept": "application/json, text/event-stream"}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"process on port {port} exited early")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# The same question from every agent, as search_products' schema spells it
+SEARCH_ARGUMENTS = {
+    "marketplace": "us",
+    "seller_types": ["fba"],
+    "min_price": 10,
+    "max_price": 50,
+    "output_format": "json_compact",
+}
+
+
+def _tool_call(call_id: int, distinct: bool) -> dict:
+    arguments = SEARCH_ARGUMENTS
+    if distinct:
+        arguments = dict(arguments, min_price=call_id, max_price=call_id + 40)
+    return {
+        "jsonrpc": "2.0",
+        "id": call_id,
+        "method": "tools/call",
+        "params": {"name": "search_products", "arguments": arguments},
+    }
+
+
+async def _fire(port: int, calls: int, concurrency: int, distinct: bool):
+    """Return (wall seconds, per-call latencies, failed calls)"""
+    url = f"http://127.0.0.1:{port}/mcp"
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failed = 0
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+
+        async def one(call_id: int):
+            nonlocal failed
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    url, json=_tool_call(call_id, distinct), headers=HEADERS
+                )
+                latencies.append(time.perf_counter() - start)
+                body = response.json() if response.status_code == 200 else {}
+                if "result" not in body or body["result"].get("isError"):
+                    failed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        return time.perf_counter() - start, latencies, failed
+
+
+def _upstream_requests(mock_port: int) -> int:
+    stats = httpx.get(f"http://127.0.0.1:{mock_port}/stats").json()
+    return stats["requests"]
+
+
+def run_scenario(mock_port, workers, cache_ttl, calls, concurrency, state_dir):
+    """Run one scenario; with the cache off every call asks a distinct question"""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        JUNGLE_SCOUT_API_KEY="bench",
+        JUNGLE_SCOUT_API_KEY_ID="bench",
+        JUNGLE_SCOUT_API_BASE_URL=f"http://127.0.0.1:{mock_port}",
+        JUNGLE_SCOUT_RATE_LIMIT_RPS="10000",
+        JUNGLE_SCOUT_CACHE_TTL=str(cache_ttl),
+        JUNGLE_SCOUT_SHARED_STATE=(
+            f"sqlite:///{os.path.join(state_dir, f'state-{port}.db')}"
+        ),
+        JUNGLE_SCOUT_LOG_LEVEL="ERROR",
+    )
+    env.pop("JUNGLE_SCOUT_CACHE_PATH", None)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "server.py",
+            "--transport",
+            "streamable-http",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ],
+        cwd=ROOT,
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, server)
+        before = _upstream_requests(mock_port)
+        seconds, latencies, failed = asyncio.run(
+            _fire(port, calls, concurrency, distinct=not cache_ttl)
+        )
+        upstream = _upstream_requests(mock_port) - before
+    finally:
+        _stop(server)
+    latencies.sort()
+    return {
+        "calls_per_second": calls / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "upstream": upstream,
+        "failed": failed,
+    }
+
+
+def main(calls: int, concurrency: int):
+    mock_port = _free_port()
+    mock = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.mock_upstream",
+            "--port",
+            str(mock_port),
+            "--latency-ms",
+            "80",
+        ],
+        cwd=ROOT,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(mock_port, mock)
+        print(
+            f"{calls} tools/call per run, {concurrency} concurrent, "
+            f"{os.cpu_count()} CPU(s), upstream latency 80 ms"
+        )
+        print(
+            f"{'scenario':<10}{'workers':>8}{'calls/s':>10}{'p50 ms':>9}"
+            f"{'p95 ms':>9}{'upstream':>10}{'failed':>8}"
+        )
+        with tempfile.TemporaryDirectory() as state_dir:
+            for label, cache_ttl in (("shared", 3600), ("uncached", 0)):
+                for workers in WORKER_COUNTS:
+                    result = run_scenario(
+                        mock_port, workers, cache_ttl, calls, concurrency, state_dir
+                    )
+                    print(
+                        f"{label:<10}{workers:>8}{result['calls_per_second']:>10.1f}"
+                        f"{result['p50_ms']:>9.0f}{result['p95_ms']:>9.0f}"
+                        f"{result['upstream']:>10}{result['failed']:>8}"
+                    )
+    finally:
+        _stop(mock)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 400,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 32,
+    )
@@ -0,0 +1,62 @@
+"""
+Minimal local stand-in for the Jungle Scout API used by the benchmarks.
+
+Runs a threaded HTTP/1.1 server with keep-alive on 127.0.0.1 that answers
+every request with a small JSON:API product page.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_RESPONSE = json.dumps(
+    {
+        "data": [
+            {
+                "id": "us/B000000001",
+                "type": "product_database_result",
+                "attributes": {"title": "Sample product", "price": 19.99},
+            }
+        ],
+        "links": {},
+        "meta": {"total_items": 1},
+    }
+).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(SAMPLE_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(SAMPLE_RESPONSE)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """Context manager that serves the stand-in API on a free local port"""
+
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.httpd.server_address
+        self.base_url = f"http://{host}:{port}"
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
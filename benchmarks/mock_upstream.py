@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Jungle Scout's /api/product_database_query.
+
+The same mock can be used in-process through ``httpx.MockTransport`` (no
+sockets, the default for benchmarks), through ``httpx.ASGITransport``, or
+served on a real port with uvicorn:
+
+    python -m benchmarks.mock_upstream --port 8765 --latency-ms 80
+
+``slow_rate``/``slow_ms`` add a latency tail: that fraction of requests
+takes ``slow_ms`` longer (a stalled backend, a GC pause).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+import httpx
+
+from benchmarks.sample_data import make_product
+
+
+class MockJungleScout:
+    """Configurable fake upstream: latency, catalogue size and injected errors"""
+
+    def __init__(
+        self,
+        total_items: int = 10000,
+        latency_ms: float = 50.0,
+        jitter_ms: float = 10.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_page_size: int = 100,
+        seed: int = 0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 0.0,
+    ):
+        self.total_items = total_items
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_page_size = max_page_size
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._products: Dict[int, Dict] = {}
+
+    def _product(self, index: int) -> Dict:
+        product = self._products.get(index)
+        if product is None:
+            product = self._products[index] = make_product(
+                index, rng=random.Random(index)
+            )
+        return product
+
+    def latency(self) -> float:
+        """Seconds to wait before answering the next request"""
+        jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if self.slow_rate and self.rng.random() < self.slow_rate:
+            jitter += self.slow_ms
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def respond(self, params: Dict[str, str], url: str) -> Tuple[int, Dict, Dict]:
+        """Return (status, headers, body) for a product database query"""
+        roll = self.rng.random()
+        if roll < self.throttle_rate:
+            body = {"errors": [{"title": "Too Many Requests"}]}
+            return 429, {"Retry-After": "0"}, body
+        if roll < self.throttle_rate + self.error_rate:
+            return 503, {}, {"errors": [{"title": "Service Unavailable"}]}
+
+        page_size = min(int(params.get("page[size]", 50)), self.max_page_size)
+        page = int(params.get("page[number]", 1))
+        start = (page - 1) * page_size
+        end = min(start + page_size, self.total_items)
+        links = {"self": url}
+        if end < self.total_items:
+            links["next"] = f"{url.split('?')[0]}?page[number]={page + 1}"
+        body = {
+            "data": [self._product(i) for i in range(start, end)],
+            "links": links,
+            "meta": {"total_items": self.total_items, "errors": []},
+        }
+        return 200, {}, body
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency())
+            status, headers, body = self.respond(
+                dict(request.url.params), str(request.url)
+            )
+        finally:
+            self.in_flight -= 1
+        return httpx.Response(status, headers=headers, json=body)
+
+    def transport(self) -> httpx.MockTransport:
+        """In-process transport that skips sockets entirely"""
+        return httpx.MockTransport(self.handle)
+
+    async def asgi_app(self, scope, receive, send):
+        """ASGI app so the mock can run under uvicorn or httpx.ASGITransport"""
+        if scope["type"] != "http":
+            return
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+
+        if scope.get("path") == "/stats":
+            # Lets out-of-process benchmarks count upstream calls
+            payload = json.dumps(
+                {"requests": self.requests, "peak_in_flight": self.peak_in_flight}
+            ).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency())
+        finally:
+            self.in_flight -= 1
+        query = parse_qs(scope.get("query_string", b"").decode())
+        params = {key: values[-1] for key, values in query.items()}
+        status, headers, body = self.respond(params, scope.get("path", "/"))
+        payload = json.dumps(body).encode()
+        raw_headers = [(b"content-type", b"application/json")]
+        raw_headers += [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+        await send(
+            {"type": "http.response.start", "status": status, "headers": raw_headers}
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    parser.add_argument("--total-items", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    mock = MockJungleScout(
+        total_items=args.total_items,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+    )
+    uvicorn.run(
+        mock.asgi_app,
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+        interface="asgi3",  # Autodetection mistakes the bound method for ASGI2
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of per-call CPU overhead in the search_products tool.
+
+The upstream call is stubbed out, so the numbers cover only the work done on
+our side: request validation, parameter coercion, attribute building and
+output serialization. Calls are issued in concurrent batches to mimic heavy
+tool traffic on one event loop.
+
+Usage: python -m benchmarks.normalization [calls] [concurrency]
+"""
+
+import asyncio
+import sys
+import time
+
+from api.jungle_scout import JungleScoutAPI
+from tools.product_search import create_search_products_tool
+
+# A typical agent request: strings everywhere, most filters set
+RAW_ARGUMENTS = {
+    "marketplace": "US",
+    "page": "1",
+    "seller_types": ["FBA", "FBM"],
+    "product_tiers": ["standard"],
+    "include_keywords": ["organic"],
+    "exclude_keywords": ["refurbished"],
+    "exclude_top_brands": "true",
+    "exclude_unavailable_products": "yes",
+    "min_price": "20",
+    "max_price": "100",
+    "min_net": "5.5",
+    "max_net": "80",
+    "min_rank": "1",
+    "max_rank": "50000",
+    "min_sales": "100",
+    "max_sales": "10000",
+    "min_revenue": "1000",
+    "max_revenue": "250000",
+    "min_reviews": "100",
+    "max_reviews": "5000",
+    "min_rating": "4.0",
+    "max_rating": "5",
+    "min_weight": "0.1",
+    "max_weight": "5",
+}
+
+EMPTY_RESPONSE = {"data": [], "links": {}, "meta": {"total_items": 0}}
+
+
+async def main(calls: int, concurrency: int):
+    api_client = JungleScoutAPI("bench-key", "bench-key-id")
+
+    async def make_request(
+        endpoint, params=None, data=None, method="POST", record_factory=None
+    ):
+        return EMPTY_RESPONSE
+
+    api_client.make_request = make_request
+    tool = create_search_products_tool(api_client)
+
+    # Warm up imports and caches; a failing call would only time error handling
+    for _ in range(100):
+        result = await tool(**RAW_ARGUMENTS)
+        if result.content[0].text.startswith("Error"):
+            raise RuntimeError(result.content[0].text)
+
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    for _ in range(calls // concurrency):
+        await asyncio.gather(*(tool(**RAW_ARGUMENTS) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - start_cpu
+
+    done = calls // concurrency * concurrency
+    stages = api_client.stats()["latency_ms"].get("search_products", {})
+    print(f"{done} calls, {concurrency} concurrent")
+    print(f"wall {elapsed / done * 1e6:8.1f} us/call")
+    print(f"cpu  {cpu / done * 1e6:8.1f} us/call")
+    for stage in ("validate", "normalize", "serialize", "total"):
+        if stage in stages:
+            print(f"  {stage:<10} mean {stages[stage]['mean'] * 1000:8.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 64,
+        )
+    )
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Compare output size and encode time for each tool output format.
+
+Usage: python -m benchmarks.output_formats [products]
+"""
+
+import sys
+import time
+
+from benchmarks.sample_data import make_response
+from tools.formatters import OUTPUT_FORMATS, format_result
+
+PROJECTED_FIELDS = ["title", "price", "rating", "reviews", "approximate_30_day_revenue"]
+
+
+def _measure(result, output_format, fields, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = format_result(result, output_format, fields)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    return len(text.encode()), elapsed
+
+
+def main(count: int):
+    result = make_response(count)
+    baseline, _ = _measure(result, "json", None, repeat=1)
+    print(f"{count} products; sizes relative to the original indent=2 JSON")
+    print(f"{'format':<14}{'fields':<11}{'bytes':>12}{'ratio':>8}{'encode ms':>12}")
+    for fields in (None, PROJECTED_FIELDS):
+        for output_format in OUTPUT_FORMATS:
+            size, elapsed = _measure(result, output_format, fields)
+            label = "projected" if fields else "all"
+            print(
+                f"{output_format:<14}{label:<11}{size:>12,}"
+                f"{size / baseline:>8.2f}{elapsed:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Time ingest and analyze_products-style queries on the columnar product store.
+
+Usage: python -m benchmarks.product_store [rows]
+"""
+
+import sys
+import time
+
+from api.product_store import ProductStore
+from benchmarks.sample_data import make_response
+
+QUERIES = {
+    "summary (all rows)": {},
+    "filter + percentiles": {
+        "filters": {"price": {"min": 20, "max": 60}, "rating": {"min": 4.0}},
+        "percentiles": [10, 50, 90, 99],
+    },
+    "group by category": {"group_by": "category"},
+    "group by seller_type + top 10": {
+        "group_by": "seller_type",
+        "top_k": 10,
+        "sort_by": "approximate_30_day_revenue",
+    },
+}
+
+
+def _time_ms(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(rows: int):
+    products = make_response(rows)["data"]
+    store = ProductStore()
+    start = time.perf_counter()
+    for offset in range(0, rows, 100):
+        store.ingest(products[offset : offset + 100])
+    ingest_ms = (time.perf_counter() - start) * 1000
+    stats = store.stats()
+    print(
+        f"{rows:,} rows ingested in 100-product pages: {ingest_ms:.0f} ms "
+        f"({ingest_ms * 1000 / rows:.1f} us/product), "
+        f"{stats['bytes'] / 1e6:.1f} MB of columns"
+    )
+    print(f"{'query':<32}{'ms':>10}")
+    for label, options in QUERIES.items():
+        print(f"{label:<32}{_time_ms(lambda: store.analyze(**options)):>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
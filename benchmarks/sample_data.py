@@ -0,0 +1,75 @@
+"""
+Synthetic product_database_query responses shaped like real API output.
+
+Used in place of a recorded response so the benchmarks need no API quota.
+"""
+
+import random
+from typing import Dict, List
+
+from api.jungle_scout import JUNGLE_SCOUT_API_BASE
+
+CATEGORIES = ["Grocery & Gourmet Food", "Health & Household", "Beauty & Personal Care"]
+SELLER_TYPES = ["AMZ", "FBA", "FBM"]
+
+
+def make_product(index: int, marketplace: str = "us", rng=random) -> Dict:
+    asin = f"B{index:09d}"
+    price = round(rng.uniform(5, 150), 2)
+    units = rng.randint(0, 20000)
+    return {
+        "id": f"{marketplace}/{asin}",
+        "type": "product_database_result",
+        "attributes": {
+            "title": f"Organic product {index} with a reasonably long listing title",
+            "price": price,
+            "reviews": rng.randint(0, 50000),
+            "category": rng.choice(CATEGORIES),
+            "rating": round(rng.uniform(1, 5), 1),
+            "image_url": f"https://images-na.ssl-images-amazon.com/images/I/{asin}.jpg",
+            "parent_asin": f"B{index // 3:09d}",
+            "is_variant": index % 3 != 0,
+            "seller_type": rng.choice(SELLER_TYPES),
+            "variants": rng.randint(0, 12),
+            "breadcrumbs": ["Grocery & Gourmet Food", "Pantry Staples"],
+            "categories": ["Grocery & Gourmet Food"],
+            "product_rank": rng.randint(1, 500000),
+            "weight_value": round(rng.uniform(0.1, 20), 2),
+            "weight_unit": "pounds",
+            "length_value": round(rng.uniform(1, 30), 2),
+            "width_value": round(rng.uniform(1, 20), 2),
+            "height_value": round(rng.uniform(1, 10), 2),
+            "dimensions_unit": "inches",
+            "listing_quality_score": rng.randint(1, 10),
+            "number_of_sellers": rng.randint(1, 30),
+            "buy_box_owner": "Example Seller",
+            "buy_box_owner_seller_id": "A1EXAMPLE",
+            "date_first_available": "2021-04-12",
+            "date_first_available_is_estimated": False,
+            "approximate_30_day_revenue": round(units * price, 2),
+            "approximate_30_day_units_sold": units,
+            "ean_list": [4000000000000 + index],
+            "isbn_list": [],
+            "upc_list": [700000000000 + index],
+            "gtin_list": [],
+            "subcategory_ranks": [{"subcategory": "Pantry Staples", "rank": 42}],
+            "fee_breakdown": {
+                "fba_fee": 4.75,
+                "referral_fee": round(price * 0.15, 2),
+                "variable_closing_fee": 0.0,
+                "total_fees": round(4.75 + price * 0.15, 2),
+            },
+            "updated_at": "2024-05-01T00:00:00Z",
+        },
+    }
+
+
+def make_response(count: int, seed: int = 0, start: int = 0) -> Dict:
+    """Build a JSON:API page with `count` products"""
+    rng = random.Random(seed)
+    data: List[Dict] = [make_product(start + i, rng=rng) for i in range(count)]
+    return {
+        "data": data,
+        "links": {"self": f"{JUNGLE_SCOUT_API_BASE}/api/product_database_query"},
+        "meta": {"total_items": count, "errors": []},
+    }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cold-start latency of the stdio server, as an MCP client sees it.
+
+Each run launches ``server.py`` in a fresh process, sends ``initialize``
+and then ``tools/list``, and records the time until each response arrives.
+Also reports the modules imported before the first response, so a change
+that pulls the request path back into startup shows up here.
+
+Usage: python -m benchmarks.startup [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVER = Path(__file__).resolve().parent.parent / "server.py"
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+# Modules that belong to the request path and should load on first tool call
+DEFERRED_MODULES = ("api.jungle_scout", "numpy")
+
+
+def _send(process: subprocess.Popen, message: dict) -> None:
+    process.stdin.write(json.dumps(message).encode() + b"\n")
+    process.stdin.flush()
+
+
+def _read_response(process: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def run_once():
+    """Return (seconds to initialize, seconds to tools/list, tool count)"""
+    env = dict(
+        os.environ, JUNGLE_SCOUT_API_KEY="bench", JUNGLE_SCOUT_API_KEY_ID="bench"
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=SERVER.parent,
+        env=env,
+    )
+    try:
+        _send(process, INITIALIZE)
+        _read_response(process, 1)
+        initialized = time.perf_counter() - start
+        _send(process, INITIALIZED)
+        _send(process, LIST_TOOLS)
+        tools = _read_response(process, 2)["result"]["tools"]
+        listed = time.perf_counter() - start
+    finally:
+        process.stdin.close()
+        process.wait(timeout=10)
+    return initialized, listed, len(tools)
+
+
+def deferred_modules_loaded():
+    """Request-path modules that importing server.py already loads"""
+    code = (
+        "import sys, server; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SERVER.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    return [module for module in output.split(",") if module]
+
+
+def main(runs: int):
+    results = [run_once() for _ in range(runs)]
+    initialize = [r[0] * 1000 for r in results]
+    listed = [r[1] * 1000 for r in results]
+    print(f"{runs} cold starts of {SERVER.name} ({results[0][2]} tools)")
+    print(f"{'milestone':<24}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+    for label, values in (("initialize response", initialize), ("tools/list", listed)):
+        print(
+            f"{label:<24}{min(values):>10.0f}{statistics.median(values):>12.0f}"
+            f"{max(values):>10.0f}"
+        )
+    loaded = deferred_modules_loaded()
+    print("request path loaded at startup:", ", ".join(loaded) if loaded else "none")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
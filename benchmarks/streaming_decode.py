@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Peak and retained memory for decoding one very large product page, buffered
+(response.json()) versus streamed into slotted ProductRecords.
+
+Usage: python -m benchmarks.streaming_decode [products]
+"""
+
+import asyncio
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+from api.jungle_scout import JungleScoutAPI
+from benchmarks.sample_data import make_response
+from models.records import ProductRecord
+
+CHUNK_SIZE = 65536
+
+
+def _transport(body: bytes) -> httpx.MockTransport:
+    async def chunks():
+        for offset in range(0, len(body), CHUNK_SIZE):
+            yield body[offset : offset + CHUNK_SIZE]
+
+    async def handler(request):
+        return httpx.Response(
+            200, headers={"content-type": "application/json"}, content=chunks()
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _measure(body: bytes, record_factory):
+    """Return (peak bytes, retained bytes, seconds) for one decode
+
+    Time is taken in a separate, untraced run since tracemalloc slows
+    allocation-heavy code down severalfold.
+    """
+
+    def decode():
+        api_client = JungleScoutAPI("key", "key-id", transport=_transport(body))
+        return asyncio.run(
+            api_client.make_request(
+                "/api/product_database_query", data={}, record_factory=record_factory
+            )
+        )
+
+    start = time.perf_counter()
+    decode()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = decode()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, retained, elapsed, result
+
+
+def main(count: int):
+    body = json.dumps(make_response(count), separators=(",", ":")).encode()
+    print(f"{count:,} products, {len(body) / 1e6:.1f} MB body, {CHUNK_SIZE} B chunks")
+    print(f"{'path':<22}{'peak MB':>10}{'retained MB':>14}{'seconds':>10}")
+    for label, factory in (
+        ("buffered dicts", None),
+        ("streamed records", ProductRecord.from_entry),
+    ):
+        peak, retained, elapsed, result = _measure(body, factory)
+        assert len(result["data"]) == count
+        print(f"{label:<22}{peak / 1e6:>10.1f}{retained / 1e6:>14.1f}{elapsed:>10.2f}")
+        del result
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
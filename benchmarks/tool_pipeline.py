@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the search_products tool against the local mock.
+
+Each call goes through the real tool handler: Pydantic validation,
+parameter normalization, the API client (rate limiter, retries, pooled
+client), JSON decode and output formatting. Only the network is replaced,
+by MockJungleScout. Every call uses a distinct query so the response cache
+and request coalescing don't short-circuit the measurement.
+
+Peak memory is the tracemalloc high-water mark of Python allocations while
+2 x concurrency calls run.
+
+``--record CASSETTE`` saves the mock's responses; ``--replay CASSETTE``
+then serves them from the cassette instead of the mock (with
+``--replay-latency-scale`` of the recorded latency), which is how a
+cassette of real API responses can drive the benchmark.
+
+``--slow-rate``/``--slow-ms`` give the mock a latency tail;
+``--hedge-percentile`` then shows what hedged requests do to p99, and
+``--circuit-breaker`` what failing fast does under ``--error-rate``.
+
+Usage:
+    python -m benchmarks.tool_pipeline --calls 400 --concurrency 1 8 32 \\
+        --latency-ms 50 --page-size 5 --error-rate 0.02
+    python -m benchmarks.tool_pipeline --replay api.cassette --concurrency 1 64
+    python -m benchmarks.tool_pipeline --slow-rate 0.03 --slow-ms 500 \\
+        --hedge-percentile 95
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import List
+
+from api.jungle_scout import JungleScoutAPI
+from api.rate_limit import RateLimiter, RetryPolicy
+from api.resilience import CircuitBreaker, HedgePolicy
+from benchmarks.mock_upstream import MockJungleScout
+from models.requests.product_search import ProductSearchRequest
+from tools.handlers import create_tool_handler
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_level(args, concurrency: int, calls: int, record: bool = False) -> dict:
+    mock = MockJungleScout(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+    )
+    hedge_policy = None
+    if args.hedge_percentile:
+        hedge_policy = HedgePolicy(
+            percentile=args.hedge_percentile, budget_ratio=args.hedge_budget
+        )
+    api_client = JungleScoutAPI(
+        "bench-key",
+        "bench-key-id",
+        transport=mock.transport(),
+        # Don't let client-side pacing cap the numbers we're measuring
+        rate_limiter=RateLimiter(
+            rate=1e9,
+            burst=1e9,
+            initial_concurrency=concurrency,
+            max_concurrency=max(concurrency, 1),
+        ),
+        retry_policy=RetryPolicy(base_delay=0.001),
+        upstream_mode="replay" if args.replay else "record" if record else "live",
+        cassette_path=args.replay or args.record,
+        replay_latency_scale=args.replay_latency_scale,
+        hedge_policy=hedge_policy,
+        circuit_breaker=CircuitBreaker() if args.circuit_breaker else None,
+    )
+    tool = create_tool_handler(
+        request_model_class=ProductSearchRequest,
+        api_method_name="search_products",
+        api_client=api_client,
+        additional_params={"page_size": args.page_size},
+    )
+
+    latencies: List[float] = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(calls):
+        queue.put_nowait(i)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            result = await tool(
+                marketplace="US",
+                min_price=str(10 + i),
+                max_price="100",
+                seller_types=["FBA"],
+                output_format=args.output_format,
+            )
+            latencies.append(time.perf_counter() - start)
+            if result.content[0].text.startswith("Error:"):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await api_client.aclose()
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "throughput": calls / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+        "hedges": hedge_policy.sent if hedge_policy is not None else 0,
+        "upstream_requests": (
+            api_client.stats()["replayed_responses"] if args.replay else mock.requests
+        ),
+    }
+
+
+async def main(args):
+    print(
+        f"{args.calls} calls per level, mock latency {args.latency_ms}ms "
+        f"±{args.jitter_ms}ms, page size {args.page_size}, "
+        f"errors {args.error_rate:.0%}, throttles {args.throttle_rate:.0%}"
+    )
+    print(
+        f"{'conc':>5}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'peak MB':>9}{'errors':>8}{'upstream':>10}{'hedges':>8}"
+    )
+    for concurrency in args.concurrency:
+        row = await run_level(args, concurrency, args.calls, record=bool(args.record))
+
+        # tracemalloc slows allocation-heavy code several-fold, so measure
+        # peak memory in a separate, shorter pass at the same concurrency
+        tracemalloc.start()
+        await run_level(args, concurrency, concurrency * 2)
+        row["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+        print(
+            f"{row['concurrency']:>5}{row['throughput']:>10.1f}{row['p50']:>9.2f}"
+            f"{row['p95']:>9.2f}{row['p99']:>9.2f}{row['peak_mb']:>9.2f}"
+            f"{row['errors']:>8}{row['upstream_requests']:>10}{row['hedges']:>8}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tool pipeline benchmark")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--page-size", type=int, default=5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    parser.add_argument("--hedge-percentile", type=float, default=0.0)
+    parser.add_argument("--hedge-budget", type=float, default=0.05)
+    parser.add_argument("--circuit-breaker", action="store_true")
+    parser.add_argument("--output-format", default="json")
+    parser.add_argument("--record", metavar="CASSETTE", help="Record the mock")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Replace the mock")
+    parser.add_argument("--replay-latency-scale", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -1,4 +1,102 @@
 # Global configuration constants for the Jungle Scout MCP Server
 
 # Product search configuration
-PRODUCT_SEARCH_LIMIT = 5  # Static limit for number of products returned per search 
\ No newline at end of file
+PRODUCT_SEARCH_LIMIT = 5  # Static limit for number of products returned per search
+
+# HTTP client configuration (shared connection pool)
+HTTP_MAX_CONNECTIONS = 20  # Upper bound on concurrent connections to the API
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10  # Idle connections kept warm for reuse
+HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection stays in the pool
+HTTP_TIMEOUT = 30.0  # Seconds before a request to the API times out
+
+# Response cache configuration
+CACHE_TTL_SECONDS = 300.0  # How long a cached search response stays fresh
+CACHE_MAX_ENTRIES = 1024  # LRU bound on the number of cached responses
+
+# Local query engine (refinements answered from fully fetched result sets)
+QUERY_ENGINE_MAX_SETS = 32  # LRU bound on the number of stored full result sets
+QUERY_ENGINE_MAX_PRODUCTS = 10000  # Larger result sets are not kept locally
+
+# Local columnar product store (analyze_products)
+PRODUCT_STORE_INITIAL_CAPACITY = 1024  # Rows preallocated; doubles as it fills
+PRODUCT_STORE_MAX_GROUPS = 50  # Largest groups returned by a group_by analysis
+PRODUCT_STORE_MAX_ROWS = 200_000  # Least recently fetched products evicted beyond
+
+# Multi-worker HTTP serving (state shared between worker processes)
+HTTP_SERVER_HOST = "127.0.0.1"  # Interface the HTTP transports listen on
+HTTP_SERVER_PORT = 8000  # Port the HTTP transports listen on
+HTTP_SERVER_WORKERS = 1  # Worker processes behind the port
+SHARED_LEASE_SECONDS = 30.0  # How long one worker's claim on a query is honoured
+SHARED_POLL_INTERVAL = 0.05  # Seconds between checks for another worker's result
+
+# Saved queries (kept warm by a background refresh scheduler)
+SAVED_QUERY_MAX = 50  # Upper bound on saved queries
+SAVED_QUERY_MIN_INTERVAL = 60.0  # Seconds; shortest refresh interval accepted
+SAVED_QUERY_CONCURRENCY = 2  # Refreshes allowed in flight at the same time
+SAVED_QUERY_REFRESH_BUDGET = 120  # Upstream requests refreshes may spend per hour
+SAVED_QUERY_JITTER = 0.1  # Refresh times are spread by +/- this fraction
+SAVED_QUERY_RESERVED_SLOTS = 1  # Rate limiter slots left free for tool calls
+SAVED_QUERY_RETRY_DELAY = 5.0  # Seconds before retrying a deferred or failed refresh
+
+# Record/replay upstream (cassettes of recorded API responses)
+CASSETTE_DECODED_ENTRIES = 256  # Decompressed responses kept in memory on replay
+
+# Sales estimates (per-ASIN daily time series, fetched only where missing)
+SALES_ESTIMATES_DEFAULT_DAYS = 90  # Window length when no start_date is given
+SALES_ESTIMATES_MAX_DAYS = 366  # Longest window one call may ask for
+SALES_ESTIMATES_GAP_MERGE_DAYS = 7  # Gaps this close are fetched in one request
+SALES_STORE_MAX_ASINS = 1000  # LRU bound on the number of ASIN series kept
+
+# Keywords by ASIN (long ASIN lists split into concurrent chunked requests)
+KEYWORDS_BY_ASIN_CHUNK_SIZE = 10  # Most ASINs the endpoint accepts per request
+KEYWORDS_BY_ASIN_PAGE_SIZE = 100  # Keywords requested per page
+KEYWORDS_BY_ASIN_CONCURRENCY = 4  # Chunks walked at the same time
+KEYWORDS_BY_ASIN_MAX_RESULTS = 5000  # Upper bound on keywords returned by one call
+
+# Result handles (large results kept server-side and read in slices)
+RESULT_HANDLE_TTL_SECONDS = 3600.0  # A handle expires this long after its last read
+RESULT_HANDLE_PREVIEW_ROWS = 3  # Rows shown in the summary a handle comes with
+RESULT_VIEW_DEFAULT_ROWS = 50  # Rows in a slice when no limit is given
+RESULT_VIEW_MAX_ROWS = 1000  # Largest slice one read returns
+RESULT_STORE_MAX_MEMORY_BYTES = 64 * 1024 * 1024  # Beyond this, results spill
+RESULT_STORE_MAX_DISK_BYTES = 512 * 1024 * 1024  # Beyond this, results are dropped
+
+# Snapshot diffing (since_last returns only what changed since the last run)
+SNAPSHOT_MAX_QUERIES = 200  # Snapshots kept, most recently run queries first
+SNAPSHOT_IGNORED_ATTRIBUTES = ("updated_at",)  # Change on every run; not compared
+
+# Hedged requests (opt-in: resend reads that are slower than usual)
+HEDGE_PERCENTILE = 95.0  # Hedge once a request is slower than this percentile
+HEDGE_BUDGET_RATIO = 0.05  # Hedges earned per ordinary request (5% extra quota)
+HEDGE_BUDGET_BURST = 10.0  # Most hedges that can be saved up
+HEDGE_MIN_SAMPLES = 20  # Latencies needed per endpoint before hedging starts
+HEDGE_MIN_DELAY = 0.05  # Seconds; never hedge sooner than this
+HEDGE_LATENCY_WINDOW = 256  # Recent latencies the percentile is taken over
+
+# Circuit breaker (opt-in: fail fast while the API is down)
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures (network/5xx) that open it
+CIRCUIT_RESET_SECONDS = 30.0  # How long it stays open before probing again
+CIRCUIT_HALF_OPEN_PROBES = 1  # Requests let through to test the API
+
+# Pagination configuration
+PRODUCT_PAGE_SIZE_MAX = 100  # Largest page size the product database accepts
+PAGINATION_PREFETCH = 4  # Pages fetched concurrently ahead of the consumer
+COLLECT_PRODUCTS_MAX = 500  # Upper bound on products collected in one tool call
+
+# Rate limiting and retry configuration
+RATE_LIMIT_REQUESTS_PER_SECOND = 5.0  # Steady-state request rate to the API
+RATE_LIMIT_BURST = 10  # Requests allowed back-to-back before pacing kicks in
+RATE_LIMIT_CONCURRENCY_INITIAL = 4  # Starting in-flight request limit (AIMD)
+RATE_LIMIT_CONCURRENCY_MIN = 1  # Floor the in-flight limit shrinks to on 429
+RATE_LIMIT_CONCURRENCY_MAX = HTTP_MAX_CONNECTIONS  # Ceiling the limit grows to
+RETRY_MAX_ATTEMPTS = 4  # Total attempts for a retryable failure (429/5xx/network)
+RETRY_BASE_DELAY = 0.5  # Seconds; backoff doubles per attempt with full jitter
+RETRY_MAX_DELAY = 30.0  # Seconds; cap on any single backoff or Retry-After wait
+
+# Credential pool (several API keys, each with its own quota)
+CREDENTIAL_FAILURE_THRESHOLD = 2  # Consecutive 401/429s before a key is benched
+CREDENTIAL_COOLDOWN_SECONDS = 60.0  # How long a benched key stays out of rotation
+
+# Batch search configuration
+BATCH_MAX_QUERIES = 50  # Upper bound on queries in one search_products_batch call
+BATCH_CONCURRENCY = 8  # Default number of batch queries run at the same time
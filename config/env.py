@@ -1,6 +1,18 @@
+import json
 import os
+from typing import List, Optional, Tuple
+
 from dotenv import load_dotenv
 
+from config.constants import (
+    CACHE_TTL_SECONDS,
+    HEDGE_BUDGET_RATIO,
+    HTTP_SERVER_HOST,
+    HTTP_SERVER_PORT,
+    HTTP_SERVER_WORKERS,
+    RATE_LIMIT_REQUESTS_PER_SECOND,
+)
+
 # Load environment variables
 load_dotenv()
 
@@ -19,3 +31,162 @@ def get_api_key_id() -> str:
     if not api_key_id:
         raise ValueError("JUNGLE_SCOUT_API_KEY_ID environment variable is required")
     return api_key_id
+
+
+def _parse_key_list(value: str) -> List[Tuple[str, str, str]]:
+    """Parse "[name=]key_id:api_key" entries separated by commas"""
+    keys = []
+    for index, entry in enumerate(filter(None, map(str.strip, value.split(",")))):
+        name, separator, pair = entry.partition("=")
+        if not separator or ":" in name:
+            name, pair = "", entry  # No name (an "=" inside the key itself)
+        key_id, _, api_key = pair.partition(":")
+        if not key_id or not api_key:
+            raise ValueError(
+                "JUNGLE_SCOUT_API_KEYS entries must look like [name=]key_id:api_key"
+            )
+        keys.append((name or f"key{index + 1}", key_id, api_key))
+    return keys
+
+
+def _read_credentials_file(path: str) -> List[Tuple[str, str, str]]:
+    """Read a JSON list of {"name", "key_id", "api_key"} objects"""
+    with open(path) as f:
+        entries = json.load(f)
+    return [
+        (entry.get("name") or f"key{index + 1}", entry["key_id"], entry["api_key"])
+        for index, entry in enumerate(entries)
+    ]
+
+
+def get_credentials() -> List[Tuple[str, str, str]]:
+    """Get the API keys to use as (name, key_id, api_key) triples
+
+    JUNGLE_SCOUT_CREDENTIALS_FILE and JUNGLE_SCOUT_API_KEYS configure a pool
+    of keys; otherwise the single JUNGLE_SCOUT_API_KEY_ID/_API_KEY pair is used.
+    """
+    keys = []
+    path = os.getenv("JUNGLE_SCOUT_CREDENTIALS_FILE")
+    if path:
+        keys.extend(_read_credentials_file(path))
+    keys.extend(_parse_key_list(os.getenv("JUNGLE_SCOUT_API_KEYS", "")))
+    if not keys:
+        keys.append(("default", get_api_key_id(), get_api_key()))
+    return keys
+
+
+def get_secrets() -> Tuple[str, ...]:
+    """Configured credentials to mask in logs (no validation, may be empty)"""
+    values = [
+        os.getenv("JUNGLE_SCOUT_API_KEY"),
+        os.getenv("JUNGLE_SCOUT_API_KEY_ID"),
+    ]
+    try:
+        pool = _parse_key_list(os.getenv("JUNGLE_SCOUT_API_KEYS", ""))
+        path = os.getenv("JUNGLE_SCOUT_CREDENTIALS_FILE")
+        if path:
+            pool += _read_credentials_file(path)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pool = []  # Reported when the API client is built
+    values += [secret for _, key_id, api_key in pool for secret in (key_id, api_key)]
+    return tuple(value for value in values if value)
+
+
+def get_http2_enabled() -> bool:
+    """Whether to negotiate HTTP/2 with the API (requires the ``h2`` package)"""
+    value = os.getenv("JUNGLE_SCOUT_HTTP2", "false")
+    return value.lower() in ("true", "1", "yes", "on")
+
+
+def get_hedge_percentile() -> Optional[float]:
+    """Latency percentile after which reads are hedged (unset or 0: no hedging)"""
+    value = float(os.getenv("JUNGLE_SCOUT_HEDGE_PERCENTILE") or 0)
+    return value if value > 0 else None
+
+
+def get_hedge_budget() -> float:
+    """Hedges allowed per ordinary request (e.g. 0.05 for 5% extra requests)"""
+    return float(os.getenv("JUNGLE_SCOUT_HEDGE_BUDGET", str(HEDGE_BUDGET_RATIO)))
+
+
+def get_circuit_breaker_enabled() -> bool:
+    """Whether to fail fast (or serve stale cache) while the API is failing"""
+    value = os.getenv("JUNGLE_SCOUT_CIRCUIT_BREAKER", "false")
+    return value.lower() in ("true", "1", "yes", "on")
+
+
+def get_cache_ttl() -> float:
+    """Get the response cache TTL in seconds (0 disables the cache)"""
+    return float(os.getenv("JUNGLE_SCOUT_CACHE_TTL", CACHE_TTL_SECONDS))
+
+
+def get_cache_path() -> Optional[str]:
+    """Get the SQLite file backing the response cache (unset keeps it in memory)"""
+    return os.getenv("JUNGLE_SCOUT_CACHE_PATH") or None
+
+
+def get_saved_queries_path() -> Optional[str]:
+    """Get the JSON file saved queries persist to (unset keeps them in memory)"""
+    return os.getenv("JUNGLE_SCOUT_SAVED_QUERIES_PATH") or None
+
+
+def get_snapshot_path() -> Optional[str]:
+    """Get the SQLite file since_last snapshots persist to (unset: in memory)"""
+    return os.getenv("JUNGLE_SCOUT_SNAPSHOT_PATH") or None
+
+
+def get_result_spill_dir() -> Optional[str]:
+    """Get the directory large result handles spill to (default: a temp dir)"""
+    return os.getenv("JUNGLE_SCOUT_RESULT_SPILL_DIR") or None
+
+
+def get_upstream_mode() -> str:
+    """Get how the API is reached: live (default), record or replay"""
+    return os.getenv("JUNGLE_SCOUT_UPSTREAM_MODE", "live").lower()
+
+
+def get_cassette_path() -> Optional[str]:
+    """Get the cassette file that record mode writes and replay mode reads"""
+    return os.getenv("JUNGLE_SCOUT_CASSETTE") or None
+
+
+def get_replay_latency_scale() -> float:
+    """Get the share of recorded latency replay mode simulates (0 = none)"""
+    return float(os.getenv("JUNGLE_SCOUT_REPLAY_LATENCY_SCALE", "0"))
+
+
+def get_api_base_url() -> Optional[str]:
+    """Override the API base URL (e.g. a local mock); unset uses the real API"""
+    return os.getenv("JUNGLE_SCOUT_API_BASE_URL") or None
+
+
+def get_rate_limit() -> float:
+    """Get the upstream request budget in requests per second"""
+    return float(
+        os.getenv("JUNGLE_SCOUT_RATE_LIMIT_RPS", RATE_LIMIT_REQUESTS_PER_SECOND)
+    )
+
+
+def get_transport() -> str:
+    """Get the MCP transport: stdio (default), sse or streamable-http"""
+    return os.getenv("JUNGLE_SCOUT_TRANSPORT", "stdio").lower()
+
+
+def get_http_host() -> str:
+    """Get the interface the HTTP transports listen on"""
+    return os.getenv("JUNGLE_SCOUT_HOST", HTTP_SERVER_HOST)
+
+
+def get_http_port() -> int:
+    """Get the port the HTTP transports listen on"""
+    return int(os.getenv("JUNGLE_SCOUT_PORT", HTTP_SERVER_PORT))
+
+
+def get_workers() -> int:
+    """Get the number of HTTP worker processes"""
+    return max(1, int(os.getenv("JUNGLE_SCOUT_WORKERS", HTTP_SERVER_WORKERS)))
+
+
+def get_shared_state_url() -> Optional[str]:
+    """Get the backend workers share (sqlite:///path or redis://host:port/db)"""
+    return os.getenv("JUNGLE_SCOUT_SHARED_STATE") or None
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import sys
+from typing import Any, Iterable, Optional
+
+LOGGER_NAME = "jungle_scout"
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+REDACTED = "***"
+
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """Return the package logger, or a child of it"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def redact_headers(headers: Any) -> dict:
+    """Copy headers with credentials masked"""
+    return {
+        key: REDACTED if key.lower() in ("authorization", "x-api-key") else value
+        for key, value in dict(headers).items()
+    }
+
+
+class LazyJSON:
+    """Defer json.dumps until a log record is actually emitted"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, separators=(",", ":"), default=str)
+
+
+class RedactingFilter(logging.Filter):
+    """Mask configured secrets anywhere in an emitted message or `extra` field"""
+
+    def __init__(self, secrets: Iterable[str] = ()):
+        super().__init__()
+        self.secrets = [secret for secret in secrets if secret]
+
+    def _redact(self, text: str) -> str:
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.secrets:
+            record.msg, record.args = self._redact(record.getMessage()), None
+            for key, value in vars(record).items():
+                if key not in _RECORD_ATTRIBUTES and isinstance(value, str):
+                    setattr(record, key, self._redact(value))
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra` fields such as request_id"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_file: Optional[str] = None,
+    json_lines: Optional[bool] = None,
+    secrets: Iterable[str] = (),
+) -> logging.Logger:
+    """Configure the package logger from arguments or environment variables
+
+    Logs never go to stdout, which the stdio MCP transport owns: they go to
+    stderr unless JUNGLE_SCOUT_LOG_FILE is set.
+    """
+    level = level or os.getenv("JUNGLE_SCOUT_LOG_LEVEL", "WARNING")
+    log_file = log_file or os.getenv("JUNGLE_SCOUT_LOG_FILE") or None
+    if json_lines is None:
+        json_lines = os.getenv("JUNGLE_SCOUT_LOG_JSON", "false").lower() in (
+            "true",
+            "1",
+            "yes",
+            "on",
+        )
+
+    logger = get_logger()
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    if log_file:
+        handler = logging.FileHandler(log_file)
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    if json_lines:
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+    handler.addFilter(RedactingFilter(secrets))
+    logger.addHandler(handler)
+    return logger
@@ -0,0 +1,224 @@
+"""
+Declarative request field tables.
+
+Each endpoint describes its parameters once as a tuple of FieldSpec. The same
+table drives coercion of loosely typed agent input (strings such as "100",
+"true" or '["FBA"]') in the Pydantic request models, and the single pass in
+the API client that coerces values and builds the JSON:API ``attributes``,
+so adding a parameter (or a new endpoint) means adding table rows only.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import AfterValidator, BaseModel, BeforeValidator, Field, create_model
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """Parse an integer that might come as a string or float
+
+    Integral values such as "5" or 5.0 are accepted; "4.7" is rejected
+    rather than truncated, as Pydantic does for the model path.
+    """
+    if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+        return value
+    if isinstance(value, (str, float)):
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            number = None
+        if number is not None and number.is_integer():
+            return int(number)
+    raise ValueError(f"Expected an integer, got {value!r}")
+
+
+def parse_float(value: Any) -> Optional[float]:
+    """Parse a number that might come as a string"""
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            pass
+    raise ValueError(f"Expected a number, got {value!r}")
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """Parse a boolean that might come as a string"""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "yes", "on")
+    return bool(value)
+
+
+def parse_list(value: Any) -> Optional[List]:
+    """Parse a list that might come as a JSON string or a single value"""
+    if value is None or isinstance(value, list):
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, str):
+        try:
+            # Try to parse as JSON if it's a string representation of a list
+            parsed = json.loads(value)
+            if isinstance(parsed, list):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+        # If it's a single string, treat as a single-item list
+        return [value]
+    raise ValueError(f"Expected a list, got {value!r}")
+
+
+def parse_lowercase(value: Any) -> Optional[str]:
+    """Normalize a string to lowercase"""
+    if value is None or not isinstance(value, str):
+        return value
+    return value.lower()
+
+
+def lowercase_items(values: Optional[List]) -> Optional[List]:
+    """Lowercase every string in a list (e.g. seller types)"""
+    if values is None:
+        return None
+    return [v.lower() if isinstance(v, str) else v for v in values]
+
+
+PARSERS: Dict[str, Callable[[Any], Any]] = {
+    "int": parse_int,
+    "float": parse_float,
+    "bool": parse_bool,
+    "list": parse_list,
+    "lowercase": parse_lowercase,
+}
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """One request parameter: how to coerce it and where it goes in the request
+
+    `attribute` fields are sent in the JSON:API ``attributes`` body; the rest
+    are query parameters handled by the endpoint method itself. `required`
+    fields have no default and are not nullable in the request model.
+    """
+
+    name: str
+    kind: str
+    description: str = ""
+    default: Any = None
+    attribute: bool = True
+    transform: Optional[Callable[[Any], Any]] = None
+    required: bool = False
+
+    @property
+    def parser(self) -> Callable[[Any], Any]:
+        return PARSERS[self.kind]
+
+    def coerce(self, value: Any) -> Any:
+        """Parse a raw input value, falling back to the default for None"""
+        if value is None:
+            return self.default
+        return self.parser(value)
+
+
+AttributePlan = Tuple[Tuple[str, Callable[[Any], Any], Optional[Callable]], ...]
+
+
+def attribute_plan(fields: Iterable[FieldSpec]) -> AttributePlan:
+    """Precompute (name, parser, transform) for the attribute fields of a table"""
+    return tuple(
+        (spec.name, spec.parser, spec.transform) for spec in fields if spec.attribute
+    )
+
+
+def build_attributes(plan: AttributePlan, values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Coerce and collect the non-None attribute fields in a single pass
+
+    Values that are already the right type (e.g. from a validated request
+    model) fall straight through each parser's type check.
+    """
+    attributes = {}
+    for name, parser, transform in plan:
+        value = values.get(name)
+        if value is None:
+            continue
+        value = parser(value)
+        if transform is not None:
+            value = transform(value)
+        attributes[name] = value
+    return attributes
+
+
+ANNOTATIONS: Dict[str, Any] = {
+    "int": Optional[int],
+    "float": Optional[float],
+    "bool": Optional[bool],
+    "list": Optional[List[str]],
+    "lowercase": str,
+}
+
+# Kinds whose loose inputs ("100", "4.5", "true") Pydantic's lax mode already
+# coerces natively, without a Python-level validator call
+NATIVE_KINDS = frozenset({"int", "float", "bool"})
+
+
+def field_annotation(spec: FieldSpec) -> Any:
+    """Pydantic annotation for a field, with the table's coercion attached"""
+    annotation = ANNOTATIONS[spec.kind]
+    if spec.required and get_origin(annotation) is Union:
+        annotation = get_args(annotation)[0]
+    validators = []
+    if spec.kind not in NATIVE_KINDS:
+        validators.append(BeforeValidator(spec.coerce))
+    if spec.transform:
+        validators.append(AfterValidator(spec.transform))
+    if not validators:
+        return annotation
+    return Annotated[(annotation, *validators)]
+
+
+def table_model(
+    name: str,
+    fields: Tuple[FieldSpec, ...],
+    base: Type[BaseModel] = BaseModel,
+    module: Optional[str] = None,
+    doc: Optional[str] = None,
+) -> Type[BaseModel]:
+    """Build a Pydantic request model whose fields come from `fields`
+
+    Coercion runs inside pydantic-core as per-field validators, so only the
+    fields a caller actually sets pay for it.
+    """
+    return create_model(
+        name,
+        __base__=base,
+        __module__=module or __name__,
+        __doc__=doc,
+        **{
+            spec.name: (
+                field_annotation(spec),
+                Field(
+                    default=... if spec.required else spec.default,
+                    description=spec.description,
+                ),
+            )
+            for spec in fields
+        },
+    )
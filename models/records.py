@@ -0,0 +1,212 @@
+"""
+Compact product records for product_database_query results.
+
+A decoded product entry is a dict holding an ``attributes`` dict of ~40
+keys. ProductRecord keeps the same data in ``__slots__`` (one pointer per
+known attribute, nothing for absent ones), which is several times smaller
+per product. Records read like the JSON:API dicts they replace
+(``record["id"]``, ``record.get("attributes").get("price")``, ``items()``),
+so formatters, caches and stores need no special casing beyond JSON
+encoding through `to_json`.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+# Known product_database_result attributes, in API order; anything else a
+# response carries is kept in a per-record overflow dict
+PRODUCT_ATTRIBUTES = (
+    "title",
+    "price",
+    "reviews",
+    "category",
+    "rating",
+    "image_url",
+    "parent_asin",
+    "is_variant",
+    "seller_type",
+    "variants",
+    "breadcrumbs",
+    "categories",
+    "product_rank",
+    "weight_value",
+    "weight_unit",
+    "length_value",
+    "width_value",
+    "height_value",
+    "dimensions_unit",
+    "listing_quality_score",
+    "number_of_sellers",
+    "buy_box_owner",
+    "buy_box_owner_seller_id",
+    "brand",
+    "product_tier",
+    "date_first_available",
+    "date_first_available_is_estimated",
+    "approximate_30_day_revenue",
+    "approximate_30_day_units_sold",
+    "ean_list",
+    "isbn_list",
+    "upc_list",
+    "gtin_list",
+    "subcategory_ranks",
+    "fee_breakdown",
+    "updated_at",
+)
+_KNOWN = frozenset(PRODUCT_ATTRIBUTES)
+_ENTRY_KEYS = frozenset({"id", "type", "attributes"})
+
+# Attributes whose string values repeat across products; records share one
+# copy of each value (as they do nested dict keys) instead of holding their own
+SHARED_VALUE_ATTRIBUTES = frozenset(
+    {
+        "category",
+        "seller_type",
+        "weight_unit",
+        "dimensions_unit",
+        "buy_box_owner",
+        "buy_box_owner_seller_id",
+        "brand",
+        "product_tier",
+        "date_first_available",
+        "updated_at",
+    }
+)
+SHARED_STRINGS_MAX = 65536  # Bound on the table of shared strings
+
+_shared: Dict[str, str] = {}
+
+
+def _share(value: str) -> str:
+    shared = _shared.get(value)
+    if shared is None:
+        if len(_shared) >= SHARED_STRINGS_MAX:
+            return value
+        shared = _shared[value] = value
+    return shared
+
+
+def _compact(value: Any) -> Any:
+    """Share strings (and dict keys) inside a decoded value"""
+    if isinstance(value, str):
+        return _share(value)
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    if isinstance(value, dict):
+        return {_share(key): _compact(item) for key, item in value.items()}
+    return value
+
+
+class ProductAttributes(Mapping):
+    """Read-only mapping view over a record's attribute slots"""
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: "ProductRecord"):
+        self._record = record
+
+    def __getitem__(self, name: str) -> Any:
+        if name in _KNOWN:
+            try:
+                return getattr(self._record, name)
+            except AttributeError:
+                raise KeyError(name) from None
+        extra = self._record._extra
+        if extra is None:
+            raise KeyError(name)
+        return extra[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in _KNOWN:
+            return getattr(self._record, name, default)
+        extra = self._record._extra
+        return default if extra is None else extra.get(name, default)
+
+    def __iter__(self) -> Iterator[str]:
+        record = self._record
+        for name in PRODUCT_ATTRIBUTES:
+            if hasattr(record, name):
+                yield name
+        if record._extra:
+            yield from record._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ProductRecord(Mapping):
+    """One product entry (id, type, attributes) stored in slots"""
+
+    __slots__ = ("id", "type", "_extra") + PRODUCT_ATTRIBUTES
+
+    def __init__(self, id: str, type: Optional[str], attributes: Dict[str, Any]):
+        self.id = id
+        self.type = _share(type) if type is not None else None
+        extra = None
+        for name, value in attributes.items():
+            if name in SHARED_VALUE_ATTRIBUTES or isinstance(value, (list, dict)):
+                value = _compact(value)
+            if name in _KNOWN:
+                setattr(self, name, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+        self._extra = extra
+
+    @classmethod
+    def from_entry(cls, entry: Any) -> Any:
+        """Build a record from a decoded entry; other shapes pass through"""
+        if (
+            isinstance(entry, dict)
+            and isinstance(entry.get("attributes"), dict)
+            and "id" in entry
+            and entry.keys() <= _ENTRY_KEYS
+        ):
+            return cls(entry["id"], entry.get("type"), entry["attributes"])
+        return entry
+
+    @property
+    def attributes(self) -> ProductAttributes:
+        return ProductAttributes(self)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "id":
+            return self.id
+        if key == "attributes":
+            return ProductAttributes(self)
+        if key == "type" and self.type is not None:
+            return self.type
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield "id"
+        if self.type is not None:
+            yield "type"
+        yield "attributes"
+
+    def __len__(self) -> int:
+        return 3 if self.type is not None else 2
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON:API dict for this product"""
+        entry: Dict[str, Any] = {"id": self.id}
+        if self.type is not None:
+            entry["type"] = self.type
+        entry["attributes"] = dict(ProductAttributes(self))
+        return entry
+
+    def __repr__(self) -> str:
+        return f"ProductRecord({self.to_dict()!r})"
+
+
+def to_json(value: Any) -> Any:
+    """``json.dumps(default=...)`` hook that encodes records as plain dicts"""
+    if isinstance(value, ProductRecord):
+        return value.to_dict()
+    if isinstance(value, ProductAttributes):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,83 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from pydantic import Field, field_validator
+
+from models.fields import parse_list
+from models.requests.output_options import FieldList, OutputOptions
+
+
+class AnalyzeProductsRequest(OutputOptions):
+    filters: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description='Column filters, e.g. {"price": {"min": 10, "max": 40}, '
+        '"seller_type": ["FBA", "FBM"], "category": "Grocery & Gourmet Food"}',
+    )
+    marketplace: Optional[str] = Field(
+        default=None, description="Only analyze products from this marketplace"
+    )
+    group_by: Optional[str] = Field(
+        default=None,
+        description="String column to group by (category, seller_type, brand, ...)",
+    )
+    metrics: Optional[List[str]] = Field(
+        default=None,
+        description="Numeric columns to summarize (default price, "
+        "approximate_30_day_revenue, reviews, rating)",
+    )
+    percentiles: Optional[List[float]] = Field(
+        default=None, description="Percentiles to report (default 25, 50, 75, 90)"
+    )
+    top_k: int = Field(
+        default=0, description="Also return the top k matching products by sort_by"
+    )
+    sort_by: str = Field(
+        default="approximate_30_day_revenue",
+        description="Numeric column that ranks the top_k products",
+    )
+    ascending: bool = Field(
+        default=False, description="Rank top_k products lowest first"
+    )
+    fields: FieldList = Field(
+        default=None,
+        description="Summary columns to return (e.g. count, price_p50); all "
+        "columns when omitted",
+    )
+
+    @field_validator("filters", mode="before")
+    @classmethod
+    def parse_filters(cls, v):
+        """Parse filters given as a JSON string"""
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+    @field_validator("metrics", mode="before")
+    @classmethod
+    def parse_metrics(cls, v):
+        """Accept a JSON list, a comma-separated string or a single column"""
+        if isinstance(v, str) and "," in v and not v.startswith("["):
+            return [name.strip() for name in v.split(",") if name.strip()]
+        return parse_list(v)
+
+    @field_validator("percentiles", mode="before")
+    @classmethod
+    def parse_percentiles(cls, v):
+        """Accept a JSON list or a comma-separated string of numbers"""
+        if isinstance(v, str) and not v.startswith("["):
+            return [float(q) for q in v.split(",") if q.strip()]
+        return parse_list(v)
+
+    @field_validator("percentiles")
+    @classmethod
+    def check_percentiles(cls, v):
+        """Percentiles must lie between 0 and 100"""
+        if v and any(not 0 <= q <= 100 for q in v):
+            raise ValueError("Percentiles must be between 0 and 100")
+        return v
+
+    @field_validator("marketplace", "group_by", mode="before")
+    @classmethod
+    def normalize_lowercase(cls, v):
+        """Normalize column names and marketplaces to lowercase"""
+        return v.lower() if isinstance(v, str) else v
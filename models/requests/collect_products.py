@@ -0,0 +1,19 @@
+from pydantic import Field, field_validator
+
+from config.constants import COLLECT_PRODUCTS_MAX
+from models.requests.product_search import ProductSearchRequest
+
+
+class CollectProductsRequest(ProductSearchRequest):
+    page: int = Field(default=1, description="Page number to start collecting from")
+    max_results: int = Field(
+        default=100,
+        description="Maximum number of products to collect "
+        f"(up to {COLLECT_PRODUCTS_MAX})",
+    )
+
+    @field_validator("max_results")
+    @classmethod
+    def clamp_max_results(cls, v):
+        """Keep max_results between 1 and COLLECT_PRODUCTS_MAX"""
+        return max(1, min(int(v), COLLECT_PRODUCTS_MAX))
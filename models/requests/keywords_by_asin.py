@@ -0,0 +1,67 @@
+from config.constants import KEYWORDS_BY_ASIN_MAX_RESULTS
+from models.fields import FieldSpec, attribute_plan, table_model
+from models.requests.output_options import OutputOptions
+
+
+def uppercase_unique(values):
+    """Uppercase ASINs and drop blanks and repeats, keeping the first order"""
+    if values is None:
+        return None
+    asins = (str(v).strip().upper() for v in values)
+    return list(dict.fromkeys(asin for asin in asins if asin))
+
+
+# keywords_by_asin_query parameters; `asins` is split into per-request
+# chunks by the API client, so it is not sent as a single attribute
+KEYWORDS_BY_ASIN_FIELDS = (
+    FieldSpec(
+        "asins",
+        "list",
+        "ASINs to find ranking keywords for (any number; chunked automatically)",
+        attribute=False,
+        transform=uppercase_unique,
+        required=True,
+    ),
+    FieldSpec(
+        "marketplace",
+        "lowercase",
+        "Marketplace (US, CA, UK, DE, FR, IT, ES, JP, IN, MX, AU, BR)",
+        default="us",
+        attribute=False,
+    ),
+    FieldSpec(
+        "max_results",
+        "int",
+        f"Maximum number of keywords to return (up to {KEYWORDS_BY_ASIN_MAX_RESULTS})",
+        default=KEYWORDS_BY_ASIN_MAX_RESULTS,
+        attribute=False,
+    ),
+    FieldSpec("include_variants", "bool", "Include keywords of the ASINs' variants"),
+    # Search volume, word count and competition ranges
+    FieldSpec(
+        "min_monthly_search_volume_exact", "int", "Minimum exact-match search volume"
+    ),
+    FieldSpec(
+        "max_monthly_search_volume_exact", "int", "Maximum exact-match search volume"
+    ),
+    FieldSpec(
+        "min_monthly_search_volume_broad", "int", "Minimum broad-match search volume"
+    ),
+    FieldSpec(
+        "max_monthly_search_volume_broad", "int", "Maximum broad-match search volume"
+    ),
+    FieldSpec("min_word_count", "int", "Minimum number of words in the keyword"),
+    FieldSpec("max_word_count", "int", "Maximum number of words in the keyword"),
+    FieldSpec("min_organic_product_count", "int", "Minimum number of organic results"),
+    FieldSpec("max_organic_product_count", "int", "Maximum number of organic results"),
+)
+
+KEYWORDS_BY_ASIN_ATTRIBUTES = attribute_plan(KEYWORDS_BY_ASIN_FIELDS)
+
+KeywordsByAsinRequest = table_model(
+    "KeywordsByAsinRequest",
+    KEYWORDS_BY_ASIN_FIELDS,
+    base=OutputOptions,
+    module=__name__,
+    doc="Ranking keywords for a list of ASINs, merged across chunked requests",
+)
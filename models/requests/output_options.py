@@ -0,0 +1,60 @@
+import json
+from typing import Annotated, List, Literal, Optional
+
+from pydantic import BaseModel, BeforeValidator, Field
+
+
+def normalize_output_format(v):
+    """Normalize output format to lowercase"""
+    if v is None:
+        return "json"
+    if isinstance(v, str):
+        return v.lower()
+    return v
+
+
+def parse_fields(v):
+    """Parse fields given as a JSON list or a comma-separated string"""
+    if isinstance(v, str):
+        try:
+            parsed = json.loads(v)
+            if isinstance(parsed, list):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+        return [field.strip() for field in v.split(",") if field.strip()]
+    return v
+
+
+# The validators travel with the annotations so the tool input schemas built
+# from these fields (see tools.handlers.tool_signature) accept the same input
+OutputFormat = Annotated[
+    Literal["json", "json_compact", "ndjson", "csv", "markdown"],
+    BeforeValidator(normalize_output_format),
+]
+FieldList = Annotated[Optional[List[str]], BeforeValidator(parse_fields)]
+
+
+class OutputOptions(BaseModel):
+    """Presentation options shared by tools; never forwarded to the API"""
+
+    output_format: OutputFormat = Field(
+        default="json",
+        description="Output format: json, json_compact, ndjson, csv or markdown table",
+    )
+    fields: FieldList = Field(
+        default=None,
+        description="Attributes to return for each row (e.g. title, price, rating "
+        "for products); all attributes when omitted",
+    )
+    since_last: bool = Field(
+        default=False,
+        description="Return only the rows added, removed or changed since the "
+        "last run of the same query (changed rows: only the differing attributes)",
+    )
+    as_handle: bool = Field(
+        default=False,
+        description="Keep the full result on the server and return a handle "
+        "with a summary; read it in slices through the results:// resources "
+        "or read_result (single-worker servers only)",
+    )
@@ -1,164 +1,69 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from config.constants import PRODUCT_SEARCH_LIMIT
+from models.fields import FieldSpec, attribute_plan, lowercase_items, table_model
+from models.requests.output_options import OutputOptions
 
-
-class ProductSearchRequest(BaseModel):
-    marketplace: str = Field(
+# Single source of truth for the product_database_query parameters: drives
+# request validation, coercion and the API attributes body
+PRODUCT_SEARCH_FIELDS = (
+    FieldSpec(
+        "marketplace",
+        "lowercase",
+        "Marketplace (US, CA, UK, DE, FR, IT, ES, JP, IN, MX, AU, BR)",
         default="us",
-        description="Marketplace (US, CA, UK, DE, FR, IT, ES, JP, IN, MX, AU, BR)",
-    )
-    page: int = Field(default=1, description="Page number for pagination")
-
+        attribute=False,
+    ),
+    FieldSpec("page", "int", "Page number for pagination", default=1, attribute=False),
     # Product tiers and seller types
-    product_tiers: Optional[List[str]] = Field(
-        default=None,
-        description="Product tiers to include (oversize, standard, etc.)"
-    )
-    seller_types: Optional[List[str]] = Field(
-        default=None,
-        description="Seller types to include (amz, fba, fbm)"
-    )
-
+    FieldSpec(
+        "product_tiers", "list", "Product tiers to include (oversize, standard, etc.)"
+    ),
+    FieldSpec(
+        "seller_types",
+        "list",
+        "Seller types to include (amz, fba, fbm)",
+        transform=lowercase_items,
+    ),
     # Keyword filtering
-    include_keywords: Optional[List[str]] = Field(
-        default=None,
-        description="Keywords that must be included in product listings"
-    )
-    exclude_keywords: Optional[List[str]] = Field(
-        default=None,
-        description="Keywords to exclude from product listings"
-    )
-
+    FieldSpec(
+        "include_keywords", "list", "Keywords that must be included in product listings"
+    ),
+    FieldSpec("exclude_keywords", "list", "Keywords to exclude from product listings"),
     # Exclusion flags
-    exclude_top_brands: Optional[bool] = Field(
-        default=None,
-        description="Whether to exclude top brands"
-    )
-    exclude_unavailable_products: Optional[bool] = Field(
-        default=None,
-        description="Whether to exclude unavailable products"
-    )
-
+    FieldSpec("exclude_top_brands", "bool", "Whether to exclude top brands"),
+    FieldSpec(
+        "exclude_unavailable_products",
+        "bool",
+        "Whether to exclude unavailable products",
+    ),
     # Price ranges
-    min_price: Optional[float] = Field(
-        default=None,
-        description="Minimum price filter"
-    )
-    max_price: Optional[float] = Field(
-        default=None,
-        description="Maximum price filter"
-    )
-    min_net: Optional[float] = Field(
-        default=None,
-        description="Minimum net price filter"
-    )
-    max_net: Optional[float] = Field(
-        default=None,
-        description="Maximum net price filter"
-    )
-
+    FieldSpec("min_price", "float", "Minimum price filter"),
+    FieldSpec("max_price", "float", "Maximum price filter"),
+    FieldSpec("min_net", "float", "Minimum net price filter"),
+    FieldSpec("max_net", "float", "Maximum net price filter"),
     # Ranking ranges
-    min_rank: Optional[int] = Field(
-        default=None,
-        description="Minimum rank filter"
-    )
-    max_rank: Optional[int] = Field(
-        default=None,
-        description="Maximum rank filter"
-    )
-
+    FieldSpec("min_rank", "int", "Minimum rank filter"),
+    FieldSpec("max_rank", "int", "Maximum rank filter"),
     # Sales metrics
-    min_sales: Optional[int] = Field(
-        default=None,
-        description="Minimum sales filter"
-    )
-    max_sales: Optional[int] = Field(
-        default=None,
-        description="Maximum sales filter"
-    )
-    min_revenue: Optional[float] = Field(
-        default=None,
-        description="Minimum revenue filter"
-    )
-    max_revenue: Optional[float] = Field(
-        default=None,
-        description="Maximum revenue filter"
-    )
-
+    FieldSpec("min_sales", "int", "Minimum sales filter"),
+    FieldSpec("max_sales", "int", "Maximum sales filter"),
+    FieldSpec("min_revenue", "float", "Minimum revenue filter"),
+    FieldSpec("max_revenue", "float", "Maximum revenue filter"),
     # Review metrics
-    min_reviews: Optional[int] = Field(
-        default=None,
-        description="Minimum number of reviews filter"
-    )
-    max_reviews: Optional[int] = Field(
-        default=None,
-        description="Maximum number of reviews filter"
-    )
-    min_rating: Optional[float] = Field(
-        default=None,
-        description="Minimum rating filter (1-5 scale)"
-    )
-    max_rating: Optional[float] = Field(
-        default=None,
-        description="Maximum rating filter (1-5 scale)"
-    )
-
+    FieldSpec("min_reviews", "int", "Minimum number of reviews filter"),
+    FieldSpec("max_reviews", "int", "Maximum number of reviews filter"),
+    FieldSpec("min_rating", "float", "Minimum rating filter (1-5 scale)"),
+    FieldSpec("max_rating", "float", "Maximum rating filter (1-5 scale)"),
     # Weight ranges
-    min_weight: Optional[float] = Field(
-        default=None,
-        description="Minimum weight filter"
-    )
-    max_weight: Optional[float] = Field(
-        default=None,
-        description="Maximum weight filter"
-    )
-
-    @field_validator('marketplace')
-    @classmethod
-    def normalize_marketplace(cls, v):
-        """Normalize marketplace to lowercase"""
-        if v is None:
-            return "us"
-        return v.lower()
-
-    @field_validator('page', 'min_rank', 'max_rank', 'min_sales', 'max_sales', 'min_reviews', 'max_reviews')
-    @classmethod
-    def parse_int_fields(cls, v):
-        """Parse integer fields that might come as strings"""
-        if v is None:
-            return v
-        if isinstance(v, int):
-            return v
-        if isinstance(v, str):
-            try:
-                return int(float(v))
-            except (ValueError, TypeError):
-                return v
-        return v
+    FieldSpec("min_weight", "float", "Minimum weight filter"),
+    FieldSpec("max_weight", "float", "Maximum weight filter"),
+)
 
-    @field_validator('min_price', 'max_price', 'min_net', 'max_net', 'min_revenue', 'max_revenue', 'min_rating', 'max_rating', 'min_weight', 'max_weight')
-    @classmethod
-    def parse_float_fields(cls, v):
-        """Parse float fields that might come as strings"""
-        if v is None:
-            return v
-        if isinstance(v, (int, float)):
-            return float(v)
-        if isinstance(v, str):
-            try:
-                return float(v)
-            except (ValueError, TypeError):
-                return v
-        return v
+PRODUCT_SEARCH_ATTRIBUTES = attribute_plan(PRODUCT_SEARCH_FIELDS)
 
-    @field_validator('exclude_top_brands', 'exclude_unavailable_products')
-    @classmethod
-    def parse_bool_fields(cls, v):
-        """Parse boolean fields that might come as strings"""
-        if v is None:
-            return v
-        if isinstance(v, bool):
-            return v
-        if isinstance(v, str):
-            return v.lower() in ('true', '1', 'yes', 'on')
-        return bool(v)
+ProductSearchRequest = table_model(
+    "ProductSearchRequest",
+    PRODUCT_SEARCH_FIELDS,
+    base=OutputOptions,
+    module=__name__,
+    doc=f"Product database search ({PRODUCT_SEARCH_LIMIT} results per page)",
+)
@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from pydantic import Field, field_validator, model_validator
+
+from config.constants import SALES_ESTIMATES_DEFAULT_DAYS, SALES_ESTIMATES_MAX_DAYS
+from models.requests.output_options import OutputOptions
+
+
+class SalesEstimatesRequest(OutputOptions):
+    asin: str = Field(description="ASIN to get daily sales estimates for")
+    marketplace: str = Field(
+        default="us",
+        description="Marketplace (US, CA, UK, DE, FR, IT, ES, JP, IN, MX, AU, BR)",
+    )
+    start_date: Optional[date] = Field(
+        default=None,
+        description="First day (YYYY-MM-DD); defaults to "
+        f"{SALES_ESTIMATES_DEFAULT_DAYS} days before end_date",
+    )
+    end_date: Optional[date] = Field(
+        default=None, description="Last day (YYYY-MM-DD); defaults to yesterday"
+    )
+
+    @field_validator("asin")
+    @classmethod
+    def normalize_asin(cls, v):
+        """ASINs are case-insensitive; the API uses uppercase"""
+        v = v.strip().upper()
+        if not v:
+            raise ValueError("asin must not be empty")
+        return v
+
+    @field_validator("marketplace")
+    @classmethod
+    def normalize_marketplace(cls, v):
+        """Normalize marketplace to lowercase"""
+        return v.strip().lower()
+
+    @model_validator(mode="after")
+    def fill_date_window(self):
+        """Default to the last SALES_ESTIMATES_DEFAULT_DAYS complete days"""
+        today = datetime.now(timezone.utc).date()
+        if self.end_date is None:
+            self.end_date = today - timedelta(days=1)
+        if self.start_date is None:
+            self.start_date = self.end_date - timedelta(
+                days=SALES_ESTIMATES_DEFAULT_DAYS - 1
+            )
+        if self.end_date > today:
+            raise ValueError("end_date must not be in the future")
+        if self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date")
+        if (self.end_date - self.start_date).days >= SALES_ESTIMATES_MAX_DAYS:
+            raise ValueError(
+                f"The date window is limited to {SALES_ESTIMATES_MAX_DAYS} days"
+            )
+        return self
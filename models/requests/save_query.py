@@ -0,0 +1,33 @@
+import json
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from config.constants import SAVED_QUERY_MIN_INTERVAL
+
+
+class SaveQueryRequest(BaseModel):
+    name: str = Field(description="Name of the saved query")
+    query: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="search_products arguments to keep warm (marketplace, page, "
+        "seller_types, min_price, ...)",
+    )
+    refresh_minutes: float = Field(
+        default=60, description="How often to refresh the result in the background"
+    )
+    remove: bool = Field(default=False, description="Delete the saved query instead")
+
+    @field_validator("query", mode="before")
+    @classmethod
+    def parse_query(cls, v):
+        """Parse a query given as a JSON string"""
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+    @field_validator("refresh_minutes")
+    @classmethod
+    def enforce_min_interval(cls, v):
+        """Refresh no more often than SAVED_QUERY_MIN_INTERVAL"""
+        return max(v, SAVED_QUERY_MIN_INTERVAL / 60)
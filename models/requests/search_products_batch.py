@@ -0,0 +1,44 @@
+import json
+from typing import Any, Dict, List
+
+from pydantic import Field, field_validator
+
+from config.constants import BATCH_CONCURRENCY, BATCH_MAX_QUERIES
+from models.requests.output_options import OutputOptions
+
+
+class SearchProductsBatchRequest(OutputOptions):
+    queries: List[Dict[str, Any]] = Field(
+        description="List of search_products queries (same filters as "
+        "search_products); an optional, unique 'label' names each query's result",
+    )
+    concurrency: int = Field(
+        default=BATCH_CONCURRENCY,
+        description="How many queries to run at the same time",
+    )
+
+    @field_validator("queries", mode="before")
+    @classmethod
+    def parse_queries(cls, v):
+        """Parse queries given as a JSON string and enforce the batch size"""
+        if isinstance(v, str):
+            v = json.loads(v)
+        if isinstance(v, list) and len(v) > BATCH_MAX_QUERIES:
+            raise ValueError(f"At most {BATCH_MAX_QUERIES} queries per batch")
+        return v
+
+    @field_validator("queries")
+    @classmethod
+    def reject_duplicate_labels(cls, v):
+        """Labels key the results, so two queries can't share one"""
+        labels = [str(q["label"]) for q in v if q.get("label") is not None]
+        duplicates = sorted({label for label in labels if labels.count(label) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate query labels: {', '.join(duplicates)}")
+        return v
+
+    @field_validator("concurrency")
+    @classmethod
+    def clamp_concurrency(cls, v):
+        """Keep concurrency between 1 and BATCH_MAX_QUERIES"""
+        return max(1, min(v, BATCH_MAX_QUERIES))
@@ -4,24 +4,312 @@ Jungle Scout MCP Server for MCP Installer
 
 This file exports a global FastMCP instance that can be used by the MCP installer
 while keeping the server modules separated.
+
+Startup only imports what is needed to answer ``initialize`` and list tools:
+the API client (httpx stack, caches, request models, numpy) is built on the
+first tool call, so per-session stdio launches start quickly.
+
+Run with ``--transport streamable-http --workers N`` to serve many agents
+from one port; workers share the response cache, the upstream rate budget
+and in-flight requests through JUNGLE_SCOUT_SHARED_STATE.
 """
 
+import argparse
+import importlib.util
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
 from mcp.server import FastMCP
-from config.env import get_api_key, get_api_key_id
-from api.jungle_scout import JungleScoutAPI
+
+from api.lazy_client import LazyAPIClient
+from config.env import get_secrets
+from config.logging_config import setup_logging
+from tools.analyze_products import create_analyze_products_tool
+from tools.collect_products import create_collect_products_tool
+from tools.keywords_by_asin import create_keywords_by_asin_tool
+from tools.list_saved_queries import create_list_saved_queries_tool
 from tools.product_search import create_search_products_tool
+from tools.result_handles import create_read_result_tool, create_result_resources
+from tools.sales_estimates import create_sales_estimates_tool
+from tools.save_query import create_save_query_tool
+from tools.search_products_batch import create_search_products_batch_tool
+from tools.server_stats import create_server_stats_tool
+
+# Log to stderr (or JUNGLE_SCOUT_LOG_FILE); stdout belongs to the stdio transport
+setup_logging(secrets=get_secrets())
+
+
+def build_api_client():
+    """Validate the environment and build the API client with its caches"""
+    from api.cache import ResponseCache
+    from api.credentials import CredentialPool
+    from api.jungle_scout import JUNGLE_SCOUT_API_BASE, JungleScoutAPI
+    from api.query_engine import LocalQueryEngine
+    from api.rate_limit import RateLimiter
+    from api.resilience import CircuitBreaker, HedgePolicy
+    from api.result_store import ResultStore
+    from api.saved_queries import SavedQueries
+    from api.snapshots import SnapshotStore
+    from config.constants import RATE_LIMIT_BURST
+    from config.env import (
+        get_api_base_url,
+        get_cache_path,
+        get_cache_ttl,
+        get_cassette_path,
+        get_circuit_breaker_enabled,
+        get_credentials,
+        get_hedge_budget,
+        get_hedge_percentile,
+        get_http2_enabled,
+        get_rate_limit,
+        get_replay_latency_scale,
+        get_result_spill_dir,
+        get_saved_queries_path,
+        get_shared_state_url,
+        get_snapshot_path,
+        get_upstream_mode,
+        get_workers,
+    )
+
+    # Each key of a pool has its own budget, so the overall budget scales
+    keys = get_credentials()
+    credentials = None
+    rate, burst = get_rate_limit(), RATE_LIMIT_BURST
+    if len(keys) > 1:
+        credentials = CredentialPool.from_keys(keys, rate=rate, burst=burst)
+        rate, burst = rate * len(keys), burst * len(keys)
+
+    # State shared with other worker processes, when configured
+    global shared_state
+    shared_state_url = get_shared_state_url()
+    if shared_state_url:
+        from api.shared_state import SharedState
+
+        shared_state = SharedState(shared_state_url, rate=rate, burst=burst)
+
+    # Opt-in: hedge slow reads, and fail fast while the API is failing
+    hedge_percentile = get_hedge_percentile()
+    hedge_policy = None
+    if hedge_percentile is not None:
+        hedge_policy = HedgePolicy(
+            percentile=hedge_percentile, budget_ratio=get_hedge_budget()
+        )
+    circuit_breaker = CircuitBreaker() if get_circuit_breaker_enabled() else None
+
+    # Initialize response cache (disabled when the TTL is 0)
+    cache_ttl = get_cache_ttl()
+    response_cache = None
+    if cache_ttl > 0:
+        response_cache = ResponseCache(
+            ttl=cache_ttl,
+            path=get_cache_path(),
+            backend=shared_state.cache_backend if shared_state else None,
+            # Expired results are the fallback while the circuit is open
+            keep_stale=circuit_breaker is not None,
+        )
+    # Refinements of fully fetched queries are answered locally for the same TTL
+    query_engine = LocalQueryEngine(ttl=cache_ttl) if cache_ttl > 0 else None
+
+    # Every fetched product also lands in the columnar store (needs numpy)
+    product_store = None
+    if numpy_installed:
+        from api.product_store import ProductStore
+
+        product_store = ProductStore()
+
+    _, key_id, api_key = keys[0]
+    return JungleScoutAPI(
+        api_key,
+        key_id,
+        base_url=get_api_base_url() or JUNGLE_SCOUT_API_BASE,
+        http2=get_http2_enabled(),
+        cache=response_cache,
+        rate_limiter=RateLimiter(
+            rate=rate,
+            burst=burst,
+            bucket=shared_state.bucket if shared_state else None,
+        ),
+        query_engine=query_engine,
+        product_store=product_store,
+        shared_flight=shared_state.flight if shared_state else None,
+        saved_queries=SavedQueries(path=get_saved_queries_path()),
+        credentials=credentials,
+        # Handles live in one process, so they can't span HTTP workers
+        result_store=ResultStore(
+            spill_dir=get_result_spill_dir(), enabled=get_workers() == 1
+        ),
+        # since_last must see the snapshot whichever worker took it
+        snapshots=SnapshotStore(
+            path=get_snapshot_path()
+            or (shared_state.snapshot_path if shared_state else None)
+        ),
+        hedge_policy=hedge_policy,
+        circuit_breaker=circuit_breaker,
+        upstream_mode=get_upstream_mode(),
+        cassette_path=get_cassette_path(),
+        replay_latency_scale=get_replay_latency_scale(),
+    )
+
+
+# Found without importing it; numpy itself loads with the API client
+numpy_installed = importlib.util.find_spec("numpy") is not None
+
+# Initialize API client (built on first tool call)
+api_client = LazyAPIClient(build_api_client)
+shared_state = None
+
+
+async def close_api_client() -> None:
+    """Close the shared HTTP connection pool and cache, if they were built"""
+    if api_client.built:
+        await api_client.aclose()
+        if api_client.cache is not None:
+            api_client.cache.close()
+        api_client.result_store.close()
+        api_client.snapshots.close()
+        if shared_state is not None:
+            shared_state.close()
+
+
+# Over HTTP every request runs its own MCP session, so the client must
+# outlive sessions and is closed with the app instead
+close_with_session = True
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the API client when the (stdio) session ends"""
+    try:
+        yield
+    finally:
+        if close_with_session:
+            await close_api_client()
 
-# Initialize API client
-api_client = JungleScoutAPI(get_api_key(), get_api_key_id())
 
 # Create global FastMCP instance for MCP installer
-mcp = FastMCP("jungle-scout-mcp")
+mcp = FastMCP("jungle-scout-mcp", lifespan=lifespan)
 
 # Create and register the search_products tool
 search_products_tool = create_search_products_tool(api_client)
 mcp.tool()(search_products_tool)
 
+# Create and register the collect_products tool
+collect_products_tool = create_collect_products_tool(api_client)
+mcp.tool()(collect_products_tool)
+
+# Create and register the search_products_batch tool
+search_products_batch_tool = create_search_products_batch_tool(api_client)
+mcp.tool()(search_products_batch_tool)
+
+# Create and register the get_sales_estimates tool
+sales_estimates_tool = create_sales_estimates_tool(api_client)
+mcp.tool()(sales_estimates_tool)
+
+# Create and register the keywords_by_asin tool
+keywords_by_asin_tool = create_keywords_by_asin_tool(api_client)
+mcp.tool()(keywords_by_asin_tool)
+
+# Create and register the analyze_products tool (only when numpy is installed)
+if numpy_installed:
+    analyze_products_tool = create_analyze_products_tool(api_client)
+    mcp.tool()(analyze_products_tool)
+
+# Create and register the saved query tools
+save_query_tool = create_save_query_tool(api_client)
+mcp.tool()(save_query_tool)
+list_saved_queries_tool = create_list_saved_queries_tool(api_client)
+mcp.tool()(list_saved_queries_tool)
+
+# Register the result handle resources and the read_result tool
+result_summary_resource, result_view_resource = create_result_resources(api_client)
+mcp.resource(
+    "results://{handle}",
+    name="result",
+    description="Summary of a result stored with as_handle",
+    mime_type="application/json",
+)(result_summary_resource)
+mcp.resource(
+    "results://{handle}/{view}",
+    name="result_rows",
+    description="Rows of a stored result: rows?offset=0&limit=50"
+    "&sort=-price&fields=title,price&format=csv",
+)(result_view_resource)
+read_result_tool = create_read_result_tool(api_client)
+mcp.tool()(read_result_tool)
+
+# Create and register the get_server_stats tool
+server_stats_tool = create_server_stats_tool(api_client)
+mcp.tool()(server_stats_tool)
+
+
+def create_http_app():
+    """ASGI app for the HTTP transports (uvicorn factory, one per worker)"""
+    from config.env import get_transport
+
+    global close_with_session
+    close_with_session = False
+    if get_transport() == "sse":
+        app = mcp.sse_app()
+    else:
+        # Stateless, so any worker can answer any request of any agent
+        mcp.settings.stateless_http = True
+        mcp.settings.json_response = True
+        app = mcp.streamable_http_app()
+
+    session_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def app_lifespan(app):
+        async with session_lifespan(app):
+            try:
+                yield
+            finally:
+                await close_api_client()
+
+    app.router.lifespan_context = app_lifespan
+    return app
+
+
+def main(argv=None):
+    from config.env import get_http_host, get_http_port, get_transport, get_workers
+
+    parser = argparse.ArgumentParser(description="Jungle Scout MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "sse", "streamable-http"),
+        default=get_transport(),
+    )
+    parser.add_argument("--host", default=get_http_host())
+    parser.add_argument("--port", type=int, default=get_http_port())
+    parser.add_argument("--workers", type=int, default=get_workers())
+    args = parser.parse_args(argv)
+
+    if args.transport == "stdio":
+        # Initialize and run the server
+        mcp.run(transport="stdio")
+        return
+
+    if args.transport == "sse" and args.workers > 1:
+        parser.error("SSE sessions live in one process; use streamable-http")
+
+    import uvicorn
+
+    # Worker processes read their configuration from the environment
+    os.environ["JUNGLE_SCOUT_TRANSPORT"] = args.transport
+    os.environ["JUNGLE_SCOUT_WORKERS"] = str(args.workers)
+    if args.workers > 1 and not os.getenv("JUNGLE_SCOUT_SHARED_STATE"):
+        path = os.path.join(tempfile.gettempdir(), f"jungle-scout-mcp-{args.port}.db")
+        os.environ["JUNGLE_SCOUT_SHARED_STATE"] = f"sqlite:///{path}"
+    uvicorn.run(
+        "server:create_http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+    )
+
 
 if __name__ == "__main__":
-    # Initialize and run the server
-    mcp.run(transport="stdio")
+    main()
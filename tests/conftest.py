@@ -0,0 +1,53 @@
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from api.jungle_scout import JungleScoutAPI
+from api.rate_limit import RateLimiter
+from config.constants import RATE_LIMIT_CONCURRENCY_INITIAL
+
+
+@pytest.fixture
+def make_api_client():
+    """Factory for a JungleScoutAPI answered by an in-process upstream
+
+    `upstream` is a request handler (sync or async) or an httpx transport.
+    The rate limiter allows far more than any test sends, so client-side
+    pacing never shows up in timings; any JungleScoutAPI option, including
+    ``rate_limiter``, can be given to override the defaults.
+    """
+
+    def make(
+        upstream=None,
+        concurrency: int = RATE_LIMIT_CONCURRENCY_INITIAL,
+        api_key: str = "key",
+        key_id: str = "key-id",
+        **options,
+    ) -> JungleScoutAPI:
+        if upstream is not None and not isinstance(upstream, httpx.AsyncBaseTransport):
+            upstream = httpx.MockTransport(upstream)
+        options.setdefault(
+            "rate_limiter",
+            RateLimiter(rate=1000, burst=1000, initial_concurrency=concurrency),
+        )
+        return JungleScoutAPI(api_key, key_id, transport=upstream, **options)
+
+    return make
+
+
+@pytest.fixture
+def mcp_server():
+    """Factory for a FastMCP server exposing tool functions the way server.py does
+
+    Calls through a connected session (see
+    ``mcp.shared.memory.create_connected_server_and_client_session``) go
+    through the schema FastMCP derives from each tool's signature.
+    """
+
+    def make(*tools) -> FastMCP:
+        server = FastMCP("jungle-scout-test")
+        for tool in tools:
+            server.tool()(tool)
+        return server
+
+    return make
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import httpx
+
+from tools.search_products_batch import create_search_products_batch_tool
+
+
+def _upstream(calls, delay=0.05):
+    async def handler(request):
+        body = json.loads(request.content)
+        calls.append(body["data"]["attributes"])
+        await asyncio.sleep(delay)
+        price = body["data"]["attributes"].get("min_price")
+        return httpx.Response(200, json={"data": [{"id": f"us/B{price}"}]})
+
+    return handler
+
+
+def test_batch_dedupes_and_keys_results_by_label(make_api_client):
+    calls = []
+    api_client = make_api_client(_upstream(calls), concurrency=50)
+    queries = [
+        {"label": "cheap", "min_price": 10},
+        {"label": "cheap-again", "min_price": 10},
+        {"label": "mid", "min_price": 50},
+        {"min_price": 90},
+    ]
+
+    result = asyncio.run(api_client.search_products_batch(queries))
+
+    assert len(calls) == 3
+    assert set(result["results"]) == {"cheap", "cheap-again", "mid", '{"min_price":90}'}
+    assert result["results"]["cheap"] == result["results"]["cheap-again"]
+    assert result["meta"] == {"queries": 4, "unique_queries": 3, "errors": 0}
+
+
+def test_batch_reports_per_query_errors(make_api_client):
+    calls = []
+    api_client = make_api_client(_upstream(calls), concurrency=50)
+    queries = [{"label": "ok", "min_price": 10}, {"label": "bad", "min_price": "x"}]
+
+    result = asyncio.run(api_client.search_products_batch(queries))
+
+    assert result["results"]["ok"]["data"] == [{"id": "us/B10.0"}]
+    assert "ValueError" in result["results"]["bad"]["error"]
+    assert result["meta"]["errors"] == 1
+
+
+def test_batch_runs_queries_concurrently(make_api_client):
+    calls = []
+    api_client = make_api_client(_upstream(calls), concurrency=50)
+    tool = create_search_products_batch_tool(api_client)
+    queries = [{"label": str(i), "min_price": i} for i in range(20)]
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await tool(
+            queries=json.dumps(queries), concurrency=10, output_format="csv"
+        )
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(run())
+
+    lines = result.content[0].text.splitlines()
+    assert lines[0] == "query,id"
+    assert len(lines) == 21
+    # 20 queries x 50ms at concurrency 10 is ~2 rounds, not 20
+    assert elapsed < 0.5
+
+
+def test_batch_rejects_duplicate_labels(make_api_client):
+    calls = []
+    tool = create_search_products_batch_tool(make_api_client(_upstream(calls)))
+    queries = [
+        {"label": "cheap", "min_price": 10},
+        {"label": "cheap", "min_price": 20},
+        {"min_price": 30},
+    ]
+
+    result = asyncio.run(tool(queries=queries))
+
+    assert "Duplicate query labels: cheap" in result.content[0].text
+    assert calls == []
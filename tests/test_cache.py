@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+
+from api.cache import ResponseCache, canonical_json, make_cache_key
+from benchmarks.sample_data import make_response
+
+ENDPOINT = "/api/product_database_query"
+
+
+def test_entries_expire_after_the_ttl():
+    now = [0.0]
+    cache = ResponseCache(ttl=60, clock=lambda: now[0])
+    cache.set("a", {"data": 1})
+    cache.set("b", {"data": 2}, ttl=5)
+
+    now[0] = 59
+    assert cache.get("a") == {"data": 1}
+    assert cache.get("b") is None
+    now[0] = 60
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 2)
+    assert stats["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"data": 1})
+    cache.set("b", {"data": 2})
+    cache.get("a")  # b is now the least recently used
+    cache.set("c", {"data": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"data": 1} and cache.get("c") == {"data": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_survives_restarts_and_evicts_by_lru(tmp_path):
+    path = str(tmp_path / "cache.db")
+    now = [1000.0]
+    cache = ResponseCache(ttl=60, max_entries=2, path=path, clock=lambda: now[0])
+    cache.set("a", make_response(2))
+    cache.set("b", {"data": []})
+    cache.close()
+
+    restarted = ResponseCache(ttl=60, max_entries=2, path=path, clock=lambda: now[0])
+    assert restarted.get("a") == make_response(2)
+    restarted.set("c", {"data": []})
+    assert restarted.get("b") is None and len(restarted.backend) == 2
+
+    now[0] += 61
+    assert restarted.get("a") is None
+    restarted.close()
+
+
+def test_sqlite_cache_reads_do_not_write(tmp_path):
+    cache = ResponseCache(ttl=60, max_entries=2, path=str(tmp_path / "cache.db"))
+    cache.set("a", {"data": 1})
+    cache.set("b", {"data": 2})
+    changes = cache.backend._conn.total_changes
+
+    assert cache.get("a") == {"data": 1}
+    assert asyncio.run(cache.aget("a")) == {"data": 1}
+    assert cache.backend._conn.total_changes == changes
+
+    # The batched access time still makes "b" the least recently used
+    cache.set("c", {"data": 3})
+    assert cache.get("b") is None and cache.get("a") == {"data": 1}
+    cache.close()
+
+
+def test_equivalent_queries_share_a_canonical_key():
+    first = make_cache_key(
+        ENDPOINT,
+        {"min_price": 10.0, "seller_types": ["fbm", "fba"], "max_rank": None},
+        "US",
+        1,
+        50,
+    )
+    second = make_cache_key(
+        ENDPOINT, {"seller_types": ["fba", "fbm"], "min_price": 10}, "us", "1", 50
+    )
+    assert first == second
+    assert first != make_cache_key(ENDPOINT, {"min_price": 10}, "us", 2, 50)
+    assert canonical_json({"b": [2.0, 1], "a": None}) == '{"b":[1,2]}'
+
+
+def test_search_products_answers_equivalent_queries_from_the_cache(
+    make_api_client,
+):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=make_response(5))
+
+    api_client = make_api_client(handler, cache=ResponseCache(ttl=60))
+
+    async def run():
+        first = await api_client.search_products(
+            min_price="10", seller_types=["FBA", "FBM"]
+        )
+        second = await api_client.search_products(
+            min_price=10.0, seller_types='["fbm", "fba"]'
+        )
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second and len(calls) == 1
+    assert api_client.cache.stats()["hits"] == 1
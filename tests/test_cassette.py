@@ -0,0 +1,128 @@
+import asyncio
+import gzip
+import json
+import os
+
+import httpx
+import pytest
+
+from api.cassette import (
+    Cassette,
+    CassetteMissError,
+    make_transport,
+    request_fingerprint,
+)
+from benchmarks.mock_upstream import MockJungleScout
+
+
+async def _search(api_client, prices):
+    async with api_client:
+        return [
+            await api_client.search_products(min_price=price, page_size=5)
+            for price in prices
+        ]
+
+
+def test_replay_returns_recorded_responses_without_upstream_calls(
+    tmp_path, make_api_client
+):
+    path = str(tmp_path / "api.cassette")
+    mock = MockJungleScout(latency_ms=0, jitter_ms=0)
+    recorder = make_api_client(
+        mock.transport(), upstream_mode="record", cassette_path=path
+    )
+    recorded = asyncio.run(_search(recorder, range(5)))
+    assert mock.requests == 5
+
+    replayer = make_api_client(upstream_mode="replay", cassette_path=path)
+    replayed = asyncio.run(_search(replayer, range(5)))
+
+    assert replayed == recorded
+    assert mock.requests == 5
+    with pytest.raises(CassetteMissError):
+        replayer = make_api_client(upstream_mode="replay", cassette_path=path)
+        asyncio.run(_search(replayer, [99]))
+
+
+def test_compressed_responses_are_recorded_decoded(tmp_path, make_api_client):
+    path = str(tmp_path / "api.cassette")
+    body = json.dumps({"data": [], "meta": {"total_items": 0}}).encode()
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers={"Content-Encoding": "gzip"},
+            content=gzip.compress(body),
+        )
+
+    recorder = make_api_client(handler, upstream_mode="record", cassette_path=path)
+    recorded = asyncio.run(_search(recorder, [1]))
+    replayer = make_api_client(upstream_mode="replay", cassette_path=path)
+
+    assert asyncio.run(_search(replayer, [1])) == recorded
+    assert recorded[0]["data"] == []
+
+
+def test_client_reopens_the_cassette_after_aclose(tmp_path, make_api_client):
+    path = str(tmp_path / "api.cassette")
+    mock = MockJungleScout(latency_ms=0, jitter_ms=0)
+    recorder = make_api_client(
+        mock.transport(), upstream_mode="record", cassette_path=path
+    )
+    asyncio.run(_search(recorder, [1]))
+    asyncio.run(_search(recorder, [2]))  # After aclose: appended, not lost
+    replayer = make_api_client(upstream_mode="replay", cassette_path=path)
+    asyncio.run(_search(replayer, [1]))
+    asyncio.run(_search(replayer, [2]))
+
+    assert mock.requests == 2 and len(replayer.transport.cassette) == 2
+
+
+def test_fingerprint_ignores_credentials_and_key_order():
+    first = httpx.Request(
+        "POST",
+        "https://api.test/x?b=2&a=1",
+        headers={"Authorization": "one"},
+        json={"a": 1, "b": [1, 2]},
+    )
+    second = httpx.Request(
+        "POST",
+        "https://api.test/x?a=1&b=2",
+        headers={"Authorization": "two"},
+        content=b'{"b": [1, 2], "a": 1}',
+    )
+    assert request_fingerprint(first) == request_fingerprint(second)
+
+
+def test_unfinished_recordings_are_recovered_and_appended(tmp_path):
+    path = str(tmp_path / "api.cassette")
+    cassette = Cassette(path, writable=True)
+    cassette.add("one", 200, [], b"first", 0.1)
+    cassette.add("two", 200, [], b"second", 0.1)
+    cassette._file.flush()  # Killed before close: no index was written
+    cassette._file.write(b"\x40\x00")  # and a truncated entry
+
+    appended = Cassette(path, writable=True)
+    appended.add("one", 500, [], b"again", 0.2)
+    appended.close()
+    size = os.path.getsize(path)
+
+    replay = Cassette(path)
+    assert len(replay) == 3
+    # Repeated requests get the recordings in order, then the last repeats
+    assert [replay.lookup("one")[2] for _ in range(3)] == [
+        b"first",
+        b"again",
+        b"again",
+    ]
+    assert replay.lookup("two")[:3] == (200, [], b"second")
+    replay.close()
+    assert os.path.getsize(path) == size
+
+
+def test_unknown_mode_or_missing_cassette_is_rejected():
+    with pytest.raises(ValueError):
+        make_transport("rewind", "x.cassette")
+    with pytest.raises(ValueError):
+        make_transport("replay")
+    assert make_transport("live") is None
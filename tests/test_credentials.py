@@ -0,0 +1,146 @@
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from api.credentials import CredentialPool, parse_quota
+from api.rate_limit import RetryPolicy
+from config.env import _parse_key_list
+
+KEYS = [("a", "id-a", "secret-a"), ("b", "id-b", "secret-b"), ("c", "id-c", "secret-c")]
+
+
+@pytest.fixture
+def pooled_api_client(make_api_client):
+    def make(pool, handler):
+        return make_api_client(
+            handler,
+            concurrency=20,
+            api_key="secret-a",
+            key_id="id-a",
+            retry_policy=RetryPolicy(max_attempts=4, base_delay=0.001),
+            credentials=pool,
+        )
+
+    return make
+
+
+def test_parse_quota_and_key_list():
+    headers = {"x-ratelimit-limit": "300", "x-ratelimit-remaining": "12"}
+    assert parse_quota(headers) == (300, 12, None)
+    assert parse_quota({"ratelimit-reset": "30"}) == (None, None, 30.0)
+    assert _parse_key_list("main=id1:k1=, id2:k2") == [
+        ("main", "id1", "k1="),
+        ("key2", "id2", "k2"),
+    ]
+    with pytest.raises(ValueError):
+        _parse_key_list("missing-secret")
+
+
+def test_requests_go_to_the_key_with_most_remaining_quota(pooled_api_client):
+    remaining = {"id-a:secret-a": 50, "id-b:secret-b": 500, "id-c:secret-c": 5}
+    used = Counter()
+
+    def handler(request):
+        key = request.headers["Authorization"]
+        used[key] += 1
+        remaining[key] -= 1
+        headers = {"X-RateLimit-Remaining": str(remaining[key])}
+        return httpx.Response(200, headers=headers, json={"data": []})
+
+    pool = CredentialPool.from_keys(KEYS, rate=1000, burst=1000)
+    api_client = pooled_api_client(pool, handler)
+
+    async def run():
+        for price in range(12):
+            await api_client.search_products(min_price=price)
+
+    asyncio.run(run())
+
+    # Unknown quotas are probed once each, then the largest budget wins
+    assert used == {"id-a:secret-a": 1, "id-b:secret-b": 10, "id-c:secret-c": 1}
+
+
+def test_failing_key_is_benched_then_returns_after_cooldown(pooled_api_client):
+    used = Counter()
+    revoked = {"id-b:secret-b"}
+
+    def handler(request):
+        key = request.headers["Authorization"]
+        used[key] += 1
+        status = 401 if key in revoked else 200
+        return httpx.Response(status, json={"data": []})
+
+    now = [0.0]
+    pool = CredentialPool.from_keys(
+        KEYS[:2], rate=1000, burst=1000, cooldown=60, clock=lambda: now[0]
+    )
+    api_client = pooled_api_client(pool, handler)
+
+    async def run(count):
+        for price in range(count):
+            # Each call rotates to the least recently used key
+            now[0] += 1
+            await api_client.search_products(min_price=price + 100 * now[0])
+
+    asyncio.run(run(6))
+    # Every call succeeded: 401s were retried on the other key, and b was
+    # benched after its second 401
+    assert used["id-b:secret-b"] == 2
+    assert [c.cooldowns for c in pool.credentials] == [0, 1]
+    assert pool.stats()["healthy"] == 1
+
+    revoked.clear()
+    now[0] += 61
+    asyncio.run(run(4))
+    assert used["id-b:secret-b"] > 2
+    assert pool.stats()["healthy"] == 2
+
+
+def test_exhausted_quota_without_a_reset_is_retried_after_the_cooldown(
+    pooled_api_client,
+):
+    remaining = [0]
+
+    def handler(request):
+        headers = {"X-RateLimit-Limit": "10", "X-RateLimit-Remaining": "0"}
+        if remaining[0]:
+            headers["X-RateLimit-Remaining"] = str(remaining[0])
+        remaining[0] = 5  # Quota refilled after the first request
+        return httpx.Response(200, headers=headers, json={"data": []})
+
+    pool = CredentialPool.from_keys(KEYS[:1], rate=1000, burst=1000, cooldown=0.1)
+    api_client = pooled_api_client(pool, handler)
+
+    async def run():
+        await api_client.search_products(min_price=1)
+        start = time.perf_counter()
+        # The only key reported no quota left and no reset time
+        await asyncio.wait_for(api_client.search_products(min_price=2), timeout=5)
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.09
+    assert pool.stats()["per_key"][0]["remaining"] == 5
+
+
+def test_throughput_scales_with_the_number_of_keys(pooled_api_client):
+    def handler(request):
+        return httpx.Response(200, json={"data": []})
+
+    def elapsed(keys):
+        pool = CredentialPool.from_keys(keys, rate=100, burst=1)
+        api_client = pooled_api_client(pool, handler)
+
+        async def run():
+            await asyncio.gather(
+                *(api_client.search_products(min_price=price) for price in range(30))
+            )
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        return time.perf_counter() - start
+
+    one_key, three_keys = elapsed(KEYS[:1]), elapsed(KEYS)
+    assert one_key / three_keys > 2
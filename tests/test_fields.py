@@ -0,0 +1,64 @@
+import pytest
+from pydantic import ValidationError
+
+from models.fields import build_attributes, parse_int
+from models.requests.product_search import (
+    PRODUCT_SEARCH_ATTRIBUTES,
+    ProductSearchRequest,
+)
+
+RAW = {
+    "marketplace": "US",
+    "page": "2",
+    "seller_types": '["FBA", "Fbm"]',
+    "include_keywords": "organic",
+    "exclude_top_brands": "true",
+    "min_price": "20",
+    "min_rank": "5",
+    "min_rating": "4.5",
+}
+
+EXPECTED_ATTRIBUTES = {
+    "seller_types": ["fba", "fbm"],
+    "include_keywords": ["organic"],
+    "exclude_top_brands": True,
+    "min_price": 20.0,
+    "min_rank": 5,
+    "min_rating": 4.5,
+}
+
+
+def test_request_model_coerces_loose_input():
+    request = ProductSearchRequest(**RAW)
+
+    assert request.marketplace == "us"
+    assert request.page == 2
+    assert request.seller_types == ["fba", "fbm"]
+    assert request.include_keywords == ["organic"]
+    assert request.exclude_top_brands is True
+    assert request.min_rank == 5
+
+
+def test_model_and_direct_paths_build_the_same_attributes():
+    validated = ProductSearchRequest(**RAW).model_dump(exclude_none=True)
+
+    assert build_attributes(PRODUCT_SEARCH_ATTRIBUTES, validated) == EXPECTED_ATTRIBUTES
+    assert build_attributes(PRODUCT_SEARCH_ATTRIBUTES, RAW) == EXPECTED_ATTRIBUTES
+
+
+def test_invalid_numbers_are_rejected():
+    with pytest.raises(ValidationError):
+        ProductSearchRequest(min_price="cheap")
+    with pytest.raises(ValueError):
+        build_attributes(PRODUCT_SEARCH_ATTRIBUTES, {"min_price": "cheap"})
+
+
+def test_fractional_integers_are_rejected_not_truncated():
+    assert parse_int("5") == 5 and parse_int(5.0) == 5
+    for value in ("4.7", 4.7, "inf"):
+        with pytest.raises(ValueError):
+            parse_int(value)
+    with pytest.raises(ValidationError):
+        ProductSearchRequest(min_rank="4.7")
+    with pytest.raises(ValueError):
+        build_attributes(PRODUCT_SEARCH_ATTRIBUTES, {"min_rank": "4.7"})
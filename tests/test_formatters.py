@@ -0,0 +1,52 @@
+import json
+
+from tools.formatters import format_result, project_fields
+
+RESULT = {
+    "data": [
+        {
+            "id": "us/B000000001",
+            "type": "product_database_result",
+            "attributes": {"title": "Organic tea | green", "price": 12.5},
+        },
+        {
+            "id": "us/B000000002",
+            "type": "product_database_result",
+            "attributes": {"title": "Organic honey", "price": 20},
+        },
+    ],
+    "meta": {"total_items": 2},
+}
+
+
+def test_json_compact_round_trips_without_whitespace():
+    text = format_result(RESULT, "json_compact")
+    assert json.loads(text) == RESULT
+    assert ": " not in text and "\n" not in text
+
+
+def test_fields_projection_keeps_only_listed_attributes():
+    projected = project_fields(RESULT, ["price"])
+    assert projected["data"][0] == {
+        "id": "us/B000000001",
+        "type": "product_database_result",
+        "attributes": {"price": 12.5},
+    }
+    assert projected["meta"] == RESULT["meta"]
+
+
+def test_ndjson_emits_one_flat_row_per_product():
+    lines = format_result(RESULT, "ndjson", ["title", "price"]).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": "us/B000000001", "title": "Organic tea | green", "price": 12.5},
+        {"id": "us/B000000002", "title": "Organic honey", "price": 20},
+    ]
+
+
+def test_table_formats():
+    assert format_result(RESULT, "csv", ["price"]) == (
+        "id,price\nus/B000000001,12.5\nus/B000000002,20\n"
+    )
+    markdown = format_result(RESULT, "markdown", ["title"]).splitlines()
+    assert markdown[0] == "| id | title |"
+    assert markdown[2] == "| us/B000000001 | Organic tea \\| green |"
@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import anyio
+import httpx
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from tools.keywords_by_asin import create_keywords_by_asin_tool
+
+ASINS = [f"B{n:09d}" for n in range(25)]
+
+
+class KeywordsUpstream:
+    """keywords_by_asin_query: one keyword per ASIN plus a shared one, two pages
+
+    A keyword's search volume is its ASIN's number, and each chunk's pages
+    come back sorted by it (highest first), like the real endpoint.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handler(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            asins = json.loads(request.content)["data"]["attributes"]["asins"]
+            cursor = request.url.params.get("page[cursor]")
+            self.requests.append((tuple(asins), cursor))
+            if cursor is None:
+                volumes = {f"kw {asin.lower()}": int(asin[1:]) for asin in asins}
+                next_link = (
+                    "https://api.test/api/keywords/keywords_by_asin_query"
+                    f"?marketplace=us&page[size]=100&page[cursor]={asins[0]}"
+                )
+                links = {"next": next_link}
+            else:
+                volumes, links = {"shared keyword": 0}, {"next": None}
+            data = [
+                {
+                    "id": f"us/{name}",
+                    "type": "keywords_by_asin_result",
+                    "attributes": {"name": name, "monthly_search_volume_exact": volume},
+                }
+                for name, volume in sorted(volumes.items(), key=lambda item: -item[1])
+            ]
+            return httpx.Response(200, json={"data": data, "links": links})
+        finally:
+            self.in_flight -= 1
+
+
+def test_asins_are_chunked_paginated_and_deduplicated(make_api_client):
+    upstream = KeywordsUpstream()
+    api_client = make_api_client(upstream.handler, concurrency=20)
+
+    result = asyncio.run(
+        api_client.keywords_by_asin(ASINS[::-1] + ["b000000003"], min_word_count=2)
+    )
+
+    chunks = sorted({asins for asins, _ in upstream.requests})
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert sorted(asin for chunk in chunks for asin in chunk) == ASINS
+    # Every chunk's cursor was followed to its last page
+    assert sorted(cursor for _, cursor in upstream.requests if cursor) == [
+        "B000000000",
+        "B000000010",
+        "B000000020",
+    ]
+    assert upstream.max_in_flight > 1
+
+    names = [keyword["attributes"]["name"] for keyword in result["data"]]
+    assert len(names) == len(set(names)) == 26
+    meta = result["meta"]
+    assert meta["asins"] == 25 and meta["chunks"] == 3 and meta["pages"] == 6
+    assert meta["duplicates"] == 2 and meta["errors"] == []
+
+
+def test_max_results_keeps_the_top_ranked_and_stops_the_walk_early(
+    make_api_client,
+):
+    upstream = KeywordsUpstream()
+    api_client = make_api_client(upstream.handler, concurrency=20)
+
+    result = asyncio.run(api_client.keywords_by_asin(ASINS * 4, max_results=5))
+
+    # The best keywords are in the last chunk, whichever chunk answers first
+    names = [keyword["attributes"]["name"] for keyword in result["data"]]
+    assert names == [f"kw b{n:09d}" for n in range(24, 19, -1)]
+    # Only the first pages were needed to know no other keyword ranks higher
+    assert len(upstream.requests) == 3
+
+
+def test_keywords_are_merged_in_rank_order(make_api_client):
+    upstream = KeywordsUpstream()
+    api_client = make_api_client(upstream.handler, concurrency=20)
+
+    result = asyncio.run(api_client.keywords_by_asin(ASINS, concurrency=2))
+
+    volumes = [k["attributes"]["monthly_search_volume_exact"] for k in result["data"]]
+    assert volumes == sorted(volumes, reverse=True) and len(volumes) == 26
+
+
+def test_tool_accepts_asins_as_a_json_string(make_api_client):
+    upstream = KeywordsUpstream()
+    api_client = make_api_client(upstream.handler, concurrency=20)
+    tool = create_keywords_by_asin_tool(api_client)
+
+    result = asyncio.run(
+        tool(asins=json.dumps(ASINS[:3]), output_format="csv", fields="name")
+    )
+
+    lines = result.content[0].text.splitlines()
+    assert lines[0] == "id,name" and len(lines) == 5
+
+
+def test_tool_is_callable_over_mcp(make_api_client, mcp_server):
+    upstream = KeywordsUpstream()
+    server = mcp_server(
+        create_keywords_by_asin_tool(make_api_client(upstream.handler, concurrency=20))
+    )
+
+    async def run():
+        async with create_connected_server_and_client_session(server) as session:
+            return await session.call_tool(
+                "keywords_by_asin",
+                {"asins": ASINS[:3], "max_results": 2, "output_format": "csv"},
+            )
+
+    lines = anyio.run(run).content[0].text.splitlines()
+    assert lines[0].startswith("id,") and len(lines) == 3
@@ -0,0 +1,101 @@
+import asyncio
+import io
+import json
+import logging
+
+import httpx
+import pytest
+
+from config.logging_config import (
+    REDACTED,
+    JSONFormatter,
+    LazyJSON,
+    RedactingFilter,
+    get_logger,
+    setup_logging,
+)
+
+SECRET = "sk-live-0123456789"
+
+
+class CountingValue:
+    """Counts how often a log argument is turned into text"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+@pytest.fixture
+def package_logger():
+    logger = get_logger()
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+def _capture(logger, secrets=(SECRET,)):
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter())
+    handler.addFilter(RedactingFilter(secrets))
+    logger.addHandler(handler)
+    return stream
+
+
+def test_secrets_are_masked_in_messages_arguments_and_extras(package_logger):
+    package_logger.setLevel(logging.DEBUG)
+    stream = _capture(package_logger)
+    logger = get_logger("test")
+
+    logger.warning(f"key {SECRET} in the message")
+    logger.warning("key %s in the arguments", f"Bearer {SECRET}")
+    logger.info("in extra", extra={"authorization": f"id:{SECRET}", "status": 401})
+    logger.debug("lazy %s", LazyJSON({"api_key": SECRET}))
+
+    output = stream.getvalue()
+    records = [json.loads(line) for line in output.splitlines()]
+    assert len(records) == 4
+    assert SECRET not in output
+    assert records[1]["message"] == f"key Bearer {REDACTED} in the arguments"
+    assert records[2]["authorization"] == f"id:{REDACTED}"
+    assert records[2]["status"] == 401
+
+
+def test_arguments_are_only_formatted_for_emitted_records(package_logger):
+    package_logger.setLevel(logging.INFO)
+    stream = _capture(package_logger)
+    logger = get_logger("test")
+    value = CountingValue()
+
+    logger.debug("skipped %s %s", value, LazyJSON({"value": value}))
+    assert value.formatted == 0 and stream.getvalue() == ""
+
+    logger.info("emitted %s", LazyJSON({"value": value}))
+    assert value.formatted == 1
+
+
+def test_configured_key_never_reaches_the_log_file(
+    tmp_path, package_logger, make_api_client
+):
+    log_file = tmp_path / "server.log"
+    setup_logging("DEBUG", str(log_file), json_lines=True, secrets=[SECRET])
+
+    def handler(request):
+        # An upstream that echoes the credentials back in its error body
+        echo = {"errors": [{"detail": request.headers["Authorization"]}]}
+        return httpx.Response(401, json=echo)
+
+    api_client = make_api_client(handler, api_key=SECRET)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(api_client.search_products(min_price=1))
+
+    output = log_file.read_text()
+    assert SECRET not in output
+    assert f"key-id:{REDACTED}" in output
@@ -0,0 +1,33 @@
+from api.metrics import Histogram, Metrics, current_tool
+
+
+def test_histogram_quantiles_are_bounded_by_observations():
+    histogram = Histogram((0.001, 0.01, 0.1, 1.0))
+    for value in [0.002] * 90 + [0.5] * 10:
+        histogram.observe(value)
+
+    assert 0.001 <= histogram.quantile(0.5) <= 0.01
+    assert 0.1 <= histogram.quantile(0.99) <= 0.5
+    assert histogram.summary()["count"] == 100
+
+
+def test_stages_are_attributed_to_the_current_tool():
+    metrics = Metrics()
+    token = current_tool.set("search_products")
+    try:
+        with metrics.stage("network"):
+            pass
+    finally:
+        current_tool.reset(token)
+    metrics.record_status(200)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["latency_ms"]["search_products"]["network"]["count"] == 1
+    assert snapshot["upstream_status_codes"] == {"200": 1}
+
+    text = metrics.prometheus()
+    assert (
+        'jungle_scout_stage_seconds_count{stage="network",tool="search_products"} 1'
+        in text
+    )
+    assert 'jungle_scout_upstream_responses_total{status="200"} 1' in text
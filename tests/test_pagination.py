@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+
+
+def _paged_upstream(calls, total_items, delay=0.01):
+    """Serve `total_items` products split into numbered JSON:API pages"""
+
+    async def handler(request):
+        page = int(request.url.params.get("page[number]", 1))
+        size = int(request.url.params["page[size]"])
+        calls.append(page)
+        await asyncio.sleep(delay)
+        start = (page - 1) * size
+        ids = range(start, min(start + size, total_items))
+        links = {"self": str(request.url)}
+        if start + size < total_items:
+            links["next"] = f"{request.url}&page[number]={page + 1}"
+        return httpx.Response(
+            200,
+            json={
+                "data": [{"id": f"us/B{i:09d}"} for i in ids],
+                "links": links,
+                "meta": {"total_items": total_items},
+            },
+        )
+
+    return handler
+
+
+def _collect(api_client, **kwargs):
+    async def run():
+        return [p async for p in api_client.iter_products(**kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_iter_products_walks_pages_until_max_results(make_api_client):
+    calls = []
+    api_client = make_api_client(_paged_upstream(calls, 1000))
+
+    products = _collect(api_client, max_results=250, page_size=100, min_price=10)
+
+    assert [p["id"] for p in products] == [f"us/B{i:09d}" for i in range(250)]
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_iter_products_stops_at_last_page(make_api_client):
+    calls = []
+    api_client = make_api_client(_paged_upstream(calls, 130))
+
+    products = _collect(api_client, max_results=500, page_size=50, prefetch=8)
+
+    assert len(products) == 130
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_collect_products_prefetches_pages_concurrently(make_api_client):
+    calls = []
+    api_client = make_api_client(_paged_upstream(calls, 1000, delay=0.05))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await api_client.collect_products(max_results=500)
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(run())
+
+    assert result["meta"]["total_collected"] == 500
+    assert sorted(calls) == [1, 2, 3, 4, 5]
+    # Sequential paging would take ~5 x 50ms
+    assert elapsed < 0.2
@@ -0,0 +1,102 @@
+import asyncio
+import statistics
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+np = pytest.importorskip("numpy")
+
+from api.product_store import ProductStore  # noqa: E402
+from benchmarks.mock_upstream import MockJungleScout  # noqa: E402
+from benchmarks.sample_data import make_response  # noqa: E402
+from tools.analyze_products import create_analyze_products_tool  # noqa: E402
+
+
+def test_ingest_upserts_by_marketplace_and_asin():
+    store = ProductStore(capacity=4)
+    products = make_response(10)["data"]
+    store.ingest(products)
+    assert len(store) == 10
+
+    updated = dict(products[0], attributes={**products[0]["attributes"], "price": 1.0})
+    other_marketplace = dict(products[1], id=products[1]["id"].replace("us/", "uk/"))
+    store.ingest([updated, other_marketplace])
+
+    assert len(store) == 11
+    assert store.analyze(filters={"price": 1.0})["meta"]["matched_rows"] == 1
+    assert store.analyze(marketplace="uk")["meta"]["matched_rows"] == 1
+
+
+def test_least_recently_fetched_products_are_evicted_past_max_rows():
+    store = ProductStore(capacity=4, max_rows=10)
+    first, second = make_response(8, seed=1)["data"], make_response(8, seed=2)["data"]
+    second = [dict(product, id=f"us/B2{i:08d}") for i, product in enumerate(second)]
+    store.ingest(first)
+    store.ingest(first[1:2])  # Refetched, so newer than the rest of `first`
+    store.ingest(second)
+
+    # 16 rows > 10: the oldest are dropped down to 90% of the cap
+    assert len(store) == 9 and store.stats()["evicted"] == 7
+    kept = {store.row(i, ())["id"] for i in range(len(store))}
+    assert kept == {p["id"] for p in first[1:2] + second}
+    title = second[3]["attributes"]["title"]
+    assert store.analyze(filters={"title": title.upper()})["meta"]["matched_rows"] == 1
+    # Evicted brands no longer take dictionary slots
+    assert len(store.strings["brand"].values) <= len(store)
+
+
+def test_analyze_matches_python_statistics():
+    store = ProductStore()
+    products = make_response(2000, seed=3)["data"]
+    store.ingest(products)
+
+    result = store.analyze(
+        filters={"price": {"min": 20, "max": 80}, "seller_type": ["fba", "FBM"]},
+        group_by="seller_type",
+        metrics=["price"],
+        percentiles=[50],
+        top_k=3,
+        sort_by="reviews",
+    )
+
+    matched = [
+        p["attributes"]
+        for p in products
+        if 20 <= p["attributes"]["price"] <= 80
+        and p["attributes"]["seller_type"] in ("FBA", "FBM")
+    ]
+    assert result["meta"]["matched_rows"] == len(matched)
+    groups = {row["id"]: row["attributes"] for row in result["data"]}
+    assert set(groups) == {"FBA", "FBM"}
+    fba_prices = [a["price"] for a in matched if a["seller_type"] == "FBA"]
+    assert groups["FBA"]["count"] == len(fba_prices)
+    assert groups["FBA"]["price_p50"] == pytest.approx(statistics.median(fba_prices))
+    top_reviews = sorted((a["reviews"] for a in matched), reverse=True)[:3]
+    assert [p["attributes"]["reviews"] for p in result["top"]] == top_reviews
+
+
+def test_analyze_products_tool_uses_fetched_products(make_api_client, mcp_server):
+    mock = MockJungleScout(total_items=300, latency_ms=0, jitter_ms=0)
+    api_client = make_api_client(mock.transport(), product_store=ProductStore())
+    server = mcp_server(create_analyze_products_tool(api_client))
+
+    async def run():
+        await api_client.collect_products(max_results=300)
+        requests = mock.requests
+        async with create_connected_server_and_client_session(server) as session:
+            result = await session.call_tool(
+                "analyze_products",
+                {
+                    "group_by": "category",
+                    "metrics": ["price", "rating"],
+                    "output_format": "csv",
+                },
+            )
+        return requests, result
+
+    requests, result = asyncio.run(run())
+
+    lines = result.content[0].text.splitlines()
+    assert lines[0].startswith("id,count,price_mean")
+    assert sum(int(line.split(",")[1]) for line in lines[1:]) == 300
+    assert mock.requests == requests
@@ -0,0 +1,101 @@
+import asyncio
+
+import anyio
+import pytest
+from mcp import types
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from api.progress import ProgressReporter, current_progress
+from benchmarks.mock_upstream import MockJungleScout
+from config.constants import PRODUCT_PAGE_SIZE_MAX
+from tools.collect_products import create_collect_products_tool
+
+
+def test_batch_reports_progress_per_query(make_api_client):
+    mock = MockJungleScout(latency_ms=5, jitter_ms=0)
+    api_client = make_api_client(mock.transport())
+    updates = []
+
+    async def report(progress, total, message):
+        updates.append((progress, total))
+
+    async def run():
+        current_progress.set(ProgressReporter(report))
+        await api_client.search_products_batch(
+            [{"min_price": price} for price in range(5)], concurrency=2
+        )
+
+    asyncio.run(run())
+
+    assert updates == [(done, 5) for done in range(1, 6)]
+
+
+def test_progress_notifications_reach_the_client(make_api_client, mcp_server):
+    mock = MockJungleScout(latency_ms=20, jitter_ms=0, total_items=1000)
+    server = mcp_server(create_collect_products_tool(make_api_client(mock.transport())))
+    wanted = 5 * PRODUCT_PAGE_SIZE_MAX
+    updates = []
+
+    async def on_progress(progress, total, message):
+        updates.append((progress, total))
+
+    async def run():
+        async with create_connected_server_and_client_session(server) as session:
+            result = await session.call_tool(
+                "collect_products",
+                {"max_results": wanted, "output_format": "json_compact"},
+                progress_callback=on_progress,
+            )
+            assert not result.isError
+
+    anyio.run(run)
+
+    step = PRODUCT_PAGE_SIZE_MAX
+    assert updates == [(done, wanted) for done in range(step, wanted + step, step)]
+
+
+def test_cancellation_stops_outstanding_requests(make_api_client, mcp_server):
+    mock = MockJungleScout(latency_ms=200, jitter_ms=0, total_items=10_000)
+    server = mcp_server(create_collect_products_tool(make_api_client(mock.transport())))
+
+    async def run():
+        async with create_connected_server_and_client_session(server) as session:
+            first_page = anyio.Event()
+
+            async def on_progress(progress, total, message):
+                first_page.set()
+
+            async def call():
+                with pytest.raises(McpError):
+                    await session.call_tool(
+                        "collect_products",
+                        {"max_results": 50 * PRODUCT_PAGE_SIZE_MAX},
+                        progress_callback=on_progress,
+                    )
+
+            async with anyio.create_task_group() as group:
+                group.start_soon(call)
+                await first_page.wait()
+                await anyio.sleep(0.05)  # Prefetched pages are now in flight
+                assert mock.in_flight > 0
+                await session.send_notification(
+                    types.ClientNotification(
+                        types.CancelledNotification(
+                            params=types.CancelledNotificationParams(
+                                requestId=session._request_id - 1
+                            )
+                        )
+                    )
+                )
+                await anyio.sleep(0.05)
+                requests_at_cancel = mock.requests
+                assert mock.in_flight == 0
+                # Nothing more goes upstream once the call is cancelled
+                await anyio.sleep(0.5)
+                assert mock.requests == requests_at_cancel
+
+    anyio.run(run)
+
+    # 50 pages were wanted; only the first and the prefetched ones were sent
+    assert mock.requests < 10
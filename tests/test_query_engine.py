@@ -0,0 +1,89 @@
+import asyncio
+import random
+
+from api.query_engine import LocalQueryEngine
+from benchmarks.mock_upstream import MockJungleScout
+
+
+def _products(count):
+    rng = random.Random(0)
+    return [
+        {
+            "id": f"us/B{i:09d}",
+            "attributes": {
+                "rating": round(rng.uniform(1, 5), 1),
+                "price": round(rng.uniform(5, 150), 2),
+                "seller_type": rng.choice(["AMZ", "FBA", "FBM"]),
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def test_answers_contained_queries_and_rejects_wider_ones():
+    engine = LocalQueryEngine()
+    products = _products(200)
+    engine.store("us", {"min_rating": 4.0, "include_keywords": ["tea"]}, products)
+
+    narrower = engine.answer(
+        "us",
+        {
+            "min_rating": 4.5,
+            "max_price": 50.0,
+            "seller_types": ["fba"],
+            "include_keywords": ["tea"],
+        },
+    )
+    expected = [
+        p
+        for p in products
+        if p["attributes"]["rating"] >= 4.5
+        and p["attributes"]["price"] <= 50
+        and p["attributes"]["seller_type"] == "FBA"
+    ]
+    assert narrower == expected
+
+    assert engine.answer("us", {"min_rating": 3.5, "include_keywords": ["tea"]}) is None
+    assert (
+        engine.answer("us", {"min_rating": 4.5, "include_keywords": ["tea", "x"]})
+        is None
+    )
+    assert engine.answer("uk", {"min_rating": 4.5, "include_keywords": ["tea"]}) is None
+    assert engine.stats()["hits"] == 1
+
+
+def test_expired_sets_are_not_used():
+    now = [0.0]
+    engine = LocalQueryEngine(ttl=10, clock=lambda: now[0])
+    engine.store("us", {"min_rating": 4.0}, _products(10))
+    now[0] = 11
+    assert engine.answer("us", {"min_rating": 4.5}) is None
+    assert engine.stats()["sets"] == 0
+
+
+def test_refinement_after_full_collect_uses_no_api_calls(make_api_client):
+    mock = MockJungleScout(total_items=250, latency_ms=0, jitter_ms=0)
+    api_client = make_api_client(mock.transport(), query_engine=LocalQueryEngine())
+
+    async def run():
+        broad = await api_client.collect_products(max_results=500, min_rating=2.0)
+        requests = mock.requests
+        refined = await api_client.collect_products(
+            max_results=500, min_rating="4.5", seller_types='["fba"]'
+        )
+        page = await api_client.search_products(min_rating=4.5, seller_types=["FBA"])
+        return broad, requests, refined, page
+
+    broad, requests, refined, page = asyncio.run(run())
+
+    assert requests == 3
+    assert mock.requests == 3
+    # The mock ignores filters, so the broad set is the whole catalogue
+    expected = [
+        p
+        for p in broad["data"]
+        if p["attributes"]["rating"] >= 4.5 and p["attributes"]["seller_type"] == "FBA"
+    ]
+    assert refined["data"] == expected
+    assert page["data"] == expected[:5]
+    assert page["meta"]["total_items"] == len(expected)
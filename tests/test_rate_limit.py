@@ -0,0 +1,182 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.rate_limit import (
+    AdaptiveConcurrency,
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+def _scripted_upstream(script, calls):
+    """Answer successive requests with the (status, headers) pairs in `script`"""
+    responses = iter(script)
+
+    def handler(request):
+        calls.append(request)
+        status_code, headers = next(responses, (200, {}))
+        return httpx.Response(status_code, headers=headers, json={"data": []})
+
+    return handler
+
+
+@pytest.fixture
+def scripted_api_client(make_api_client):
+    def make(script, calls, max_attempts=4):
+        return make_api_client(
+            _scripted_upstream(script, calls),
+            retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.001),
+        )
+
+    return make
+
+
+def test_retries_scripted_429_sequence_then_succeeds(scripted_api_client):
+    calls = []
+    api_client = scripted_api_client(
+        [(429, {"Retry-After": "0"}), (429, {}), (503, {}), (200, {})], calls
+    )
+
+    result = asyncio.run(api_client.search_products(min_price=20))
+
+    assert result == {"data": []}
+    assert len(calls) == 4
+    assert api_client.rate_limiter.throttled == 2
+    assert api_client.rate_limiter.retries == 3
+
+
+def test_every_attempt_is_timed_and_counted(scripted_api_client):
+    calls = []
+    api_client = scripted_api_client([(429, {"Retry-After": "0.05"}), (503, {})], calls)
+
+    asyncio.run(api_client.search_products(min_price=20))
+
+    snapshot = api_client.metrics.snapshot()
+    assert snapshot["upstream_status_codes"] == {"200": 1, "429": 1, "503": 1}
+    stages = snapshot["latency_ms"]["-"]
+    assert stages["network"]["count"] == stages["rate_limit"]["count"] == 3
+    assert stages["backoff"]["count"] == 2
+    # The Retry-After wait is backoff (or a paused bucket), never network time
+    assert stages["network"]["max"] < 40
+
+
+def test_gives_up_after_max_attempts(scripted_api_client):
+    calls = []
+    api_client = scripted_api_client([(429, {})] * 10, calls, max_attempts=3)
+
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        asyncio.run(api_client.search_products(min_price=20))
+
+    assert excinfo.value.response.status_code == 429
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried(scripted_api_client):
+    calls = []
+    api_client = scripted_api_client([(400, {})], calls)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(api_client.search_products(min_price=20))
+
+    assert len(calls) == 1
+
+
+def test_retry_after_pauses_the_shared_bucket(scripted_api_client):
+    calls = []
+    api_client = scripted_api_client([(429, {"Retry-After": "0.2"})], calls)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await api_client.search_products(min_price=20)
+        return loop.time() - start
+
+    elapsed = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert elapsed >= 0.2
+
+
+def test_parse_retry_after_headers():
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    exhausted = {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "5"}
+    assert parse_retry_after(exhausted) == 5.0
+    remaining = {"x-ratelimit-remaining": "7", "x-ratelimit-reset": "5"}
+    assert parse_retry_after(remaining) is None
+    assert parse_retry_after({}) is None
+
+
+def test_aimd_shrinks_on_throttle_and_grows_on_success():
+    concurrency = AdaptiveConcurrency(initial=8, minimum=1, maximum=10)
+
+    concurrency.on_throttle()
+    assert int(concurrency.limit) == 4
+    for _ in range(3):
+        concurrency.on_throttle()
+    assert concurrency.limit == 1
+
+    for _ in range(10):
+        concurrency.on_success()
+    assert 4 <= concurrency.limit < 5
+
+
+def test_slot_passes_on_when_a_woken_waiter_is_cancelled():
+    concurrency = AdaptiveConcurrency(initial=1, minimum=1, maximum=1)
+
+    async def run():
+        await concurrency.acquire()
+        first = asyncio.ensure_future(concurrency.acquire())
+        second = asyncio.ensure_future(concurrency.acquire())
+        await asyncio.sleep(0)
+        # `first` is woken, then cancelled before it resumes to take the slot
+        concurrency.release()
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1)
+        assert first.cancelled() and concurrency.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_concurrency_limit_bounds_in_flight_requests(make_api_client):
+    peak = 0
+    active = 0
+
+    async def handler(request):
+        nonlocal peak, active
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json={"data": []})
+
+    api_client = make_api_client(
+        handler,
+        rate_limiter=RateLimiter(
+            rate=1000, burst=1000, initial_concurrency=2, max_concurrency=3
+        ),
+    )
+
+    async def run():
+        await asyncio.gather(
+            *(api_client.search_products(min_price=i) for i in range(20))
+        )
+
+    asyncio.run(run())
+
+    assert peak == 3
+
+
+def test_token_bucket_paces_requests():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(6):
+            await bucket.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.045
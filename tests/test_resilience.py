@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.cache import ResponseCache
+from api.rate_limit import RetryPolicy
+from api.resilience import CircuitBreaker, CircuitOpenError, HedgePolicy
+from benchmarks.mock_upstream import MockJungleScout
+from benchmarks.sample_data import make_response
+
+RETRY_ONCE = RetryPolicy(max_attempts=2, base_delay=0.001)
+
+
+async def _p99_and_hedges(make_api_client, hedge_policy):
+    # 1 in 20 requests stalls for 400ms
+    mock = MockJungleScout(latency_ms=10, jitter_ms=2, slow_rate=0.05, slow_ms=400)
+    api_client = make_api_client(
+        mock.transport(), retry_policy=RETRY_ONCE, hedge_policy=hedge_policy
+    )
+    latencies = []
+    for i in range(120):
+        start = asyncio.get_running_loop().time()
+        await api_client.search_products(page_size=5, min_price=i + 1)
+        latencies.append(asyncio.get_running_loop().time() - start)
+    await api_client.aclose()
+    # After the first 20, which warm up the latency percentile
+    latencies = sorted(latencies[20:])
+    return latencies[int(len(latencies) * 0.99) - 1], mock.requests - 120
+
+
+def test_hedging_cuts_the_latency_tail_within_budget(make_api_client):
+    baseline, extra = asyncio.run(_p99_and_hedges(make_api_client, None))
+    assert baseline > 0.4 and extra == 0
+
+    policy = HedgePolicy(percentile=90, budget_ratio=0.2, budget_burst=2)
+    hedged, extra = asyncio.run(_p99_and_hedges(make_api_client, policy))
+    assert hedged < baseline / 3
+    assert extra == policy.sent and policy.won > 0
+    # Hedges are paid from the budget: burst + 20% of the requests
+    assert policy.sent <= 2 + 0.2 * 120
+
+
+def test_breaker_opens_fails_fast_then_probes(make_api_client):
+    now = [0.0]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if now[0] < 60:
+            return httpx.Response(503, json={"errors": []})
+        return httpx.Response(200, json=make_response(5))
+
+    breaker = CircuitBreaker(
+        failure_threshold=4, reset_timeout=30, clock=lambda: now[0]
+    )
+    cache = ResponseCache(ttl=10, clock=lambda: now[0], keep_stale=True)
+    api_client = make_api_client(
+        handler, retry_policy=RETRY_ONCE, circuit_breaker=breaker, cache=cache
+    )
+    cache.set(
+        api_client._prepare_search("us", 1, 5, {"min_price": 1}).key,
+        make_response(5),
+    )
+    now[0] = 20  # The cached result has expired
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await api_client.search_products(page_size=5, min_price=2)
+        assert breaker.state == "open" and len(calls) == 4
+
+        # Open: nothing is sent, and an expired result beats an error
+        with pytest.raises(CircuitOpenError):
+            await api_client.search_products(page_size=5, min_price=2)
+        stale = await api_client.search_products(page_size=5, min_price=1)
+        assert stale["meta"]["served_stale"] and len(stale["data"]) == 5
+        assert len(calls) == 4
+
+        # After the cooldown one probe fails and the circuit reopens...
+        # (its retry is refused by the reopened circuit)
+        now[0] = 51
+        with pytest.raises(CircuitOpenError):
+            await api_client.search_products(page_size=5, min_price=2)
+        assert breaker.state == "open" and len(calls) == 5
+
+        # ...and once the upstream is back, the probe closes it
+        now[0] = 90
+        result = await api_client.search_products(page_size=5, min_price=2)
+        assert "served_stale" not in result["meta"]
+        assert breaker.state == "closed"
+        assert api_client.stats()["circuit_breaker"]["times_opened"] == 2
+
+    asyncio.run(run())
@@ -0,0 +1,126 @@
+import json
+import os
+
+import anyio
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from api.result_store import ResultStore, UnknownHandleError
+from benchmarks.sample_data import make_response
+from tools.collect_products import create_collect_products_tool
+from tools.handlers import create_tool_handler
+from tools.result_handles import create_read_result_tool, create_result_resources
+
+ROWS = [
+    {"id": f"p{n}", "price": (n * 7) % 10 or None, "title": f"t{n}"} for n in range(20)
+]
+
+
+def test_views_slice_sort_and_project():
+    store = ResultStore()
+    summary = store.put(ROWS, {"total_items": 20}, "search_products")
+    assert summary["rows"] == 20 and summary["columns"] == ["id", "price", "title"]
+    handle = summary["handle"]
+
+    view = store.view(handle, offset=18, limit=5)
+    assert [row["id"] for row in view["data"]] == ["p18", "p19"]
+
+    view = store.view(handle, limit=3, sort_by="price", descending=True, fields=["id"])
+    assert view["data"] == [{"id": "p7"}, {"id": "p17"}, {"id": "p4"}]
+    # Missing values sort last in both directions
+    tail = store.view(handle, offset=18, sort_by="price", descending=True)
+    assert [row["price"] for row in tail["data"]] == [None, None]
+
+
+def test_results_spill_to_disk_then_expire(tmp_path):
+    now = [0.0]
+    store = ResultStore(
+        max_memory=2000,
+        max_disk=5000,
+        ttl=60,
+        spill_dir=str(tmp_path),
+        clock=lambda: now[0],
+    )
+    handles = [store.put(ROWS, None, "t")["handle"] for _ in range(6)]
+
+    stats = store.stats()
+    assert stats["memory_bytes"] <= 2000 and stats["disk_bytes"] <= 5000
+    assert stats["spills"] > 0 and stats["evictions"] > 0
+    with pytest.raises(UnknownHandleError):
+        store.view(handles[0])
+    # Spilled results read back only the rows asked for
+    spilled = store.get(handles[-2])
+    assert spilled.spilled and os.path.exists(spilled.path)
+    assert store.view(handles[-2], offset=5, limit=2)["data"] == ROWS[5:7]
+    assert store.view(handles[-2], limit=1, sort_by="title")["data"] == ROWS[:1]
+
+    now[0] += 61
+    with pytest.raises(UnknownHandleError):
+        store.view(handles[-1])
+    assert store.stats()["results"] == 0 and os.listdir(tmp_path) == []
+
+
+def test_tool_returns_a_handle_readable_as_a_resource(make_api_client):
+    def handler(request):
+        return httpx.Response(200, json=make_response(40))
+
+    api_client = make_api_client(handler)
+    search = create_tool_handler(
+        request_model_class="models.requests.collect_products:CollectProductsRequest",
+        api_method_name="collect_products",
+        api_client=api_client,
+    )
+    server = FastMCP("results-test")
+    summary_resource, view_resource = create_result_resources(api_client)
+    server.resource("results://{handle}")(summary_resource)
+    server.resource("results://{handle}/{view}")(view_resource)
+    server.tool()(create_read_result_tool(api_client))
+
+    @server.tool()
+    async def collect(max_results: int = 40):
+        return await search(max_results=max_results, as_handle=True, fields="price")
+
+    async def run():
+        async with create_connected_server_and_client_session(server) as session:
+            result = await session.call_tool("collect", {})
+            summary = json.loads(result.content[0].text)
+            assert summary["rows"] == 40 and "data" not in summary
+            assert list(summary["preview"][0]) == ["id", "price"]
+
+            uri = summary["uri"] + "/rows?offset=0&limit=3&sort=-price&fields=id,price"
+            read = await session.read_resource(uri)
+            rows = json.loads(read.contents[0].text)["data"]
+            prices = [row["price"] for row in rows]
+            assert prices == sorted(prices, reverse=True) and len(rows) == 3
+
+            read = await session.read_resource(
+                summary["uri"] + "/rows?limit=2&format=csv&fields=id"
+            )
+            assert read.contents[0].text.splitlines() == [
+                "id",
+                "us/B000000000",
+                "us/B000000001",
+            ]
+
+            result = await session.call_tool(
+                "read_result", {"handle": summary["handle"], "offset": 39}
+            )
+            assert json.loads(result.content[0].text)["returned"] == 1
+
+    anyio.run(run)
+
+
+def test_as_handle_is_refused_when_handles_cannot_be_shared(make_api_client):
+    def handler(request):
+        return httpx.Response(200, json=make_response(5))
+
+    api_client = make_api_client(handler, result_store=ResultStore(enabled=False))
+    collect = create_collect_products_tool(api_client)
+
+    result = anyio.run(lambda: collect(max_results=5, as_handle=True))
+
+    assert result.content[0].text.startswith("Error: Result handles are not")
+    assert "without as_handle" in result.content[0].text
+    assert len(api_client.result_store) == 0
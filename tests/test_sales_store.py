@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+
+from api.sales_store import SalesEstimateStore, SalesSeries
+from models.requests.sales_estimates import SalesEstimatesRequest
+from tools.sales_estimates import create_sales_estimates_tool
+
+
+def _upstream(requests):
+    """Sales estimates API: units sold on a day are its day of the month"""
+
+    def handler(request):
+        start = date.fromisoformat(request.url.params["start_date"])
+        end = date.fromisoformat(request.url.params["end_date"])
+        requests.append((start, end))
+        days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+        points = [
+            {
+                "date": day.isoformat(),
+                "estimated_units_sold": day.day,
+                "last_known_price": 9.99,
+            }
+            for day in days
+        ]
+        attributes = {
+            "asin": request.url.params["asin"],
+            "is_parent": False,
+            "data": points,
+        }
+        return httpx.Response(200, json={"data": [{"attributes": attributes}]})
+
+    return handler
+
+
+def _api_client(make_api_client, requests, today):
+    return make_api_client(
+        _upstream(requests), sales_store=SalesEstimateStore(today=lambda: today[0])
+    )
+
+
+def test_sliding_window_fetches_only_new_days(make_api_client):
+    requests = []
+    today = [date(2024, 3, 1)]
+    api_client = _api_client(make_api_client, requests, today)
+
+    async def last_90_days():
+        end = today[0] - timedelta(days=1)
+        return await api_client.get_sales_estimates(
+            "b0test", start_date=end - timedelta(days=89), end_date=end
+        )
+
+    first = asyncio.run(last_90_days())
+    assert requests == [(date(2023, 12, 2), date(2024, 2, 29))]
+    assert len(first["data"]) == 90
+    assert first["data"][-1]["attributes"] == {
+        "asin": "B0TEST",
+        "date": "2024-02-29",
+        "estimated_units_sold": 29,
+        "last_known_price": 9.99,
+    }
+    assert first["meta"]["is_parent"] is False
+
+    asyncio.run(last_90_days())
+    assert len(requests) == 1  # Fully covered
+
+    today[0] += timedelta(days=1)
+    second = asyncio.run(last_90_days())
+    assert requests[1:] == [(date(2024, 3, 1), date(2024, 3, 1))]
+    assert [item["attributes"]["date"] for item in second["data"]][::89] == [
+        "2023-12-03",
+        "2024-03-01",
+    ]
+
+
+def test_today_is_refetched_until_complete(make_api_client):
+    requests = []
+    today = [date(2024, 3, 1)]
+    api_client = _api_client(make_api_client, requests, today)
+
+    for _ in range(2):
+        asyncio.run(
+            api_client.get_sales_estimates(
+                "B0TEST", start_date="2024-02-20", end_date="2024-03-01"
+            )
+        )
+
+    assert requests == [
+        (date(2024, 2, 20), date(2024, 3, 1)),
+        (date(2024, 3, 1), date(2024, 3, 1)),
+    ]
+
+
+def test_gaps_skip_covered_ranges_and_merge_when_close():
+    series = SalesSeries()
+    series.cover(10, 19)
+    series.cover(40, 49)
+    series.cover(20, 24)  # Touches the first range
+    assert series.covered == [(10, 24), (40, 49)]
+
+    assert series.gaps(0, 60) == [(0, 9), (25, 39), (50, 60)]
+    assert series.gaps(12, 45) == [(25, 39)]
+    assert series.gaps(0, 60, merge_within=10) == [(0, 9), (25, 60)]
+
+    series.upsert([(5, 1, None), (3, 2, 1.5)])
+    series.upsert([(4, 3, None), (5, 4, None)])
+    assert series.window(0, 4) == [(3, 2.0, 1.5), (4, 3.0, None)]
+    assert list(series.days) == [3, 4, 5] and series.units[-1] == 4
+
+
+def test_request_defaults_to_the_last_complete_days():
+    request = SalesEstimatesRequest(asin=" b0test ", marketplace="US")
+    assert request.asin == "B0TEST" and request.marketplace == "us"
+    assert (request.end_date - request.start_date).days == 89
+    assert request.end_date < date.today() + timedelta(days=1)
+
+
+def test_tool_documents_the_output_options():
+    doc = create_sales_estimates_tool(None).__doc__
+    for option in ("output_format", "fields", "since_last", "as_handle"):
+        assert f"\n- {option}: " in doc
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.saved_queries import SavedQueries
+from benchmarks.sample_data import make_response
+
+
+@pytest.fixture
+def saved_client(make_api_client):
+    def make(calls, **saved_options):
+        async def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=make_response(5))
+
+        now = [1000.0]
+        saved = SavedQueries(clock=lambda: now[0], **saved_options)
+        return make_api_client(handler, saved_queries=saved), saved, now
+
+    return make
+
+
+def test_saved_query_is_served_stale_and_revalidated(saved_client):
+    calls = []
+    api_client, saved, now = saved_client(calls)
+
+    async def run():
+        await api_client.save_query("dashboard", {"min_price": 20}, refresh_minutes=1)
+        await asyncio.sleep(0.05)
+        assert len(calls) == 1  # Warmed in the background
+
+        first = await api_client.search_products(min_price="20")
+        assert len(calls) == 1
+        assert saved.served_fresh == 1
+
+        now[0] += 120
+        stale = await api_client.search_products(min_price=20)
+        assert stale is first  # Answered at once, without waiting on the API
+        assert saved.served_stale == 1
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2  # ...while a refresh ran in the background
+
+        assert saved.snapshot()["saved_queries"][0]["stale"] is False
+        await api_client.aclose()
+
+    asyncio.run(run())
+
+
+def test_refreshes_respect_the_budget_and_interactive_reserve(saved_client):
+    calls = []
+    api_client, saved, now = saved_client(calls, budget_per_hour=1)
+
+    async def run():
+        await api_client.save_query("a", {"min_price": 20})
+        await api_client.save_query("b", {"min_price": 30})
+        await asyncio.sleep(0.05)
+        assert len(calls) == 1
+        assert saved.deferred >= 1
+
+        # Budget refilled, but the limiter has no slots beyond the reserve
+        now[0] += 3600
+        concurrency = api_client.rate_limiter.concurrency
+        concurrency.in_flight = int(concurrency.limit)
+        await api_client.save_query("c", {"min_price": 40})
+        await asyncio.sleep(0.05)
+        assert len(calls) == 1
+
+        concurrency.in_flight = 0
+        await api_client.save_query("c", {"min_price": 40})
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2
+        await api_client.aclose()
+
+    asyncio.run(run())
+
+
+def test_saved_queries_persist_across_restarts(tmp_path, saved_client):
+    path = str(tmp_path / "saved.json")
+    calls = []
+    api_client, _, _ = saved_client(calls, path=path)
+
+    async def save():
+        await api_client.save_query("dashboard", {"seller_types": ["fba"]})
+        await api_client.save_query("old", {"min_price": 1})
+        await api_client.save_query("old", remove=True)
+        await api_client.aclose()
+
+    asyncio.run(save())
+
+    restarted, saved, _ = saved_client([], path=path)
+    names = [q["name"] for q in saved.snapshot()["saved_queries"]]
+    assert names == ["dashboard"]
@@ -0,0 +1,159 @@
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+
+from api.cache import ResponseCache, SQLiteCacheBackend
+from api.jungle_scout import JungleScoutAPI
+from api.rate_limit import RateLimiter
+from api.shared_state import SharedState, SQLiteLeases, SQLiteTokenBucket
+from api.snapshots import SnapshotStore
+from benchmarks.sample_data import make_response
+
+
+def test_token_buckets_on_one_file_share_the_budget(tmp_path):
+    path = str(tmp_path / "state.db")
+    now = [1000.0]
+    first = SQLiteTokenBucket(path, rate=1.0, capacity=3, clock=lambda: now[0])
+    second = SQLiteTokenBucket(path, rate=1.0, capacity=3, clock=lambda: now[0])
+
+    assert first._take() == 0
+    assert second._take() == 0
+    assert first._take() == 0
+    # The third token went to the first worker, so the second has to wait
+    assert second._take() == pytest.approx(1.0)
+
+    second.pause(5)
+    assert first._take() == pytest.approx(5.0)
+    first.close()
+    second.close()
+
+
+def test_leases_are_exclusive_until_released_or_expired(tmp_path):
+    path = str(tmp_path / "state.db")
+    now = [1000.0]
+    first = SQLiteLeases(path, ttl=10, clock=lambda: now[0])
+    second = SQLiteLeases(path, ttl=10, clock=lambda: now[0])
+
+    assert first.acquire("query")
+    assert not second.acquire("query")
+    second.release("query")  # Not the owner: no effect
+    assert not second.acquire("query")
+
+    first.release("query")
+    assert second.acquire("query")
+
+    now[0] += 11
+    assert first.acquire("query")
+    first.close()
+    second.close()
+
+
+def test_waiting_on_another_workers_lock_keeps_the_event_loop_running(tmp_path):
+    path = str(tmp_path / "state.db")
+    bucket = SQLiteTokenBucket(path)
+    # Another worker holds the database write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def run():
+        acquire = asyncio.ensure_future(bucket.acquire())
+        ticks = 0
+        while ticks < 10:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not acquire.done()
+        other.execute("COMMIT")
+        await asyncio.wait_for(acquire, timeout=5)
+
+    asyncio.run(run())
+    other.close()
+    bucket.close()
+
+
+def test_workers_keep_since_last_snapshots_next_to_the_shared_state(tmp_path):
+    url = f"sqlite:///{tmp_path / 'state.db'}"
+    first, second = SharedState(url), SharedState(url)
+    assert first.snapshot_path == str(tmp_path / "state-snapshots.db")
+    result = make_response(5)
+
+    # A query run on one worker, then again on another
+    SnapshotStore(path=first.snapshot_path).diff("t", {}, result)
+    again = SnapshotStore(path=second.snapshot_path).diff("t", {}, result)
+
+    assert again["data"] == [] and again["meta"]["since"] is not None
+    first.close()
+    second.close()
+
+
+def test_unsupported_shared_state_url():
+    with pytest.raises(ValueError):
+        SharedState("memcached://localhost")
+
+
+def test_workers_sharing_state_fetch_a_query_once(tmp_path):
+    url = f"sqlite:///{tmp_path / 'state.db'}"
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=make_response(5))
+
+    def worker():
+        # Each worker has its own process-local caches and limiter
+        state = SharedState(url)
+        client = JungleScoutAPI(
+            "key",
+            "key-id",
+            transport=httpx.MockTransport(handler),
+            cache=ResponseCache(ttl=60, backend=state.cache_backend),
+            rate_limiter=RateLimiter(bucket=state.bucket),
+            shared_flight=state.flight,
+        )
+        return state, client
+
+    workers = [worker() for _ in range(3)]
+
+    async def run():
+        results = await asyncio.gather(
+            *(
+                client.search_products(min_price=20)
+                for _, client in workers
+                for _ in range(2)
+            )
+        )
+        for state, client in workers:
+            await client.aclose()
+            state.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert sum(state.flight.shared for state, _ in workers) == 2
+
+
+def test_pause_and_cache_reads_keep_the_event_loop_running(tmp_path):
+    path = str(tmp_path / "state.db")
+    bucket = SQLiteTokenBucket(path, clock=lambda: 1000.0)
+    cache = ResponseCache(ttl=60, backend=SQLiteCacheBackend(path, 10))
+    cache.set("query", {"data": 1})
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def run():
+        bucket.pause(5)
+        read = asyncio.ensure_future(cache.aget("query"))
+        await asyncio.sleep(0.05)
+        # The loop keeps running while the pause waits for the write lock
+        other.execute("COMMIT")
+        assert await asyncio.wait_for(read, timeout=5) == {"data": 1}
+
+    asyncio.run(run())
+    assert bucket._take() == pytest.approx(5.0)
+    other.close()
+    bucket.close()
+    cache.close()
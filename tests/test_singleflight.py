@@ -0,0 +1,83 @@
+import asyncio
+
+import httpx
+import pytest
+
+
+def _slow_upstream(calls, status_code=200, delay=0.05):
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(status_code, json={"data": [{"id": "us/B000000001"}]})
+
+    return handler
+
+
+def test_concurrent_identical_queries_share_one_request(make_api_client):
+    calls = []
+    api_client = make_api_client(_slow_upstream(calls))
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                api_client.search_products(min_price="20", seller_types=["fba"])
+                for _ in range(10)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert api_client.inflight.shared == 9
+    assert len(api_client.inflight) == 0
+
+
+def test_different_queries_are_not_coalesced(make_api_client):
+    calls = []
+    api_client = make_api_client(_slow_upstream(calls))
+
+    async def run():
+        await asyncio.gather(
+            api_client.search_products(min_price=20),
+            api_client.search_products(min_price=30),
+        )
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+
+
+def test_error_is_delivered_to_every_waiter(make_api_client):
+    calls = []
+    api_client = make_api_client(_slow_upstream(calls, status_code=404))
+
+    async def run():
+        return await asyncio.gather(
+            *(api_client.search_products(min_price=20) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+
+
+def test_cancelled_waiter_does_not_cancel_shared_request(make_api_client):
+    calls = []
+    api_client = make_api_client(_slow_upstream(calls))
+
+    async def run():
+        first = asyncio.ensure_future(api_client.search_products(min_price=20))
+        second = asyncio.ensure_future(api_client.search_products(min_price=20))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    result = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert result["data"][0]["id"] == "us/B000000001"
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import httpx
+
+from api.snapshots import SnapshotStore
+from benchmarks.sample_data import make_response
+from tools.handlers import create_tool_handler
+
+
+def _collect_tool(make_api_client, responses, snapshots):
+    def handler(request):
+        return httpx.Response(200, json=responses[-1])
+
+    api_client = make_api_client(handler, snapshots=snapshots)
+    return create_tool_handler(
+        request_model_class="models.requests.collect_products:CollectProductsRequest",
+        api_method_name="collect_products",
+        api_client=api_client,
+    )
+
+
+def test_since_last_returns_only_the_changes(tmp_path, make_api_client):
+    path = str(tmp_path / "snapshots.db")
+    first = make_response(50)
+    responses = [first]
+    tool = _collect_tool(make_api_client, responses, SnapshotStore(path=path))
+
+    baseline = json.loads(asyncio.run(tool(since_last=True)).content[0].text)
+    assert baseline["meta"]["added"] == 50 and baseline["meta"]["since"] is None
+
+    # The next day: one price moved, one product left, one arrived, and
+    # every product got a new updated_at
+    second = make_response(50)
+    second["data"][3]["attributes"]["price"] = 1.23
+    del second["data"][7]
+    second["data"].append(make_response(1, start=99)["data"][0])
+    for product in second["data"]:
+        product["attributes"]["updated_at"] = "2024-03-02"
+    responses.append(second)
+
+    # Snapshots outlive the process
+    tool = _collect_tool(make_api_client, responses, SnapshotStore(path=path))
+    text = asyncio.run(tool(since_last=True, max_results=60)).content[0].text
+    diff = json.loads(text)
+    # Different parameters are a different query
+    assert diff["meta"]["added"] == 50
+
+    text = asyncio.run(tool(since_last=True)).content[0].text
+    diff = json.loads(text)
+    changes = {item["id"]: item for item in diff["data"]}
+    assert changes["us/B000000003"]["attributes"] == {"price": 1.23}
+    assert changes["us/B000000003"]["previous"] == {
+        "price": first["data"][3]["attributes"]["price"]
+    }
+    assert changes["us/B000000007"]["change"] == "removed"
+    # Every change carries the row's type, removed rows included
+    assert {item["type"] for item in diff["data"]} == {first["data"][0]["type"]}
+    assert changes["us/B000000099"]["change"] == "added"
+    assert len(changes) == 3
+    meta = diff["meta"]
+    assert (meta["added"], meta["changed"], meta["removed"]) == (1, 1, 1)
+    assert meta["unchanged"] == 48 and meta["since"]
+    assert len(text) < len(json.dumps(second)) / 10
+
+    # Nothing changed since the run just before
+    text = asyncio.run(tool(since_last=True)).content[0].text
+    assert json.loads(text)["data"] == []
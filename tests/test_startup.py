@@ -0,0 +1,59 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+
+from api.lazy_client import LazyAPIClient
+from benchmarks.sample_data import make_response
+from tools.product_search import create_search_products_tool
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_server_import_defers_request_path():
+    code = (
+        "import sys, server; "
+        "print(sorted(m for m in ('api.jungle_scout', 'numpy') "
+        "if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PATH": "", "JUNGLE_SCOUT_LOG_LEVEL": "ERROR"},
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_lazy_client_is_built_on_first_tool_call(make_api_client):
+    built = []
+
+    def factory():
+        async def handler(request):
+            return httpx.Response(200, json=make_response(5))
+
+        built.append(True)
+        return make_api_client(handler)
+
+    api_client = LazyAPIClient(factory)
+    tool = create_search_products_tool(api_client)
+    assert not api_client.built
+
+    result = asyncio.run(tool(min_price="10"))
+
+    assert api_client.built and built == [True]
+    assert '"id": "us/B000000000"' in result.content[0].text
+
+
+def test_missing_credentials_surface_as_tool_error():
+    def factory():
+        raise ValueError("JUNGLE_SCOUT_API_KEY environment variable is required")
+
+    tool = create_search_products_tool(LazyAPIClient(factory))
+    result = asyncio.run(tool())
+
+    assert "JUNGLE_SCOUT_API_KEY" in result.content[0].text
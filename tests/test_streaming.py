@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from api.streaming import StreamingPageDecoder
+from benchmarks.sample_data import make_response
+from models.records import ProductRecord
+from tools.formatters import format_result
+
+
+def _decode(body: bytes, chunk_size: int, item_factory=None):
+    decoder = StreamingPageDecoder(item_factory)
+    items = []
+    for offset in range(0, len(body), chunk_size):
+        items.extend(decoder.feed(body[offset : offset + chunk_size]))
+    items.extend(decoder.close())
+    return items, decoder.document
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_decoder_matches_json_loads_for_any_chunking(chunk_size):
+    document = make_response(20)
+    document["meta"]["note"] = "café ☕"
+    body = json.dumps({"meta": document["meta"], **document}, indent=1).encode()
+
+    items, rest = _decode(body, chunk_size)
+
+    assert items == document["data"]
+    assert rest["meta"] == document["meta"]
+    assert rest["links"] == document["links"]
+
+
+def test_decoder_rejects_truncated_documents():
+    body = json.dumps(make_response(3)).encode()
+    with pytest.raises(ValueError):
+        _decode(body[:-10], 64)
+
+
+def test_records_read_and_encode_like_entries():
+    entry = make_response(1)["data"][0]
+    entry["attributes"]["new_metric"] = 7
+    record = ProductRecord.from_entry(entry)
+
+    assert isinstance(record, ProductRecord)
+    assert record == entry
+    assert record["attributes"]["price"] == entry["attributes"]["price"]
+    assert record.get("attributes").get("new_metric") == 7
+    assert record.to_dict() == entry
+    assert ProductRecord.from_entry({"id": "us/B1"}) == {"id": "us/B1"}
+
+
+def test_search_products_streams_records_with_identical_output(make_api_client):
+    document = make_response(50)
+
+    async def handler(request):
+        return httpx.Response(200, json=document)
+
+    api_client = make_api_client(handler)
+    result = asyncio.run(api_client.search_products(page_size=50))
+
+    assert all(isinstance(item, ProductRecord) for item in result["data"])
+    for output_format in ("json", "ndjson", "csv"):
+        assert format_result(result, output_format) == format_result(
+            document, output_format
+        )
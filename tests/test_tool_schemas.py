@@ -0,0 +1,138 @@
+import inspect
+import json
+
+import anyio
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from benchmarks.mock_upstream import MockJungleScout
+from config.constants import PRODUCT_SEARCH_LIMIT
+from tools.analyze_products import create_analyze_products_tool
+from tools.collect_products import create_collect_products_tool
+from tools.handlers import resolve_model
+from tools.keywords_by_asin import create_keywords_by_asin_tool
+from tools.product_search import create_search_products_tool
+from tools.sales_estimates import create_sales_estimates_tool
+from tools.save_query import create_save_query_tool
+from tools.search_products_batch import create_search_products_batch_tool
+
+# Tool factory and the request model its parameters must mirror
+TOOLS = [
+    (
+        create_search_products_tool,
+        "models.requests.product_search:ProductSearchRequest",
+    ),
+    (
+        create_collect_products_tool,
+        "models.requests.collect_products:CollectProductsRequest",
+    ),
+    (
+        create_search_products_batch_tool,
+        "models.requests.search_products_batch:SearchProductsBatchRequest",
+    ),
+    (
+        create_analyze_products_tool,
+        "models.requests.analyze_products:AnalyzeProductsRequest",
+    ),
+    (create_save_query_tool, "models.requests.save_query:SaveQueryRequest"),
+    (
+        create_sales_estimates_tool,
+        "models.requests.sales_estimates:SalesEstimatesRequest",
+    ),
+    (
+        create_keywords_by_asin_tool,
+        "models.requests.keywords_by_asin:KeywordsByAsinRequest",
+    ),
+]
+
+
+@pytest.mark.parametrize("create_tool, model", TOOLS)
+def test_tool_parameters_mirror_the_request_model(create_tool, model):
+    parameters = inspect.signature(create_tool(None)).parameters
+    model_fields = resolve_model(model).model_fields
+    assert set(parameters) - {"ctx"} == set(model_fields)
+    for name, parameter in parameters.items():
+        if name == "ctx":
+            continue
+        if model_fields[name].is_required():
+            assert parameter.default is inspect.Parameter.empty, name
+        else:
+            assert parameter.default == model_fields[name].default, name
+        if model_fields[name].description:
+            line = f"- {name}: {model_fields[name].description}"
+            assert line in create_tool(None).__doc__, name
+
+
+def test_required_parameters_are_the_only_required_schema_fields(mcp_server):
+    server = mcp_server(*(create_tool(None) for create_tool, _ in TOOLS))
+
+    async def run():
+        async with create_connected_server_and_client_session(server) as session:
+            return {
+                tool.name: tool.inputSchema
+                for tool in (await session.list_tools()).tools
+            }
+
+    schemas = anyio.run(run)
+    assert len(schemas) == len(TOOLS)
+    for schema in schemas.values():
+        assert "kwargs" not in schema["properties"]
+        assert "ctx" not in schema["properties"]
+    assert schemas["save_query"]["required"] == ["name"]
+    assert schemas["get_sales_estimates"]["required"] == ["asin"]
+    assert schemas["keywords_by_asin"]["required"] == ["asins"]
+    assert schemas["keywords_by_asin"]["properties"]["asins"]["type"] == "array"
+
+
+def test_tools_are_callable_over_mcp(make_api_client, mcp_server):
+    mock = MockJungleScout(total_items=120, latency_ms=0, jitter_ms=0)
+    api_client = make_api_client(mock.transport())
+    server = mcp_server(
+        create_search_products_tool(api_client),
+        create_collect_products_tool(api_client),
+        create_search_products_batch_tool(api_client),
+    )
+
+    async def run():
+        async with create_connected_server_and_client_session(server) as session:
+            tools = {tool.name: tool for tool in (await session.list_tools()).tools}
+            schema = tools["collect_products"].inputSchema
+            assert "kwargs" not in schema["properties"]
+            assert "ctx" not in schema["properties"]
+            assert not schema.get("required")
+            assert schema["properties"]["seller_types"]["anyOf"][0]["type"] == "array"
+            assert {"max_results", "min_price", "as_handle"} <= set(
+                schema["properties"]
+            )
+
+            result = await session.call_tool(
+                "collect_products",
+                {
+                    "max_results": 120,
+                    "min_price": 10,
+                    "seller_types": ["FBA"],
+                    "output_format": "csv",
+                    "fields": ["title"],
+                },
+            )
+            lines = result.content[0].text.splitlines()
+            assert lines[0] == "id,title" and len(lines) == 121
+
+            result = await session.call_tool("search_products", {})
+            data = json.loads(result.content[0].text)["data"]
+            assert len(data) == PRODUCT_SEARCH_LIMIT
+
+            assert tools["search_products_batch"].inputSchema["required"] == ["queries"]
+            result = await session.call_tool(
+                "search_products_batch",
+                {
+                    "queries": [{"label": "a", "min_price": 10}, {"min_price": 20}],
+                    "output_format": "csv",
+                    "fields": ["price"],
+                },
+            )
+            lines = result.content[0].text.splitlines()
+            assert lines[0] == "query,id,price"
+            assert len(lines) == 1 + 2 * PRODUCT_SEARCH_LIMIT
+
+    anyio.run(run)
@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from tools.handlers import create_tool_handler, delegate_to
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_analyze_products_tool(api_client: "JungleScoutAPI"):
+    """Create and return the analyze_products tool function"""
+
+    # Use the generic handler pattern
+    tool_handler = create_tool_handler(
+        request_model_class="models.requests.analyze_products:AnalyzeProductsRequest",
+        api_method_name="analyze_products",
+        api_client=api_client,
+    )
+
+    @delegate_to(tool_handler)
+    async def analyze_products():
+        """Compute statistics over every product fetched so far (by search_products,
+        collect_products or search_products_batch) without calling the API. Use this for
+        medians, percentiles, distributions, group comparisons and top-k rankings
+        instead of doing the math over raw product lists
+        """
+
+    return analyze_products
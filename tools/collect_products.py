@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from tools.handlers import create_tool_handler, delegate_to
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_collect_products_tool(api_client: "JungleScoutAPI"):
+    """Create and return the collect_products tool function"""
+
+    # Use the generic handler pattern
+    tool_handler = create_tool_handler(
+        request_model_class="models.requests.collect_products:CollectProductsRequest",
+        api_method_name="collect_products",
+        api_client=api_client,
+    )
+
+    @delegate_to(tool_handler)
+    async def collect_products():
+        """Collect many products in one call by paging through the product database
+        automatically. Accepts the same filters as search_products and returns up to
+        max_results products, fetching several pages concurrently. Progress is reported
+        after each page, and cancelling the call stops the remaining requests
+        """
+
+    return collect_products
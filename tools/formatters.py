@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from models.records import to_json
+
+OUTPUT_FORMATS = ("json", "json_compact", "ndjson", "csv", "markdown")
+
+
+def product_rows(result: Dict, fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Flatten JSON:API product entries into rows of id + attributes
+
+    Batch results (``{"results": {key: response}}``) get a leading query
+    column, and failed queries become a row carrying their error.
+    """
+    if isinstance(result.get("results"), dict):
+        rows = []
+        for key, sub_result in result["results"].items():
+            if "error" in sub_result:
+                rows.append({"query": key, "error": sub_result["error"]})
+                continue
+            rows.extend(
+                {"query": key, **row} for row in product_rows(sub_result, fields)
+            )
+        return rows
+
+    rows = []
+    for item in result.get("data") or []:
+        attributes = item.get("attributes")
+        if attributes is None:
+            attributes = {}
+        row = {"id": item.get("id")}
+        # Rows of a since_last diff say how they changed
+        for key in ("change", "previous"):
+            if key in item:
+                row[key] = item[key]
+        if fields:
+            for field in fields:
+                if field != "id":
+                    row[field] = attributes.get(field)
+        else:
+            row.update(attributes)
+        rows.append(row)
+    return rows
+
+
+def project_fields(result: Dict, fields: Optional[List[str]]) -> Dict:
+    """Return a copy of a JSON:API response keeping only the listed attributes"""
+    if fields and isinstance(result.get("results"), dict):
+        projected = dict(result)
+        projected["results"] = {
+            key: project_fields(sub_result, fields)
+            for key, sub_result in result["results"].items()
+        }
+        return projected
+    if not fields or not isinstance(result.get("data"), list):
+        return result
+    projected = dict(result)
+    projected["data"] = [_project_item(item, fields) for item in result["data"]]
+    return projected
+
+
+def _project_item(item: Any, fields: List[str]) -> Dict[str, Any]:
+    attributes = item.get("attributes")
+    if attributes is None:
+        attributes = {}
+    return {
+        **{k: v for k, v in item.items() if k != "attributes"},
+        "attributes": {
+            field: attributes.get(field) for field in fields if field != "id"
+        },
+    }
+
+
+def _columns(rows: Iterable[Dict[str, Any]]) -> List[str]:
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=to_json)
+    return str(value)
+
+
+def _to_csv(rows: List[Dict[str, Any]]) -> str:
+    columns = _columns(rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_cell(row.get(column)) for column in columns])
+    return buffer.getvalue()
+
+
+def _to_markdown(rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return "_No products found._\n"
+    columns = _columns(rows)
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "---|" * len(columns),
+    ]
+    for row in rows:
+        cells = (_cell(row.get(column)).replace("|", "\\|") for column in columns)
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def format_result(
+    result: Dict, output_format: str = "json", fields: Optional[List[str]] = None
+) -> str:
+    """Serialize an API result in the requested output format
+
+    - json: indented JSON (the original tool output)
+    - json_compact: JSON without whitespace
+    - ndjson: one product per line
+    - csv / markdown: one row per product, one column per attribute
+    """
+    if output_format == "json":
+        return json.dumps(project_fields(result, fields), indent=2, default=to_json)
+    if output_format == "json_compact":
+        return json.dumps(
+            project_fields(result, fields), separators=(",", ":"), default=to_json
+        )
+
+    return format_rows(product_rows(result, fields), output_format)
+
+
+def format_rows(rows: List[Dict[str, Any]], output_format: str = "json") -> str:
+    """Serialize flat rows (as made by `product_rows`) in an output format"""
+    if output_format == "json":
+        return json.dumps(rows, indent=2, default=to_json)
+    if output_format == "json_compact":
+        return json.dumps(rows, separators=(",", ":"), default=to_json)
+    if output_format == "ndjson":
+        return "".join(
+            json.dumps(row, separators=(",", ":"), default=to_json) + "\n"
+            for row in rows
+        )
+    if output_format == "csv":
+        return _to_csv(rows)
+    if output_format == "markdown":
+        return _to_markdown(rows)
+    raise ValueError(
+        f"Unknown output_format {output_format!r}; expected one of {OUTPUT_FORMATS}"
+    )
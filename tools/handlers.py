@@ -1,22 +1,158 @@
-from typing import Dict, Any
-from mcp.types import CallToolResult, TextContent
-import json
+import functools
+import importlib
+import inspect
+import time
 import traceback
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Dict, Optional, Type, Union
+
+from mcp.server.fastmcp import Context
+from mcp.types import CallToolResult, TextContent
+from pydantic import BaseModel, Field
+
+from api.metrics import current_tool
+from api.progress import ProgressReporter, current_progress
+from models.requests.output_options import OutputOptions
+from tools.formatters import format_result
+from tools.result_handles import store_result
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+OUTPUT_OPTION_FIELDS = set(OutputOptions.model_fields)
+
+
+def resolve_model(ref: Union[str, Type[BaseModel]]) -> Type[BaseModel]:
+    """Return a model class, importing it if given as a "module:ClassName" string"""
+    if not isinstance(ref, str):
+        return ref
+    module_name, _, class_name = ref.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def tool_fields(model: Type[BaseModel]):
+    """A request model's fields in tool parameter order (output options last)"""
+    return sorted(
+        model.model_fields.items(), key=lambda item: item[0] in OUTPUT_OPTION_FIELDS
+    )
+
+
+def tool_signature(model: Type[BaseModel]) -> inspect.Signature:
+    """Keyword parameters mirroring `model`'s fields, plus an optional MCP `ctx`
+
+    Each annotation carries the field's description and its Annotated
+    validators, so the input schema documents every parameter and accepts
+    the same loose input as the model.
+    """
+    keyword = inspect.Parameter.KEYWORD_ONLY
+    parameters = [
+        inspect.Parameter("ctx", keyword, default=None, annotation=Optional[Context])
+    ]
+    for name, field in tool_fields(model):
+        annotation = Annotated[
+            (field.annotation, *field.metadata, Field(description=field.description))
+        ]
+        default = inspect.Parameter.empty if field.is_required() else field.default
+        parameters.append(
+            inspect.Parameter(name, keyword, default=default, annotation=annotation)
+        )
+    return inspect.Signature(parameters)
+
 
-from api.jungle_scout import JungleScoutAPI
+def parameter_docs(model: Type[BaseModel]) -> str:
+    """The "Parameters:" section of a tool description, from the field descriptions"""
+    lines = [
+        f"- {name}: {field.description}"
+        for name, field in tool_fields(model)
+        if field.description
+    ]
+    return "Parameters:\n" + "\n".join(lines)
 
 
-def create_tool_handler(request_model_class, api_method_name: str, api_client: JungleScoutAPI, additional_params: Dict[str, Any] = None):
-    """Generic factory function to create tool handlers with Pydantic models"""
+def delegate_to(tool_handler: Callable) -> Callable[[Callable], Callable]:
+    """Decorator turning a docstring-only function into a tool for `tool_handler`
 
-    async def tool_handler(**kwargs):
-        """Generic tool handler that uses Pydantic models for validation and API calls"""
+    FastMCP builds a tool's input schema from its function signature (a
+    ``**kwargs`` signature becomes one opaque, required argument), so the
+    tool gets a ``__signature__`` built from the handler's request model, and
+    the model's field descriptions, output options included, are appended
+    to the decorated function's docstring. Arguments left at None are not
+    forwarded, so the request model's own defaults and coercion apply.
+    """
+    model = resolve_model(tool_handler.request_model_class)
+
+    def decorate(described: Callable) -> Callable:
+        @functools.wraps(described)
+        async def tool(**arguments):
+            given = {k: value for k, value in arguments.items() if value is not None}
+            return await tool_handler(**given)
+
+        del tool.__wrapped__
+        tool.__signature__ = tool_signature(model)
+        tool.__annotations__ = {
+            name: parameter.annotation
+            for name, parameter in tool.__signature__.parameters.items()
+        }
+        tool.__doc__ = (
+            f"{inspect.cleandoc(described.__doc__)}\n\n{parameter_docs(model)}"
+        )
+        return tool
+
+    return decorate
+
+
+def create_tool_handler(
+    request_model_class: Union[str, Type[BaseModel]],
+    api_method_name: str,
+    api_client: "JungleScoutAPI",
+    additional_params: Dict[str, Any] = None,
+    tool_name: Optional[str] = None,
+):
+    """Generic factory function to create tool handlers with Pydantic models
+
+    `request_model_class` may be a "module:ClassName" reference, resolved
+    when the tool is registered (see delegate_to) or on the first call.
+
+    With ``since_last`` only the changes since the previous run of the same
+    query are returned (see api.snapshots). With ``as_handle`` the result is
+    kept in the client's result store and only its handle and a summary are
+    returned.
+
+    Tools that pass their MCP `ctx` get progress notifications from the API
+    layer. Cancelling the call cancels the awaited API method, which in turn
+    cancels its outstanding requests and tasks.
+    """
+    tool_name = tool_name or api_method_name
+    model_class = None
+
+    async def tool_handler(ctx: Optional[Context] = None, **kwargs):
+        """Validate the arguments with the request model and call the API method"""
+        nonlocal model_class
+        token = current_tool.set(tool_name)
+        progress_token = current_progress.set(
+            ProgressReporter(ctx.report_progress) if ctx is not None else None
+        )
+        start = time.perf_counter()
+        metrics = None
         try:
+            metrics = api_client.metrics
+            if model_class is None:
+                model_class = resolve_model(request_model_class)
+
             # Create request model from kwargs - Pydantic will handle validation
-            request = request_model_class(**kwargs)
+            with metrics.stage("validate"):
+                request = model_class(**kwargs)
 
-            # Get all request parameters
-            params = request.model_dump()
+            # Split presentation options from the API request parameters
+            output_format, fields = "json", None
+            since_last = as_handle = False
+            if isinstance(request, OutputOptions):
+                output_format, fields = request.output_format, request.fields
+                since_last, as_handle = request.since_last, request.as_handle
+                params = request.model_dump(
+                    exclude=OUTPUT_OPTION_FIELDS, exclude_none=True
+                )
+            else:
+                params = request.model_dump(exclude_none=True)
 
             # Add any additional parameters (like page_size)
             if additional_params:
@@ -25,15 +161,34 @@ def create_tool_handler(request_model_class, api_method_name: str, api_client: J
             # Call the appropriate API method
             api_method = getattr(api_client, api_method_name)
             result = await api_method(**params)
+            if since_last:
+                with metrics.stage("diff"):
+                    result = api_client.snapshots.diff(tool_name, params, result)
 
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(result, indent=2))]
-            )
+            with metrics.stage("serialize"):
+                if as_handle:
+                    # Only a summary goes back; rows are read in slices later
+                    text = store_result(
+                        api_client.result_store, result, tool_name, fields
+                    )
+                else:
+                    text = format_result(result, output_format, fields)
+            metrics.observe_size("output", len(text))
+
+            return CallToolResult(content=[TextContent(type="text", text=text)])
         except Exception as e:
+            if metrics is not None:
+                metrics.record_error(tool_name)
             # Return error in a format that MCP can handle
             error_message = f"Error: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
             return CallToolResult(
                 content=[TextContent(type="text", text=error_message)]
             )
+        finally:
+            if metrics is not None:
+                metrics.observe_stage("total", time.perf_counter() - start)
+            current_progress.reset(progress_token)
+            current_tool.reset(token)
 
+    tool_handler.request_model_class = request_model_class
     return tool_handler
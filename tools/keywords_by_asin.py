@@ -0,0 +1,28 @@
+from typing import TYPE_CHECKING
+
+from tools.handlers import create_tool_handler, delegate_to
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_keywords_by_asin_tool(api_client: "JungleScoutAPI"):
+    """Create and return the keywords_by_asin tool function"""
+
+    # Use the generic handler pattern
+    tool_handler = create_tool_handler(
+        request_model_class="models.requests.keywords_by_asin:KeywordsByAsinRequest",
+        api_method_name="keywords_by_asin",
+        api_client=api_client,
+    )
+
+    @delegate_to(tool_handler)
+    async def keywords_by_asin():
+        """Find the keywords a list of ASINs rank for (reverse ASIN lookup). Takes any
+        number of ASINs: they are split into chunks the API accepts, fetched
+        concurrently with every result page, and merged into one list with each keyword
+        once. Progress is reported as chunks finish, and cancelling the call stops the
+        remaining requests
+        """
+
+    return keywords_by_asin
@@ -0,0 +1,21 @@
+import json
+from typing import TYPE_CHECKING
+
+from mcp.types import CallToolResult, TextContent
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_list_saved_queries_tool(api_client: "JungleScoutAPI"):
+    """Create and return the list_saved_queries tool function"""
+
+    async def list_saved_queries():
+        """List saved queries with the age of their results, when each refreshes next,
+        refresh failures, and the background scheduler state (refresh budget, deferred
+        refreshes)
+        """
+        text = json.dumps(await api_client.list_saved_queries(), indent=2)
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+    return list_saved_queries
@@ -0,0 +1,142 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs
+
+from mcp.types import CallToolResult, TextContent
+
+from config.constants import RESULT_HANDLE_PREVIEW_ROWS, RESULT_VIEW_DEFAULT_ROWS
+from models.records import to_json
+from tools.formatters import format_rows, product_rows
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+    from api.result_store import ResultStore
+
+
+def _split_fields(fields: Union[str, List[str], None]) -> Optional[List[str]]:
+    """Fields given as a list, a JSON list or a comma-separated string"""
+    if isinstance(fields, str):
+        if fields.startswith("["):
+            return json.loads(fields)
+        return [field.strip() for field in fields.split(",") if field.strip()]
+    return fields or None
+
+
+def store_result(
+    store: "ResultStore",
+    result: Dict,
+    tool_name: str,
+    fields: Optional[List[str]] = None,
+) -> str:
+    """Keep a tool result server-side; return its handle, summary and a preview"""
+    rows = product_rows(result, None)
+    summary = store.put(rows, result.get("meta"), tool_name)
+    preview = rows[:RESULT_HANDLE_PREVIEW_ROWS]
+    if fields:
+        columns = ["id", *fields]
+        preview = [{column: row.get(column) for column in columns} for row in preview]
+    summary["preview"] = preview
+    summary["read_with"] = (
+        f"{summary['uri']}/rows?offset=0&limit={RESULT_VIEW_DEFAULT_ROWS}"
+        "&sort=<column or -column>&fields=<a,b>&format=<json|csv|markdown|ndjson>"
+    )
+    return json.dumps(summary, indent=2, default=to_json)
+
+
+def render_view(
+    store: "ResultStore",
+    handle: str,
+    offset: Any = 0,
+    limit: Any = RESULT_VIEW_DEFAULT_ROWS,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    fields: Union[str, List[str], None] = None,
+    output_format: str = "json",
+) -> str:
+    """One slice of a stored result, in an output format"""
+    if sort_by and sort_by.startswith("-"):
+        sort_by, descending = sort_by[1:], True
+    view = store.view(
+        handle,
+        offset=int(offset),
+        limit=int(limit),
+        sort_by=sort_by or None,
+        descending=descending,
+        fields=_split_fields(fields),
+    )
+    output_format = (output_format or "json").lower()
+    if output_format == "json":
+        return json.dumps(view, indent=2, default=to_json)
+    if output_format == "json_compact":
+        return json.dumps(view, separators=(",", ":"), default=to_json)
+    return format_rows(view["data"], output_format)
+
+
+def create_result_resources(api_client: "JungleScoutAPI"):
+    """Create the results://{handle} and results://{handle}/{view} resources"""
+
+    async def result_summary(handle: str) -> str:
+        """Row count, columns and metadata of a stored result"""
+        summary = api_client.result_store.summary(handle)
+        return json.dumps(summary, indent=2, default=to_json)
+
+    async def result_view(handle: str, view: str) -> str:
+        """A slice of a stored result: rows?offset=&limit=&sort=&fields=&format="""
+        name, _, query = view.partition("?")
+        if name != "rows":
+            raise ValueError(f"Unknown result view {name!r}; use rows?offset=...")
+        options = {key: values[-1] for key, values in parse_qs(query).items()}
+        return render_view(
+            api_client.result_store,
+            handle,
+            offset=options.get("offset", 0),
+            limit=options.get("limit", RESULT_VIEW_DEFAULT_ROWS),
+            sort_by=options.get("sort"),
+            fields=options.get("fields"),
+            output_format=options.get("format", "json"),
+        )
+
+    return result_summary, result_view
+
+
+def create_read_result_tool(api_client: "JungleScoutAPI"):
+    """Create and return the read_result tool function"""
+
+    async def read_result(
+        handle: str,
+        offset: int = 0,
+        limit: int = RESULT_VIEW_DEFAULT_ROWS,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        fields: Optional[Union[str, List[str]]] = None,
+        output_format: str = "json",
+    ):
+        """Read a slice of a result stored with as_handle, optionally sorted by a
+        column and limited to some columns. The same data is available as the
+        results://{handle}/rows?offset=&limit=&sort=&fields=&format= resource
+
+        Parameters:
+        - handle: Handle returned by a tool called with as_handle
+        - offset: First row to return (0-based)
+        - limit: Number of rows to return (up to 1000)
+        - sort_by: Column to sort by before slicing ("-column" sorts descending)
+        - descending: Sort from largest to smallest
+        - fields: Columns to return (e.g. ["title", "price"])
+        - output_format: json, json_compact, ndjson, csv or markdown (table)
+        """
+        try:
+            text = render_view(
+                api_client.result_store,
+                handle,
+                offset=offset,
+                limit=limit,
+                sort_by=sort_by,
+                descending=descending,
+                fields=fields,
+                output_format=output_format,
+            )
+        except (LookupError, ValueError) as e:
+            text = f"Error: {e}"
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+    return read_result
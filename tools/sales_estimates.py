@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+
+from tools.handlers import create_tool_handler, delegate_to
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_sales_estimates_tool(api_client: "JungleScoutAPI"):
+    """Create and return the get_sales_estimates tool function"""
+
+    # Use the generic handler pattern
+    tool_handler = create_tool_handler(
+        request_model_class="models.requests.sales_estimates:SalesEstimatesRequest",
+        api_method_name="get_sales_estimates",
+        api_client=api_client,
+    )
+
+    @delegate_to(tool_handler)
+    async def get_sales_estimates():
+        """Get daily sales estimates (units sold and last known price) for one ASIN over
+        a date range. Days fetched before are answered locally and only the missing
+        days are requested, so repeating or sliding a window is cheap
+        """
+
+    return get_sales_estimates
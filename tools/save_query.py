@@ -0,0 +1,28 @@
+from typing import TYPE_CHECKING
+
+from tools.handlers import create_tool_handler, delegate_to
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_save_query_tool(api_client: "JungleScoutAPI"):
+    """Create and return the save_query tool function"""
+
+    # Use the generic handler pattern
+    tool_handler = create_tool_handler(
+        request_model_class="models.requests.save_query:SaveQueryRequest",
+        api_method_name="save_query",
+        api_client=api_client,
+    )
+
+    @delegate_to(tool_handler)
+    async def save_query():
+        """Save a product search so the server keeps its result warm, refreshing it in
+        the background. search_products calls with the same arguments then return the
+        saved result immediately (even if slightly stale, in which case a refresh
+        starts in the background). Use this for searches that are repeated on a
+        schedule, such as dashboards
+        """
+
+    return save_query
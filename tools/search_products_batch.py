@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING
+
+from config.constants import PRODUCT_SEARCH_LIMIT
+from tools.handlers import create_tool_handler, delegate_to
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_search_products_batch_tool(api_client: "JungleScoutAPI"):
+    """Create and return the search_products_batch tool function"""
+
+    # Use the generic handler pattern
+    tool_handler = create_tool_handler(
+        request_model_class=(
+            "models.requests.search_products_batch:SearchProductsBatchRequest"
+        ),
+        api_method_name="search_products_batch",
+        api_client=api_client,
+        additional_params={"page_size": PRODUCT_SEARCH_LIMIT},
+    )
+
+    @delegate_to(tool_handler)
+    async def search_products_batch():
+        """Run many product searches in one call, concurrently. Use this instead of
+        repeated search_products calls when sweeping variations of a search (keyword
+        sets, price bands, seller types). Identical queries are only run once, and a
+        failing query reports its error without failing the batch. Progress is reported
+        as queries finish, and cancelling the call stops the remaining queries
+        """
+
+    return search_products_batch
@@ -0,0 +1,28 @@
+import json
+from typing import TYPE_CHECKING
+
+from mcp.types import CallToolResult, TextContent
+
+if TYPE_CHECKING:
+    from api.jungle_scout import JungleScoutAPI
+
+
+def create_server_stats_tool(api_client: "JungleScoutAPI"):
+    """Create and return the get_server_stats tool function"""
+
+    async def get_server_stats(output_format: str = "json"):
+        """Report server-side performance statistics: per-tool latency histograms
+        for each stage (validate, normalize, rate_limit, network, backoff,
+        decode, serialize, total), upstream status codes, payload sizes, cache
+        hit rates and rate limiter state
+
+        Parameters:
+        - output_format: json (default) or prometheus (text exposition format)
+        """
+        if output_format.lower() == "prometheus":
+            text = api_client.metrics.prometheus()
+        else:
+            text = json.dumps(api_client.stats(), indent=2)
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+    return get_server_stats
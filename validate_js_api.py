@@ -1,12 +1,24 @@
-from api.jungle_scout import JungleScoutAPI
 import asyncio
-from config.env import get_api_key
+
+from api.jungle_scout import JungleScoutAPI
+from config.env import (
+    get_api_key,
+    get_api_key_id,
+    get_cassette_path,
+    get_upstream_mode,
+)
 
 
 async def validate_js_api():
     api_key = get_api_key()
     print(api_key)
-    api_client = JungleScoutAPI(api_key)
+    # JUNGLE_SCOUT_UPSTREAM_MODE=replay answers from a recorded cassette
+    api_client = JungleScoutAPI(
+        api_key,
+        get_api_key_id(),
+        upstream_mode=get_upstream_mode(),
+        cassette_path=get_cassette_path(),
+    )
     try:
         print("Validating Jungle Scout API...")
         results = await api_client.search_products()
@@ -19,6 +31,9 @@ async def validate_js_api():
 
         traceback.print_exc()
         return False
+    finally:
+        # Also finishes the cassette in record mode
+        await api_client.aclose()
 
 
 if __name__ == "__main__":